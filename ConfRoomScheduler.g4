@@ -6,17 +6,31 @@ stat: reserve                 # reserveStat
     | cancel                  # cancelStat
     | list                    # listStat
     | reprogram               # reprogramStat
+    | available               # availableStat
+    | block                   # blockStat
     |                         # blank
     ;
 
-reserve: 'RESERVA' USER 'SALA' ID 'PARA' DATE 'DE' TIME 'A' TIME ; 
+reserve: 'RESERVA' USER 'SALA' ID 'PARA' DATE 'DE' TIME 'A' TIME recurrence? ; 
+
+recurrence: 'CADA' 'SEMANA' 'HASTA' DATE ;
+
+block: 'INICIO' NEWLINE (reserve? NEWLINE)* 'FIN' ;
 
 cancel: 'CANCELAR' ID 'PARA' DATE 'DE' TIME 'A' TIME ; 
 
-list: 'LISTAR' ; 
+list: 'LISTAR' listFilter* ('LIMITE' limit=ID)? ('SALTAR' offset=ID)? ; 
+
+listFilter: 'SALA' room=ID
+          | 'USUARIO' user=USER
+          | 'FECHA' date=DATE
+          | 'DESDE' since=DATE 'HASTA' until=DATE
+          ;
 
 reprogram: 'REPROGRAMAR' ID 'PARA' DATE 'DE' TIME 'A' TIME 'PARA' TIME 'A' TIME ;
 
+available: 'DISPONIBLE' 'PARA' DATE 'DE' TIME 'A' TIME 'DURACION' ID ;
+
 DATE: DIGIT DIGIT '/' DIGIT DIGIT '/' DIGIT DIGIT DIGIT DIGIT ; 
 TIME: DIGIT DIGIT ':' DIGIT DIGIT ; 
 ID  : [0-9]+ ;
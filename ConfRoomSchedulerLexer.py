@@ -10,46 +10,83 @@ else:
 
 def serializedATN():
     return [
-        4,0,14,123,6,-1,2,0,7,0,2,1,7,1,2,2,7,2,2,3,7,3,2,4,7,4,2,5,7,5,
+        4,0,26,230,6,-1,2,0,7,0,2,1,7,1,2,2,7,2,2,3,7,3,2,4,7,4,2,5,7,5,
         2,6,7,6,2,7,7,7,2,8,7,8,2,9,7,9,2,10,7,10,2,11,7,11,2,12,7,12,2,
-        13,7,13,2,14,7,14,1,0,1,0,1,0,1,0,1,0,1,0,1,0,1,0,1,1,1,1,1,1,1,
-        1,1,1,1,2,1,2,1,2,1,2,1,2,1,3,1,3,1,3,1,4,1,4,1,5,1,5,1,5,1,5,1,
-        5,1,5,1,5,1,5,1,5,1,6,1,6,1,6,1,6,1,6,1,6,1,6,1,7,1,7,1,7,1,7,1,
-        7,1,7,1,7,1,7,1,7,1,7,1,7,1,7,1,8,1,8,1,8,1,8,1,8,1,8,1,8,1,8,1,
-        8,1,8,1,8,1,9,1,9,1,9,1,9,1,9,1,9,1,10,4,10,101,8,10,11,10,12,10,
-        102,1,11,4,11,106,8,11,11,11,12,11,107,1,12,3,12,111,8,12,1,12,1,
-        12,1,13,4,13,116,8,13,11,13,12,13,117,1,13,1,13,1,14,1,14,0,0,15,
-        1,1,3,2,5,3,7,4,9,5,11,6,13,7,15,8,17,9,19,10,21,11,23,12,25,13,
-        27,14,29,0,1,0,3,1,0,48,57,2,0,65,90,97,122,2,0,9,9,32,32,125,0,
-        1,1,0,0,0,0,3,1,0,0,0,0,5,1,0,0,0,0,7,1,0,0,0,0,9,1,0,0,0,0,11,1,
-        0,0,0,0,13,1,0,0,0,0,15,1,0,0,0,0,17,1,0,0,0,0,19,1,0,0,0,0,21,1,
-        0,0,0,0,23,1,0,0,0,0,25,1,0,0,0,0,27,1,0,0,0,1,31,1,0,0,0,3,39,1,
-        0,0,0,5,44,1,0,0,0,7,49,1,0,0,0,9,52,1,0,0,0,11,54,1,0,0,0,13,63,
-        1,0,0,0,15,70,1,0,0,0,17,82,1,0,0,0,19,93,1,0,0,0,21,100,1,0,0,0,
-        23,105,1,0,0,0,25,110,1,0,0,0,27,115,1,0,0,0,29,121,1,0,0,0,31,32,
-        5,82,0,0,32,33,5,69,0,0,33,34,5,83,0,0,34,35,5,69,0,0,35,36,5,82,
-        0,0,36,37,5,86,0,0,37,38,5,65,0,0,38,2,1,0,0,0,39,40,5,83,0,0,40,
-        41,5,65,0,0,41,42,5,76,0,0,42,43,5,65,0,0,43,4,1,0,0,0,44,45,5,80,
-        0,0,45,46,5,65,0,0,46,47,5,82,0,0,47,48,5,65,0,0,48,6,1,0,0,0,49,
-        50,5,68,0,0,50,51,5,69,0,0,51,8,1,0,0,0,52,53,5,65,0,0,53,10,1,0,
-        0,0,54,55,5,67,0,0,55,56,5,65,0,0,56,57,5,78,0,0,57,58,5,67,0,0,
-        58,59,5,69,0,0,59,60,5,76,0,0,60,61,5,65,0,0,61,62,5,82,0,0,62,12,
-        1,0,0,0,63,64,5,76,0,0,64,65,5,73,0,0,65,66,5,83,0,0,66,67,5,84,
-        0,0,67,68,5,65,0,0,68,69,5,82,0,0,69,14,1,0,0,0,70,71,5,82,0,0,71,
-        72,5,69,0,0,72,73,5,80,0,0,73,74,5,82,0,0,74,75,5,79,0,0,75,76,5,
-        71,0,0,76,77,5,82,0,0,77,78,5,65,0,0,78,79,5,77,0,0,79,80,5,65,0,
-        0,80,81,5,82,0,0,81,16,1,0,0,0,82,83,3,29,14,0,83,84,3,29,14,0,84,
-        85,5,47,0,0,85,86,3,29,14,0,86,87,3,29,14,0,87,88,5,47,0,0,88,89,
-        3,29,14,0,89,90,3,29,14,0,90,91,3,29,14,0,91,92,3,29,14,0,92,18,
-        1,0,0,0,93,94,3,29,14,0,94,95,3,29,14,0,95,96,5,58,0,0,96,97,3,29,
-        14,0,97,98,3,29,14,0,98,20,1,0,0,0,99,101,7,0,0,0,100,99,1,0,0,0,
-        101,102,1,0,0,0,102,100,1,0,0,0,102,103,1,0,0,0,103,22,1,0,0,0,104,
-        106,7,1,0,0,105,104,1,0,0,0,106,107,1,0,0,0,107,105,1,0,0,0,107,
-        108,1,0,0,0,108,24,1,0,0,0,109,111,5,13,0,0,110,109,1,0,0,0,110,
-        111,1,0,0,0,111,112,1,0,0,0,112,113,5,10,0,0,113,26,1,0,0,0,114,
-        116,7,2,0,0,115,114,1,0,0,0,116,117,1,0,0,0,117,115,1,0,0,0,117,
-        118,1,0,0,0,118,119,1,0,0,0,119,120,6,13,0,0,120,28,1,0,0,0,121,
-        122,7,0,0,0,122,30,1,0,0,0,5,0,102,107,110,117,1,6,0,0
+        13,7,13,2,14,7,14,2,15,7,15,2,16,7,16,2,17,7,17,2,18,7,18,2,19,7,
+        19,2,20,7,20,2,21,7,21,2,22,7,22,2,23,7,23,2,24,7,24,2,25,7,25,2,
+        26,7,26,1,0,1,0,1,0,1,0,1,0,1,0,1,0,1,0,1,1,1,1,1,1,1,1,1,1,1,2,
+        1,2,1,2,1,2,1,2,1,3,1,3,1,3,1,4,1,4,1,5,1,5,1,5,1,5,1,5,1,6,1,6,
+        1,6,1,6,1,6,1,6,1,6,1,7,1,7,1,7,1,7,1,7,1,7,1,8,1,8,1,8,1,8,1,8,
+        1,8,1,8,1,9,1,9,1,9,1,9,1,10,1,10,1,10,1,10,1,10,1,10,1,10,1,10,
+        1,10,1,11,1,11,1,11,1,11,1,11,1,11,1,11,1,12,1,12,1,12,1,12,1,12,
+        1,12,1,12,1,13,1,13,1,13,1,13,1,13,1,13,1,13,1,14,1,14,1,14,1,14,
+        1,14,1,14,1,14,1,14,1,15,1,15,1,15,1,15,1,15,1,15,1,16,1,16,1,16,
+        1,16,1,16,1,16,1,17,1,17,1,17,1,17,1,17,1,17,1,17,1,17,1,17,1,17,
+        1,17,1,17,1,18,1,18,1,18,1,18,1,18,1,18,1,18,1,18,1,18,1,18,1,18,
+        1,19,1,19,1,19,1,19,1,19,1,19,1,19,1,19,1,19,1,20,1,20,1,20,1,20,
+        1,20,1,20,1,20,1,20,1,20,1,20,1,20,1,21,1,21,1,21,1,21,1,21,1,21,
+        1,22,4,22,208,8,22,11,22,12,22,209,1,23,4,23,213,8,23,11,23,12,23,
+        214,1,24,3,24,218,8,24,1,24,1,24,1,25,4,25,223,8,25,11,25,12,25,
+        224,1,25,1,25,1,26,1,26,0,0,27,1,1,3,2,5,3,7,4,9,5,11,6,13,7,15,
+        8,17,9,19,10,21,11,23,12,25,13,27,14,29,15,31,16,33,17,35,18,37,
+        19,39,20,41,21,43,22,45,23,47,24,49,25,51,26,53,0,1,0,3,1,0,48,57,
+        2,0,65,90,97,122,2,0,9,9,32,32,232,0,1,1,0,0,0,0,3,1,0,0,0,0,5,1,
+        0,0,0,0,7,1,0,0,0,0,9,1,0,0,0,0,11,1,0,0,0,0,13,1,0,0,0,0,15,1,0,
+        0,0,0,17,1,0,0,0,0,19,1,0,0,0,0,21,1,0,0,0,0,23,1,0,0,0,0,25,1,0,
+        0,0,0,27,1,0,0,0,0,29,1,0,0,0,0,31,1,0,0,0,0,33,1,0,0,0,0,35,1,0,
+        0,0,0,37,1,0,0,0,0,39,1,0,0,0,0,41,1,0,0,0,0,43,1,0,0,0,0,45,1,0,
+        0,0,0,47,1,0,0,0,0,49,1,0,0,0,0,51,1,0,0,0,1,55,1,0,0,0,3,63,1,0,
+        0,0,5,68,1,0,0,0,7,73,1,0,0,0,9,76,1,0,0,0,11,78,1,0,0,0,13,83,1,
+        0,0,0,15,90,1,0,0,0,17,96,1,0,0,0,19,103,1,0,0,0,21,107,1,0,0,0,
+        23,116,1,0,0,0,25,123,1,0,0,0,27,130,1,0,0,0,29,137,1,0,0,0,31,145,
+        1,0,0,0,33,151,1,0,0,0,35,157,1,0,0,0,37,169,1,0,0,0,39,180,1,0,
+        0,0,41,189,1,0,0,0,43,200,1,0,0,0,45,207,1,0,0,0,47,212,1,0,0,0,
+        49,217,1,0,0,0,51,222,1,0,0,0,53,228,1,0,0,0,55,56,5,82,0,0,56,57,
+        5,69,0,0,57,58,5,83,0,0,58,59,5,69,0,0,59,60,5,82,0,0,60,61,5,86,
+        0,0,61,62,5,65,0,0,62,2,1,0,0,0,63,64,5,83,0,0,64,65,5,65,0,0,65,
+        66,5,76,0,0,66,67,5,65,0,0,67,4,1,0,0,0,68,69,5,80,0,0,69,70,5,65,
+        0,0,70,71,5,82,0,0,71,72,5,65,0,0,72,6,1,0,0,0,73,74,5,68,0,0,74,
+        75,5,69,0,0,75,8,1,0,0,0,76,77,5,65,0,0,77,10,1,0,0,0,78,79,5,67,
+        0,0,79,80,5,65,0,0,80,81,5,68,0,0,81,82,5,65,0,0,82,12,1,0,0,0,83,
+        84,5,83,0,0,84,85,5,69,0,0,85,86,5,77,0,0,86,87,5,65,0,0,87,88,5,
+        78,0,0,88,89,5,65,0,0,89,14,1,0,0,0,90,91,5,72,0,0,91,92,5,65,0,
+        0,92,93,5,83,0,0,93,94,5,84,0,0,94,95,5,65,0,0,95,16,1,0,0,0,96,
+        97,5,73,0,0,97,98,5,78,0,0,98,99,5,73,0,0,99,100,5,67,0,0,100,101,
+        5,73,0,0,101,102,5,79,0,0,102,18,1,0,0,0,103,104,5,70,0,0,104,105,
+        5,73,0,0,105,106,5,78,0,0,106,20,1,0,0,0,107,108,5,67,0,0,108,109,
+        5,65,0,0,109,110,5,78,0,0,110,111,5,67,0,0,111,112,5,69,0,0,112,
+        113,5,76,0,0,113,114,5,65,0,0,114,115,5,82,0,0,115,22,1,0,0,0,116,
+        117,5,76,0,0,117,118,5,73,0,0,118,119,5,83,0,0,119,120,5,84,0,0,
+        120,121,5,65,0,0,121,122,5,82,0,0,122,24,1,0,0,0,123,124,5,76,0,
+        0,124,125,5,73,0,0,125,126,5,77,0,0,126,127,5,73,0,0,127,128,5,84,
+        0,0,128,129,5,69,0,0,129,26,1,0,0,0,130,131,5,83,0,0,131,132,5,65,
+        0,0,132,133,5,76,0,0,133,134,5,84,0,0,134,135,5,65,0,0,135,136,5,
+        82,0,0,136,28,1,0,0,0,137,138,5,85,0,0,138,139,5,83,0,0,139,140,
+        5,85,0,0,140,141,5,65,0,0,141,142,5,82,0,0,142,143,5,73,0,0,143,
+        144,5,79,0,0,144,30,1,0,0,0,145,146,5,70,0,0,146,147,5,69,0,0,147,
+        148,5,67,0,0,148,149,5,72,0,0,149,150,5,65,0,0,150,32,1,0,0,0,151,
+        152,5,68,0,0,152,153,5,69,0,0,153,154,5,83,0,0,154,155,5,68,0,0,
+        155,156,5,69,0,0,156,34,1,0,0,0,157,158,5,82,0,0,158,159,5,69,0,
+        0,159,160,5,80,0,0,160,161,5,82,0,0,161,162,5,79,0,0,162,163,5,71,
+        0,0,163,164,5,82,0,0,164,165,5,65,0,0,165,166,5,77,0,0,166,167,5,
+        65,0,0,167,168,5,82,0,0,168,36,1,0,0,0,169,170,5,68,0,0,170,171,
+        5,73,0,0,171,172,5,83,0,0,172,173,5,80,0,0,173,174,5,79,0,0,174,
+        175,5,78,0,0,175,176,5,73,0,0,176,177,5,66,0,0,177,178,5,76,0,0,
+        178,179,5,69,0,0,179,38,1,0,0,0,180,181,5,68,0,0,181,182,5,85,0,
+        0,182,183,5,82,0,0,183,184,5,65,0,0,184,185,5,67,0,0,185,186,5,73,
+        0,0,186,187,5,79,0,0,187,188,5,78,0,0,188,40,1,0,0,0,189,190,3,53,
+        26,0,190,191,3,53,26,0,191,192,5,47,0,0,192,193,3,53,26,0,193,194,
+        3,53,26,0,194,195,5,47,0,0,195,196,3,53,26,0,196,197,3,53,26,0,197,
+        198,3,53,26,0,198,199,3,53,26,0,199,42,1,0,0,0,200,201,3,53,26,0,
+        201,202,3,53,26,0,202,203,5,58,0,0,203,204,3,53,26,0,204,205,3,53,
+        26,0,205,44,1,0,0,0,206,208,7,0,0,0,207,206,1,0,0,0,208,209,1,0,
+        0,0,209,207,1,0,0,0,209,210,1,0,0,0,210,46,1,0,0,0,211,213,7,1,0,
+        0,212,211,1,0,0,0,213,214,1,0,0,0,214,212,1,0,0,0,214,215,1,0,0,
+        0,215,48,1,0,0,0,216,218,5,13,0,0,217,216,1,0,0,0,217,218,1,0,0,
+        0,218,219,1,0,0,0,219,220,5,10,0,0,220,50,1,0,0,0,221,223,7,2,0,
+        0,222,221,1,0,0,0,223,224,1,0,0,0,224,222,1,0,0,0,224,225,1,0,0,
+        0,225,226,1,0,0,0,226,227,6,25,0,0,227,52,1,0,0,0,228,229,7,0,0,
+        0,229,54,1,0,0,0,5,0,209,214,217,224,1,6,0,0
     ]
 
 class ConfRoomSchedulerLexer(Lexer):
@@ -66,27 +103,42 @@ class ConfRoomSchedulerLexer(Lexer):
     T__5 = 6
     T__6 = 7
     T__7 = 8
-    DATE = 9
-    TIME = 10
-    ID = 11
-    USER = 12
-    NEWLINE = 13
-    WS = 14
+    T__8 = 9
+    T__9 = 10
+    T__10 = 11
+    T__11 = 12
+    T__12 = 13
+    T__13 = 14
+    T__14 = 15
+    T__15 = 16
+    T__16 = 17
+    T__17 = 18
+    T__18 = 19
+    T__19 = 20
+    DATE = 21
+    TIME = 22
+    ID = 23
+    USER = 24
+    NEWLINE = 25
+    WS = 26
 
     channelNames = [ u"DEFAULT_TOKEN_CHANNEL", u"HIDDEN" ]
 
     modeNames = [ "DEFAULT_MODE" ]
 
     literalNames = [ "<INVALID>",
-            "'RESERVA'", "'SALA'", "'PARA'", "'DE'", "'A'", "'CANCELAR'", 
-            "'LISTAR'", "'REPROGRAMAR'" ]
+            "'RESERVA'", "'SALA'", "'PARA'", "'DE'", "'A'", "'CADA'", "'SEMANA'", 
+            "'HASTA'", "'INICIO'", "'FIN'", "'CANCELAR'", "'LISTAR'", "'LIMITE'", 
+            "'SALTAR'", "'USUARIO'", "'FECHA'", "'DESDE'", "'REPROGRAMAR'", 
+            "'DISPONIBLE'", "'DURACION'" ]
 
     symbolicNames = [ "<INVALID>",
             "DATE", "TIME", "ID", "USER", "NEWLINE", "WS" ]
 
     ruleNames = [ "T__0", "T__1", "T__2", "T__3", "T__4", "T__5", "T__6", 
-                  "T__7", "DATE", "TIME", "ID", "USER", "NEWLINE", "WS", 
-                  "DIGIT" ]
+                  "T__7", "T__8", "T__9", "T__10", "T__11", "T__12", "T__13", 
+                  "T__14", "T__15", "T__16", "T__17", "T__18", "T__19", 
+                  "DATE", "TIME", "ID", "USER", "NEWLINE", "WS", "DIGIT" ]
 
     grammarFileName = "ConfRoomScheduler.g4"
 
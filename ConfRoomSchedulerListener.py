@@ -53,6 +53,24 @@ class ConfRoomSchedulerListener(ParseTreeListener):
         pass
 
 
+    # Enter a parse tree produced by ConfRoomSchedulerParser#availableStat.
+    def enterAvailableStat(self, ctx:ConfRoomSchedulerParser.AvailableStatContext):
+        pass
+
+    # Exit a parse tree produced by ConfRoomSchedulerParser#availableStat.
+    def exitAvailableStat(self, ctx:ConfRoomSchedulerParser.AvailableStatContext):
+        pass
+
+
+    # Enter a parse tree produced by ConfRoomSchedulerParser#blockStat.
+    def enterBlockStat(self, ctx:ConfRoomSchedulerParser.BlockStatContext):
+        pass
+
+    # Exit a parse tree produced by ConfRoomSchedulerParser#blockStat.
+    def exitBlockStat(self, ctx:ConfRoomSchedulerParser.BlockStatContext):
+        pass
+
+
     # Enter a parse tree produced by ConfRoomSchedulerParser#blank.
     def enterBlank(self, ctx:ConfRoomSchedulerParser.BlankContext):
         pass
@@ -71,6 +89,24 @@ class ConfRoomSchedulerListener(ParseTreeListener):
         pass
 
 
+    # Enter a parse tree produced by ConfRoomSchedulerParser#recurrence.
+    def enterRecurrence(self, ctx:ConfRoomSchedulerParser.RecurrenceContext):
+        pass
+
+    # Exit a parse tree produced by ConfRoomSchedulerParser#recurrence.
+    def exitRecurrence(self, ctx:ConfRoomSchedulerParser.RecurrenceContext):
+        pass
+
+
+    # Enter a parse tree produced by ConfRoomSchedulerParser#block.
+    def enterBlock(self, ctx:ConfRoomSchedulerParser.BlockContext):
+        pass
+
+    # Exit a parse tree produced by ConfRoomSchedulerParser#block.
+    def exitBlock(self, ctx:ConfRoomSchedulerParser.BlockContext):
+        pass
+
+
     # Enter a parse tree produced by ConfRoomSchedulerParser#cancel.
     def enterCancel(self, ctx:ConfRoomSchedulerParser.CancelContext):
         pass
@@ -89,6 +125,15 @@ class ConfRoomSchedulerListener(ParseTreeListener):
         pass
 
 
+    # Enter a parse tree produced by ConfRoomSchedulerParser#listFilter.
+    def enterListFilter(self, ctx:ConfRoomSchedulerParser.ListFilterContext):
+        pass
+
+    # Exit a parse tree produced by ConfRoomSchedulerParser#listFilter.
+    def exitListFilter(self, ctx:ConfRoomSchedulerParser.ListFilterContext):
+        pass
+
+
     # Enter a parse tree produced by ConfRoomSchedulerParser#reprogram.
     def enterReprogram(self, ctx:ConfRoomSchedulerParser.ReprogramContext):
         pass
@@ -98,5 +143,14 @@ class ConfRoomSchedulerListener(ParseTreeListener):
         pass
 
 
+    # Enter a parse tree produced by ConfRoomSchedulerParser#available.
+    def enterAvailable(self, ctx:ConfRoomSchedulerParser.AvailableContext):
+        pass
+
+    # Exit a parse tree produced by ConfRoomSchedulerParser#available.
+    def exitAvailable(self, ctx:ConfRoomSchedulerParser.AvailableContext):
+        pass
+
+
 
 del ConfRoomSchedulerParser
\ No newline at end of file
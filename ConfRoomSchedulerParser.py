@@ -10,25 +10,47 @@ else:
 
 def serializedATN():
     return [
-        4,1,14,65,2,0,7,0,2,1,7,1,2,2,7,2,2,3,7,3,2,4,7,4,2,5,7,5,1,0,1,
-        0,1,0,5,0,16,8,0,10,0,12,0,19,9,0,1,0,1,0,1,1,1,1,1,1,1,1,1,1,3,
-        1,28,8,1,1,2,1,2,1,2,1,2,1,2,1,2,1,2,1,2,1,2,1,2,1,2,1,3,1,3,1,3,
-        1,3,1,3,1,3,1,3,1,3,1,3,1,4,1,4,1,5,1,5,1,5,1,5,1,5,1,5,1,5,1,5,
-        1,5,1,5,1,5,1,5,1,5,1,5,0,0,6,0,2,4,6,8,10,0,0,63,0,17,1,0,0,0,2,
-        27,1,0,0,0,4,29,1,0,0,0,6,40,1,0,0,0,8,49,1,0,0,0,10,51,1,0,0,0,
-        12,13,3,2,1,0,13,14,5,13,0,0,14,16,1,0,0,0,15,12,1,0,0,0,16,19,1,
-        0,0,0,17,15,1,0,0,0,17,18,1,0,0,0,18,20,1,0,0,0,19,17,1,0,0,0,20,
-        21,3,2,1,0,21,1,1,0,0,0,22,28,3,4,2,0,23,28,3,6,3,0,24,28,3,8,4,
-        0,25,28,3,10,5,0,26,28,1,0,0,0,27,22,1,0,0,0,27,23,1,0,0,0,27,24,
-        1,0,0,0,27,25,1,0,0,0,27,26,1,0,0,0,28,3,1,0,0,0,29,30,5,1,0,0,30,
-        31,5,12,0,0,31,32,5,2,0,0,32,33,5,11,0,0,33,34,5,3,0,0,34,35,5,9,
-        0,0,35,36,5,4,0,0,36,37,5,10,0,0,37,38,5,5,0,0,38,39,5,10,0,0,39,
-        5,1,0,0,0,40,41,5,6,0,0,41,42,5,11,0,0,42,43,5,3,0,0,43,44,5,9,0,
-        0,44,45,5,4,0,0,45,46,5,10,0,0,46,47,5,5,0,0,47,48,5,10,0,0,48,7,
-        1,0,0,0,49,50,5,7,0,0,50,9,1,0,0,0,51,52,5,8,0,0,52,53,5,11,0,0,
-        53,54,5,3,0,0,54,55,5,9,0,0,55,56,5,4,0,0,56,57,5,10,0,0,57,58,5,
-        5,0,0,58,59,5,10,0,0,59,60,5,3,0,0,60,61,5,10,0,0,61,62,5,5,0,0,
-        62,63,5,10,0,0,63,11,1,0,0,0,2,17,27
+        4,1,26,130,2,0,7,0,2,1,7,1,2,2,7,2,2,3,7,3,2,4,7,4,2,5,7,5,2,6,7,
+        6,2,7,7,7,2,8,7,8,2,9,7,9,1,0,1,0,1,0,5,0,24,8,0,10,0,12,0,27,9,
+        0,1,0,1,0,1,1,1,1,1,1,1,1,1,1,1,1,1,1,3,1,38,8,1,1,2,1,2,1,2,1,2,
+        1,2,1,2,1,2,1,2,1,2,1,2,1,2,3,2,51,8,2,1,3,1,3,1,3,1,3,1,3,1,4,1,
+        4,1,4,3,4,61,8,4,1,4,5,4,64,8,4,10,4,12,4,67,9,4,1,4,1,4,1,5,1,5,
+        1,5,1,5,1,5,1,5,1,5,1,5,1,5,1,6,1,6,5,6,82,8,6,10,6,12,6,85,9,6,
+        1,6,1,6,3,6,89,8,6,1,6,1,6,3,6,93,8,6,1,7,1,7,1,7,1,7,1,7,1,7,1,
+        7,1,7,1,7,1,7,3,7,105,8,7,1,8,1,8,1,8,1,8,1,8,1,8,1,8,1,8,1,8,1,
+        8,1,8,1,8,1,8,1,9,1,9,1,9,1,9,1,9,1,9,1,9,1,9,1,9,1,9,1,9,0,0,10,
+        0,2,4,6,8,10,12,14,16,18,0,0,135,0,25,1,0,0,0,2,37,1,0,0,0,4,39,
+        1,0,0,0,6,52,1,0,0,0,8,57,1,0,0,0,10,70,1,0,0,0,12,79,1,0,0,0,14,
+        104,1,0,0,0,16,106,1,0,0,0,18,119,1,0,0,0,20,21,3,2,1,0,21,22,5,
+        25,0,0,22,24,1,0,0,0,23,20,1,0,0,0,24,27,1,0,0,0,25,23,1,0,0,0,25,
+        26,1,0,0,0,26,28,1,0,0,0,27,25,1,0,0,0,28,29,3,2,1,0,29,1,1,0,0,
+        0,30,38,3,4,2,0,31,38,3,10,5,0,32,38,3,12,6,0,33,38,3,16,8,0,34,
+        38,3,18,9,0,35,38,3,8,4,0,36,38,1,0,0,0,37,30,1,0,0,0,37,31,1,0,
+        0,0,37,32,1,0,0,0,37,33,1,0,0,0,37,34,1,0,0,0,37,35,1,0,0,0,37,36,
+        1,0,0,0,38,3,1,0,0,0,39,40,5,1,0,0,40,41,5,24,0,0,41,42,5,2,0,0,
+        42,43,5,23,0,0,43,44,5,3,0,0,44,45,5,21,0,0,45,46,5,4,0,0,46,47,
+        5,22,0,0,47,48,5,5,0,0,48,50,5,22,0,0,49,51,3,6,3,0,50,49,1,0,0,
+        0,50,51,1,0,0,0,51,5,1,0,0,0,52,53,5,6,0,0,53,54,5,7,0,0,54,55,5,
+        8,0,0,55,56,5,21,0,0,56,7,1,0,0,0,57,58,5,9,0,0,58,65,5,25,0,0,59,
+        61,3,4,2,0,60,59,1,0,0,0,60,61,1,0,0,0,61,62,1,0,0,0,62,64,5,25,
+        0,0,63,60,1,0,0,0,64,67,1,0,0,0,65,63,1,0,0,0,65,66,1,0,0,0,66,68,
+        1,0,0,0,67,65,1,0,0,0,68,69,5,10,0,0,69,9,1,0,0,0,70,71,5,11,0,0,
+        71,72,5,23,0,0,72,73,5,3,0,0,73,74,5,21,0,0,74,75,5,4,0,0,75,76,
+        5,22,0,0,76,77,5,5,0,0,77,78,5,22,0,0,78,11,1,0,0,0,79,83,5,12,0,
+        0,80,82,3,14,7,0,81,80,1,0,0,0,82,85,1,0,0,0,83,81,1,0,0,0,83,84,
+        1,0,0,0,84,88,1,0,0,0,85,83,1,0,0,0,86,87,5,13,0,0,87,89,5,23,0,
+        0,88,86,1,0,0,0,88,89,1,0,0,0,89,92,1,0,0,0,90,91,5,14,0,0,91,93,
+        5,23,0,0,92,90,1,0,0,0,92,93,1,0,0,0,93,13,1,0,0,0,94,95,5,2,0,0,
+        95,105,5,23,0,0,96,97,5,15,0,0,97,105,5,24,0,0,98,99,5,16,0,0,99,
+        105,5,21,0,0,100,101,5,17,0,0,101,102,5,21,0,0,102,103,5,8,0,0,103,
+        105,5,21,0,0,104,94,1,0,0,0,104,96,1,0,0,0,104,98,1,0,0,0,104,100,
+        1,0,0,0,105,15,1,0,0,0,106,107,5,18,0,0,107,108,5,23,0,0,108,109,
+        5,3,0,0,109,110,5,21,0,0,110,111,5,4,0,0,111,112,5,22,0,0,112,113,
+        5,5,0,0,113,114,5,22,0,0,114,115,5,3,0,0,115,116,5,22,0,0,116,117,
+        5,5,0,0,117,118,5,22,0,0,118,17,1,0,0,0,119,120,5,19,0,0,120,121,
+        5,3,0,0,121,122,5,21,0,0,122,123,5,4,0,0,123,124,5,22,0,0,124,125,
+        5,5,0,0,125,126,5,22,0,0,126,127,5,20,0,0,127,128,5,23,0,0,128,19,
+        1,0,0,0,9,25,37,50,60,65,83,88,92,104
     ]
 
 class ConfRoomSchedulerParser ( Parser ):
@@ -42,9 +64,15 @@ class ConfRoomSchedulerParser ( Parser ):
     sharedContextCache = PredictionContextCache()
 
     literalNames = [ "<INVALID>", "'RESERVA'", "'SALA'", "'PARA'", "'DE'", 
-                     "'A'", "'CANCELAR'", "'LISTAR'", "'REPROGRAMAR'" ]
+                     "'A'", "'CADA'", "'SEMANA'", "'HASTA'", "'INICIO'", 
+                     "'FIN'", "'CANCELAR'", "'LISTAR'", "'LIMITE'", "'SALTAR'", 
+                     "'USUARIO'", "'FECHA'", "'DESDE'", "'REPROGRAMAR'", 
+                     "'DISPONIBLE'", "'DURACION'" ]
 
     symbolicNames = [ "<INVALID>", "<INVALID>", "<INVALID>", "<INVALID>", 
+                      "<INVALID>", "<INVALID>", "<INVALID>", "<INVALID>", 
+                      "<INVALID>", "<INVALID>", "<INVALID>", "<INVALID>", 
+                      "<INVALID>", "<INVALID>", "<INVALID>", "<INVALID>", 
                       "<INVALID>", "<INVALID>", "<INVALID>", "<INVALID>", 
                       "<INVALID>", "DATE", "TIME", "ID", "USER", "NEWLINE", 
                       "WS" ]
@@ -52,11 +80,16 @@ class ConfRoomSchedulerParser ( Parser ):
     RULE_prog = 0
     RULE_stat = 1
     RULE_reserve = 2
-    RULE_cancel = 3
-    RULE_list = 4
-    RULE_reprogram = 5
+    RULE_recurrence = 3
+    RULE_block = 4
+    RULE_cancel = 5
+    RULE_list = 6
+    RULE_listFilter = 7
+    RULE_reprogram = 8
+    RULE_available = 9
 
-    ruleNames =  [ "prog", "stat", "reserve", "cancel", "list", "reprogram" ]
+    ruleNames =  [ "prog", "stat", "reserve", "recurrence", "block", "cancel", 
+                   "list", "listFilter", "reprogram", "available" ]
 
     EOF = Token.EOF
     T__0=1
@@ -67,12 +100,24 @@ class ConfRoomSchedulerParser ( Parser ):
     T__5=6
     T__6=7
     T__7=8
-    DATE=9
-    TIME=10
-    ID=11
-    USER=12
-    NEWLINE=13
-    WS=14
+    T__8=9
+    T__9=10
+    T__10=11
+    T__11=12
+    T__12=13
+    T__13=14
+    T__14=15
+    T__15=16
+    T__16=17
+    T__17=18
+    T__18=19
+    T__19=20
+    DATE=21
+    TIME=22
+    ID=23
+    USER=24
+    NEWLINE=25
+    WS=26
 
     def __init__(self, input:TokenStream, output:TextIO = sys.stdout):
         super().__init__(input, output)
@@ -123,20 +168,20 @@ class ConfRoomSchedulerParser ( Parser ):
         self.enterRule(localctx, 0, self.RULE_prog)
         try:
             self.enterOuterAlt(localctx, 1)
-            self.state = 17
+            self.state = 25
             self._errHandler.sync(self)
             _alt = self._interp.adaptivePredict(self._input,0,self._ctx)
             while _alt!=2 and _alt!=ATN.INVALID_ALT_NUMBER:
                 if _alt==1:
-                    self.state = 12
+                    self.state = 20
                     self.stat()
-                    self.state = 13
+                    self.state = 21
                     self.match(ConfRoomSchedulerParser.NEWLINE) 
-                self.state = 19
+                self.state = 27
                 self._errHandler.sync(self)
                 _alt = self._interp.adaptivePredict(self._input,0,self._ctx)
 
-            self.state = 20
+            self.state = 28
             self.stat()
         except RecognitionException as re:
             localctx.exception = re
@@ -164,6 +209,25 @@ class ConfRoomSchedulerParser ( Parser ):
 
 
 
+    class BlockStatContext(StatContext):
+
+        def __init__(self, parser, ctx:ParserRuleContext): # actually a ConfRoomSchedulerParser.StatContext
+            super().__init__(parser)
+            self.copyFrom(ctx)
+
+        def block(self):
+            return self.getTypedRuleContext(ConfRoomSchedulerParser.BlockContext,0)
+
+
+        def enterRule(self, listener:ParseTreeListener):
+            if hasattr( listener, "enterBlockStat" ):
+                listener.enterBlockStat(self)
+
+        def exitRule(self, listener:ParseTreeListener):
+            if hasattr( listener, "exitBlockStat" ):
+                listener.exitBlockStat(self)
+
+
     class BlankContext(StatContext):
 
         def __init__(self, parser, ctx:ParserRuleContext): # actually a ConfRoomSchedulerParser.StatContext
@@ -199,6 +263,25 @@ class ConfRoomSchedulerParser ( Parser ):
                 listener.exitListStat(self)
 
 
+    class AvailableStatContext(StatContext):
+
+        def __init__(self, parser, ctx:ParserRuleContext): # actually a ConfRoomSchedulerParser.StatContext
+            super().__init__(parser)
+            self.copyFrom(ctx)
+
+        def available(self):
+            return self.getTypedRuleContext(ConfRoomSchedulerParser.AvailableContext,0)
+
+
+        def enterRule(self, listener:ParseTreeListener):
+            if hasattr( listener, "enterAvailableStat" ):
+                listener.enterAvailableStat(self)
+
+        def exitRule(self, listener:ParseTreeListener):
+            if hasattr( listener, "exitAvailableStat" ):
+                listener.exitAvailableStat(self)
+
+
     class ReserveStatContext(StatContext):
 
         def __init__(self, parser, ctx:ParserRuleContext): # actually a ConfRoomSchedulerParser.StatContext
@@ -262,36 +345,48 @@ class ConfRoomSchedulerParser ( Parser ):
         localctx = ConfRoomSchedulerParser.StatContext(self, self._ctx, self.state)
         self.enterRule(localctx, 2, self.RULE_stat)
         try:
-            self.state = 27
+            self.state = 37
             self._errHandler.sync(self)
             token = self._input.LA(1)
             if token in [1]:
                 localctx = ConfRoomSchedulerParser.ReserveStatContext(self, localctx)
                 self.enterOuterAlt(localctx, 1)
-                self.state = 22
+                self.state = 30
                 self.reserve()
                 pass
-            elif token in [6]:
+            elif token in [11]:
                 localctx = ConfRoomSchedulerParser.CancelStatContext(self, localctx)
                 self.enterOuterAlt(localctx, 2)
-                self.state = 23
+                self.state = 31
                 self.cancel()
                 pass
-            elif token in [7]:
+            elif token in [12]:
                 localctx = ConfRoomSchedulerParser.ListStatContext(self, localctx)
                 self.enterOuterAlt(localctx, 3)
-                self.state = 24
+                self.state = 32
                 self.list_()
                 pass
-            elif token in [8]:
+            elif token in [18]:
                 localctx = ConfRoomSchedulerParser.ReprogramStatContext(self, localctx)
                 self.enterOuterAlt(localctx, 4)
-                self.state = 25
+                self.state = 33
                 self.reprogram()
                 pass
-            elif token in [-1, 13]:
-                localctx = ConfRoomSchedulerParser.BlankContext(self, localctx)
+            elif token in [19]:
+                localctx = ConfRoomSchedulerParser.AvailableStatContext(self, localctx)
                 self.enterOuterAlt(localctx, 5)
+                self.state = 34
+                self.available()
+                pass
+            elif token in [9]:
+                localctx = ConfRoomSchedulerParser.BlockStatContext(self, localctx)
+                self.enterOuterAlt(localctx, 6)
+                self.state = 35
+                self.block()
+                pass
+            elif token in [-1, 25]:
+                localctx = ConfRoomSchedulerParser.BlankContext(self, localctx)
+                self.enterOuterAlt(localctx, 7)
 
                 pass
             else:
@@ -328,6 +423,10 @@ class ConfRoomSchedulerParser ( Parser ):
             else:
                 return self.getToken(ConfRoomSchedulerParser.TIME, i)
 
+        def recurrence(self):
+            return self.getTypedRuleContext(ConfRoomSchedulerParser.RecurrenceContext,0)
+
+
         def getRuleIndex(self):
             return ConfRoomSchedulerParser.RULE_reserve
 
@@ -346,28 +445,158 @@ class ConfRoomSchedulerParser ( Parser ):
 
         localctx = ConfRoomSchedulerParser.ReserveContext(self, self._ctx, self.state)
         self.enterRule(localctx, 4, self.RULE_reserve)
+        self._la = 0 # Token type
         try:
             self.enterOuterAlt(localctx, 1)
-            self.state = 29
+            self.state = 39
             self.match(ConfRoomSchedulerParser.T__0)
-            self.state = 30
+            self.state = 40
             self.match(ConfRoomSchedulerParser.USER)
-            self.state = 31
+            self.state = 41
             self.match(ConfRoomSchedulerParser.T__1)
-            self.state = 32
+            self.state = 42
             self.match(ConfRoomSchedulerParser.ID)
-            self.state = 33
+            self.state = 43
             self.match(ConfRoomSchedulerParser.T__2)
-            self.state = 34
+            self.state = 44
             self.match(ConfRoomSchedulerParser.DATE)
-            self.state = 35
+            self.state = 45
             self.match(ConfRoomSchedulerParser.T__3)
-            self.state = 36
+            self.state = 46
             self.match(ConfRoomSchedulerParser.TIME)
-            self.state = 37
+            self.state = 47
             self.match(ConfRoomSchedulerParser.T__4)
-            self.state = 38
+            self.state = 48
             self.match(ConfRoomSchedulerParser.TIME)
+            self.state = 50
+            self._errHandler.sync(self)
+            _la = self._input.LA(1)
+            if _la==6:
+                self.state = 49
+                self.recurrence()
+
+
+        except RecognitionException as re:
+            localctx.exception = re
+            self._errHandler.reportError(self, re)
+            self._errHandler.recover(self, re)
+        finally:
+            self.exitRule()
+        return localctx
+
+
+    class RecurrenceContext(ParserRuleContext):
+        __slots__ = 'parser'
+
+        def __init__(self, parser, parent:ParserRuleContext=None, invokingState:int=-1):
+            super().__init__(parent, invokingState)
+            self.parser = parser
+
+        def DATE(self):
+            return self.getToken(ConfRoomSchedulerParser.DATE, 0)
+
+        def getRuleIndex(self):
+            return ConfRoomSchedulerParser.RULE_recurrence
+
+        def enterRule(self, listener:ParseTreeListener):
+            if hasattr( listener, "enterRecurrence" ):
+                listener.enterRecurrence(self)
+
+        def exitRule(self, listener:ParseTreeListener):
+            if hasattr( listener, "exitRecurrence" ):
+                listener.exitRecurrence(self)
+
+
+
+
+    def recurrence(self):
+
+        localctx = ConfRoomSchedulerParser.RecurrenceContext(self, self._ctx, self.state)
+        self.enterRule(localctx, 6, self.RULE_recurrence)
+        try:
+            self.enterOuterAlt(localctx, 1)
+            self.state = 52
+            self.match(ConfRoomSchedulerParser.T__5)
+            self.state = 53
+            self.match(ConfRoomSchedulerParser.T__6)
+            self.state = 54
+            self.match(ConfRoomSchedulerParser.T__7)
+            self.state = 55
+            self.match(ConfRoomSchedulerParser.DATE)
+        except RecognitionException as re:
+            localctx.exception = re
+            self._errHandler.reportError(self, re)
+            self._errHandler.recover(self, re)
+        finally:
+            self.exitRule()
+        return localctx
+
+
+    class BlockContext(ParserRuleContext):
+        __slots__ = 'parser'
+
+        def __init__(self, parser, parent:ParserRuleContext=None, invokingState:int=-1):
+            super().__init__(parent, invokingState)
+            self.parser = parser
+
+        def NEWLINE(self, i:int=None):
+            if i is None:
+                return self.getTokens(ConfRoomSchedulerParser.NEWLINE)
+            else:
+                return self.getToken(ConfRoomSchedulerParser.NEWLINE, i)
+
+        def reserve(self, i:int=None):
+            if i is None:
+                return self.getTypedRuleContexts(ConfRoomSchedulerParser.ReserveContext)
+            else:
+                return self.getTypedRuleContext(ConfRoomSchedulerParser.ReserveContext,i)
+
+
+        def getRuleIndex(self):
+            return ConfRoomSchedulerParser.RULE_block
+
+        def enterRule(self, listener:ParseTreeListener):
+            if hasattr( listener, "enterBlock" ):
+                listener.enterBlock(self)
+
+        def exitRule(self, listener:ParseTreeListener):
+            if hasattr( listener, "exitBlock" ):
+                listener.exitBlock(self)
+
+
+
+
+    def block(self):
+
+        localctx = ConfRoomSchedulerParser.BlockContext(self, self._ctx, self.state)
+        self.enterRule(localctx, 8, self.RULE_block)
+        self._la = 0 # Token type
+        try:
+            self.enterOuterAlt(localctx, 1)
+            self.state = 57
+            self.match(ConfRoomSchedulerParser.T__8)
+            self.state = 58
+            self.match(ConfRoomSchedulerParser.NEWLINE)
+            self.state = 65
+            self._errHandler.sync(self)
+            _la = self._input.LA(1)
+            while _la==1 or _la==25:
+                self.state = 60
+                self._errHandler.sync(self)
+                _la = self._input.LA(1)
+                if _la==1:
+                    self.state = 59
+                    self.reserve()
+
+
+                self.state = 62
+                self.match(ConfRoomSchedulerParser.NEWLINE)
+                self.state = 67
+                self._errHandler.sync(self)
+                _la = self._input.LA(1)
+
+            self.state = 68
+            self.match(ConfRoomSchedulerParser.T__9)
         except RecognitionException as re:
             localctx.exception = re
             self._errHandler.reportError(self, re)
@@ -413,24 +642,24 @@ class ConfRoomSchedulerParser ( Parser ):
     def cancel(self):
 
         localctx = ConfRoomSchedulerParser.CancelContext(self, self._ctx, self.state)
-        self.enterRule(localctx, 6, self.RULE_cancel)
+        self.enterRule(localctx, 10, self.RULE_cancel)
         try:
             self.enterOuterAlt(localctx, 1)
-            self.state = 40
-            self.match(ConfRoomSchedulerParser.T__5)
-            self.state = 41
+            self.state = 70
+            self.match(ConfRoomSchedulerParser.T__10)
+            self.state = 71
             self.match(ConfRoomSchedulerParser.ID)
-            self.state = 42
+            self.state = 72
             self.match(ConfRoomSchedulerParser.T__2)
-            self.state = 43
+            self.state = 73
             self.match(ConfRoomSchedulerParser.DATE)
-            self.state = 44
+            self.state = 74
             self.match(ConfRoomSchedulerParser.T__3)
-            self.state = 45
+            self.state = 75
             self.match(ConfRoomSchedulerParser.TIME)
-            self.state = 46
+            self.state = 76
             self.match(ConfRoomSchedulerParser.T__4)
-            self.state = 47
+            self.state = 77
             self.match(ConfRoomSchedulerParser.TIME)
         except RecognitionException as re:
             localctx.exception = re
@@ -447,7 +676,21 @@ class ConfRoomSchedulerParser ( Parser ):
         def __init__(self, parser, parent:ParserRuleContext=None, invokingState:int=-1):
             super().__init__(parent, invokingState)
             self.parser = parser
+            self.limit = None # Token
+            self.offset = None # Token
+
+        def listFilter(self, i:int=None):
+            if i is None:
+                return self.getTypedRuleContexts(ConfRoomSchedulerParser.ListFilterContext)
+            else:
+                return self.getTypedRuleContext(ConfRoomSchedulerParser.ListFilterContext,i)
+
 
+        def ID(self, i:int=None):
+            if i is None:
+                return self.getTokens(ConfRoomSchedulerParser.ID)
+            else:
+                return self.getToken(ConfRoomSchedulerParser.ID, i)
 
         def getRuleIndex(self):
             return ConfRoomSchedulerParser.RULE_list
@@ -466,11 +709,132 @@ class ConfRoomSchedulerParser ( Parser ):
     def list_(self):
 
         localctx = ConfRoomSchedulerParser.ListContext(self, self._ctx, self.state)
-        self.enterRule(localctx, 8, self.RULE_list)
+        self.enterRule(localctx, 12, self.RULE_list)
+        self._la = 0 # Token type
         try:
             self.enterOuterAlt(localctx, 1)
-            self.state = 49
-            self.match(ConfRoomSchedulerParser.T__6)
+            self.state = 79
+            self.match(ConfRoomSchedulerParser.T__11)
+            self.state = 83
+            self._errHandler.sync(self)
+            _la = self._input.LA(1)
+            while (((_la) & ~0x3f) == 0 and ((1 << _la) & 229380) != 0):
+                self.state = 80
+                self.listFilter()
+                self.state = 85
+                self._errHandler.sync(self)
+                _la = self._input.LA(1)
+
+            self.state = 88
+            self._errHandler.sync(self)
+            _la = self._input.LA(1)
+            if _la==13:
+                self.state = 86
+                self.match(ConfRoomSchedulerParser.T__12)
+                self.state = 87
+                localctx.limit = self.match(ConfRoomSchedulerParser.ID)
+
+
+            self.state = 92
+            self._errHandler.sync(self)
+            _la = self._input.LA(1)
+            if _la==14:
+                self.state = 90
+                self.match(ConfRoomSchedulerParser.T__13)
+                self.state = 91
+                localctx.offset = self.match(ConfRoomSchedulerParser.ID)
+
+
+        except RecognitionException as re:
+            localctx.exception = re
+            self._errHandler.reportError(self, re)
+            self._errHandler.recover(self, re)
+        finally:
+            self.exitRule()
+        return localctx
+
+
+    class ListFilterContext(ParserRuleContext):
+        __slots__ = 'parser'
+
+        def __init__(self, parser, parent:ParserRuleContext=None, invokingState:int=-1):
+            super().__init__(parent, invokingState)
+            self.parser = parser
+            self.room = None # Token
+            self.user = None # Token
+            self.date = None # Token
+            self.since = None # Token
+            self.until = None # Token
+
+        def ID(self):
+            return self.getToken(ConfRoomSchedulerParser.ID, 0)
+
+        def USER(self):
+            return self.getToken(ConfRoomSchedulerParser.USER, 0)
+
+        def DATE(self, i:int=None):
+            if i is None:
+                return self.getTokens(ConfRoomSchedulerParser.DATE)
+            else:
+                return self.getToken(ConfRoomSchedulerParser.DATE, i)
+
+        def getRuleIndex(self):
+            return ConfRoomSchedulerParser.RULE_listFilter
+
+        def enterRule(self, listener:ParseTreeListener):
+            if hasattr( listener, "enterListFilter" ):
+                listener.enterListFilter(self)
+
+        def exitRule(self, listener:ParseTreeListener):
+            if hasattr( listener, "exitListFilter" ):
+                listener.exitListFilter(self)
+
+
+
+
+    def listFilter(self):
+
+        localctx = ConfRoomSchedulerParser.ListFilterContext(self, self._ctx, self.state)
+        self.enterRule(localctx, 14, self.RULE_listFilter)
+        try:
+            self.state = 104
+            self._errHandler.sync(self)
+            token = self._input.LA(1)
+            if token in [2]:
+                self.enterOuterAlt(localctx, 1)
+                self.state = 94
+                self.match(ConfRoomSchedulerParser.T__1)
+                self.state = 95
+                localctx.room = self.match(ConfRoomSchedulerParser.ID)
+                pass
+            elif token in [15]:
+                self.enterOuterAlt(localctx, 2)
+                self.state = 96
+                self.match(ConfRoomSchedulerParser.T__14)
+                self.state = 97
+                localctx.user = self.match(ConfRoomSchedulerParser.USER)
+                pass
+            elif token in [16]:
+                self.enterOuterAlt(localctx, 3)
+                self.state = 98
+                self.match(ConfRoomSchedulerParser.T__15)
+                self.state = 99
+                localctx.date = self.match(ConfRoomSchedulerParser.DATE)
+                pass
+            elif token in [17]:
+                self.enterOuterAlt(localctx, 4)
+                self.state = 100
+                self.match(ConfRoomSchedulerParser.T__16)
+                self.state = 101
+                localctx.since = self.match(ConfRoomSchedulerParser.DATE)
+                self.state = 102
+                self.match(ConfRoomSchedulerParser.T__7)
+                self.state = 103
+                localctx.until = self.match(ConfRoomSchedulerParser.DATE)
+                pass
+            else:
+                raise NoViableAltException(self)
+
         except RecognitionException as re:
             localctx.exception = re
             self._errHandler.reportError(self, re)
@@ -516,32 +880,32 @@ class ConfRoomSchedulerParser ( Parser ):
     def reprogram(self):
 
         localctx = ConfRoomSchedulerParser.ReprogramContext(self, self._ctx, self.state)
-        self.enterRule(localctx, 10, self.RULE_reprogram)
+        self.enterRule(localctx, 16, self.RULE_reprogram)
         try:
             self.enterOuterAlt(localctx, 1)
-            self.state = 51
-            self.match(ConfRoomSchedulerParser.T__7)
-            self.state = 52
+            self.state = 106
+            self.match(ConfRoomSchedulerParser.T__17)
+            self.state = 107
             self.match(ConfRoomSchedulerParser.ID)
-            self.state = 53
+            self.state = 108
             self.match(ConfRoomSchedulerParser.T__2)
-            self.state = 54
+            self.state = 109
             self.match(ConfRoomSchedulerParser.DATE)
-            self.state = 55
+            self.state = 110
             self.match(ConfRoomSchedulerParser.T__3)
-            self.state = 56
+            self.state = 111
             self.match(ConfRoomSchedulerParser.TIME)
-            self.state = 57
+            self.state = 112
             self.match(ConfRoomSchedulerParser.T__4)
-            self.state = 58
+            self.state = 113
             self.match(ConfRoomSchedulerParser.TIME)
-            self.state = 59
+            self.state = 114
             self.match(ConfRoomSchedulerParser.T__2)
-            self.state = 60
+            self.state = 115
             self.match(ConfRoomSchedulerParser.TIME)
-            self.state = 61
+            self.state = 116
             self.match(ConfRoomSchedulerParser.T__4)
-            self.state = 62
+            self.state = 117
             self.match(ConfRoomSchedulerParser.TIME)
         except RecognitionException as re:
             localctx.exception = re
@@ -552,6 +916,72 @@ class ConfRoomSchedulerParser ( Parser ):
         return localctx
 
 
+    class AvailableContext(ParserRuleContext):
+        __slots__ = 'parser'
+
+        def __init__(self, parser, parent:ParserRuleContext=None, invokingState:int=-1):
+            super().__init__(parent, invokingState)
+            self.parser = parser
+
+        def DATE(self):
+            return self.getToken(ConfRoomSchedulerParser.DATE, 0)
+
+        def TIME(self, i:int=None):
+            if i is None:
+                return self.getTokens(ConfRoomSchedulerParser.TIME)
+            else:
+                return self.getToken(ConfRoomSchedulerParser.TIME, i)
+
+        def ID(self):
+            return self.getToken(ConfRoomSchedulerParser.ID, 0)
+
+        def getRuleIndex(self):
+            return ConfRoomSchedulerParser.RULE_available
+
+        def enterRule(self, listener:ParseTreeListener):
+            if hasattr( listener, "enterAvailable" ):
+                listener.enterAvailable(self)
+
+        def exitRule(self, listener:ParseTreeListener):
+            if hasattr( listener, "exitAvailable" ):
+                listener.exitAvailable(self)
+
+
+
+
+    def available(self):
+
+        localctx = ConfRoomSchedulerParser.AvailableContext(self, self._ctx, self.state)
+        self.enterRule(localctx, 18, self.RULE_available)
+        try:
+            self.enterOuterAlt(localctx, 1)
+            self.state = 119
+            self.match(ConfRoomSchedulerParser.T__18)
+            self.state = 120
+            self.match(ConfRoomSchedulerParser.T__2)
+            self.state = 121
+            self.match(ConfRoomSchedulerParser.DATE)
+            self.state = 122
+            self.match(ConfRoomSchedulerParser.T__3)
+            self.state = 123
+            self.match(ConfRoomSchedulerParser.TIME)
+            self.state = 124
+            self.match(ConfRoomSchedulerParser.T__4)
+            self.state = 125
+            self.match(ConfRoomSchedulerParser.TIME)
+            self.state = 126
+            self.match(ConfRoomSchedulerParser.T__19)
+            self.state = 127
+            self.match(ConfRoomSchedulerParser.ID)
+        except RecognitionException as re:
+            localctx.exception = re
+            self._errHandler.reportError(self, re)
+            self._errHandler.recover(self, re)
+        finally:
+            self.exitRule()
+        return localctx
+
+
 
 
 
@@ -0,0 +1,105 @@
+import argparse
+import io
+import os
+import sys
+from multiprocessing import Pool
+from pathlib import Path
+from antlr4.FileStream import FileStream
+from antlr4.tree.Tree import ParseTreeWalker
+from dfa_cache import load_dfa_cache
+from output_sinks import TextOutput
+from parse_cache import PARSE_CACHE_ENV, open_parse_cache
+from semantic_checker import ConfRoomSchedulerSemanticChecker
+from statement_parser import CollectingErrorListener, TwoStageParser
+from statements import statements_from_tree
+
+EXIT_OK = 0
+EXIT_SYNTAX_ERRORS = 1
+EXIT_UNREADABLE = 2
+
+class BatchWorker:
+    # One lexer, parser and checker per worker process, reused for every file
+    def __init__(self, parse_cache_directory=None):
+        load_dfa_cache()
+        self.parse_cache = open_parse_cache(parse_cache_directory)
+        self.errors = CollectingErrorListener()
+        self.program_parser = TwoStageParser(self.errors)
+        self.semantic_checker = ConfRoomSchedulerSemanticChecker()
+        self.walker = ParseTreeWalker()
+
+    def check_file(self, path):
+        self.errors.messages = []
+        try:
+            input_stream = FileStream(path)
+        except (OSError, UnicodeDecodeError) as e:
+            return path, "", [f"Error: No se pudo leer {path} ({e})"], EXIT_UNREADABLE
+
+        output = io.StringIO()
+        self.semantic_checker.output = TextOutput(output)
+        self.semantic_checker.reset()
+        if self.parse_cache is None:
+            tree = self.program_parser.parse(input_stream)
+            self.walker.walk(self.semantic_checker, tree)
+        else:
+            for statement in self.cached_statements(input_stream):
+                self.semantic_checker.execute(statement)
+        self.semantic_checker.output.flush()
+
+        status = EXIT_SYNTAX_ERRORS if self.errors.messages else EXIT_OK
+        return path, output.getvalue(), self.errors.messages, status
+
+    def cached_statements(self, input_stream):
+        # Statement records from the parse cache, parsing the file on a miss
+        text = input_stream.strdata
+        cached = self.parse_cache.get('records', text)
+        if cached is None:
+            tree = self.program_parser.parse(input_stream)
+            cached = tuple(statements_from_tree(tree)), tuple(self.errors.messages)
+            self.parse_cache.put('records', text, cached)
+        statements, messages = cached
+        self.errors.messages = list(messages)
+        return statements
+
+_worker = None
+
+def init_worker(parse_cache_directory=None):
+    global _worker
+    _worker = BatchWorker(parse_cache_directory)
+
+def check_file(path):
+    return _worker.check_file(path)
+
+def collect_paths(paths, pattern):
+    for path in paths:
+        if os.path.isdir(path):
+            yield from sorted(str(p) for p in Path(path).rglob(pattern) if p.is_file())
+        else:
+            yield path
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Analiza muchos programas de ConfRoomScheduler en paralelo")
+    arg_parser.add_argument('paths', nargs='+', help="archivos o directorios a analizar")
+    arg_parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count(),
+                            help="número de procesos (por defecto, uno por CPU)")
+    arg_parser.add_argument('--pattern', default='*.confroomdsl',
+                            help="patrón de archivos a buscar dentro de los directorios")
+    arg_parser.add_argument('--parse-cache', metavar='DIR',
+                            help="reutilizar el análisis sintáctico de archivos que no cambiaron, guardado en este "
+                                 f"directorio (también con {PARSE_CACHE_ENV})")
+    args = arg_parser.parse_args()
+
+    paths = list(collect_paths(args.paths, args.pattern))
+    exit_status = EXIT_OK
+    with Pool(processes=args.jobs, initializer=init_worker, initargs=(args.parse_cache,)) as pool:
+        # imap keeps results in input order while the workers run ahead
+        for path, output, errors, status in pool.imap(check_file, paths, chunksize=8):
+            sys.stdout.write(f"==> {path} <==\n")
+            sys.stdout.write(output)
+            sys.stdout.flush()
+            for message in errors:
+                print(f"{path}: {message}", file=sys.stderr)
+            exit_status = max(exit_status, status)
+    sys.exit(exit_status)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from workload import WorkloadSettings, write_workload
+
+# Runs the entry points themselves on the given inputs, with --profile, and
+# reports the phases they record (see profiling.py), so what is measured is
+# the path that ships: fast front end, SLL/LL driver, warm DFA tables,
+# memory-mapped input.  Every run is a fresh process; its peak RSS comes from
+# wait4().
+
+DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+# name: command line; --profile and the input path are appended
+TOOLS = {
+    'initial-analyzer': ['initial-analyzer.py'],
+    'semantic-listener': ['semantic-listener.py'],
+    'semantic-listener-stream': ['semantic-listener.py', '--stream'],
+    'semantic-listener-antlr': ['semantic-listener.py', '--frontend', 'antlr'],
+}
+DEFAULT_TOOLS = ('initial-analyzer', 'semantic-listener')
+
+def run_tool(tool, path, profile_path):
+    # Wall time, peak RSS (KiB) and the profile of one run
+    command = [sys.executable, *TOOLS[tool], '--profile', profile_path, os.path.abspath(path)]
+    start = time.perf_counter()
+    with open(os.devnull, 'wb') as devnull:
+        process = subprocess.Popen(command, stdout=devnull, stderr=devnull, cwd=DIRECTORY)
+        _, status, usage = os.wait4(process.pid, 0)
+    process.returncode = os.waitstatus_to_exitcode(status)
+    wall = time.perf_counter() - start
+    if process.returncode != 0:
+        raise subprocess.CalledProcessError(process.returncode, command)
+    with open(profile_path) as f:
+        return wall, usage.ru_maxrss, json.load(f)
+
+def measure(tool, path, repeat):
+    runs = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for _ in range(repeat):
+            runs.append(run_tool(tool, path, os.path.join(workdir, 'profile.json')))
+
+    profiles = [profile for _, _, profile in runs]
+    names = dict.fromkeys(name for profile in profiles for name in profile['phases'])
+    phases = {name: statistics.median(profile['phases'].get(name, {}).get('wall_seconds', 0.0) for profile in profiles)
+              for name in names}
+    total = statistics.median(wall for wall, _, _ in runs)
+    lines = count_lines(path)
+    return {
+        'tool': tool,
+        'input': path,
+        'lines': lines,
+        'tokens': profiles[0]['tokens'],
+        'statements': profiles[0]['statements'],
+        'phases': phases,
+        'total': total,
+        'tokens_per_second': profiles[0]['tokens'] / phases['lex'] if phases.get('lex') else None,
+        'lines_per_second': lines / total if total else None,
+        'peak_rss_kb': max(rss for _, rss, _ in runs),
+    }
+
+def count_lines(path):
+    with open(path, 'rb') as f:
+        return sum(chunk.count(b'\n') for chunk in iter(lambda: f.read(1 << 20), b''))
+
+def print_summary(summary):
+    phases = "  ".join(f"{phase} {seconds:.3f}s" for phase, seconds in summary['phases'].items())
+    print(f"{summary['tool']:<24} {os.path.basename(summary['input']):<24} {summary['lines']:>10} lines  "
+          f"{phases}  total {summary['total']:8.3f}s  peak {summary['peak_rss_kb'] / 1024:8.1f} MiB")
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Mide el tiempo por fase y la memoria de los analizadores")
+    arg_parser.add_argument('inputs', nargs='*', help="programas a medir")
+    arg_parser.add_argument('--generate', metavar='SIZES',
+                            help="generar programas sintéticos con estos números de líneas, p. ej. 1000,100000")
+    arg_parser.add_argument('--seed', type=int, default=0, help="semilla para los programas generados")
+    arg_parser.add_argument('--tool', choices=TOOLS, action='append',
+                            help=f"herramienta a medir (por defecto, {' y '.join(DEFAULT_TOOLS)})")
+    arg_parser.add_argument('--repeat', type=int, default=3, help="ejecuciones por medición (se usa la mediana)")
+    arg_parser.add_argument('--json', metavar='FILE', help="guardar los resultados en un archivo JSON")
+    args = arg_parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        inputs = list(args.inputs)
+        for size in (args.generate.split(',') if args.generate else ()):
+            path = os.path.join(workdir, f"workload-{size}.confroomdsl")
+            with open(path, 'w', encoding='ascii', newline='\n') as f:
+                write_workload(WorkloadSettings(lines=int(size), seed=args.seed), f)
+            inputs.append(path)
+        if not inputs:
+            arg_parser.error("indique programas a medir o use --generate")
+
+        results = []
+        for path in inputs:
+            for tool in args.tool or DEFAULT_TOOLS:
+                summary = measure(tool, path, args.repeat)
+                print_summary(summary)
+                results.append(summary)
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+if __name__ == '__main__':
+    main()
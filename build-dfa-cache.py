@@ -0,0 +1,35 @@
+import argparse
+from antlr4 import *
+from dfa_cache import DEFAULT_PATH, RECOGNIZERS, save_dfa_cache
+from statement_parser import CollectingErrorListener, LineParser, TwoStageParser
+from workload import WorkloadSettings, generate_statements
+
+def main():
+    arg_parser = argparse.ArgumentParser(
+        description="Precalienta las tablas DFA del lexer y el parser con un corpus y las guarda")
+    arg_parser.add_argument('corpus', nargs='*', help="programas de entrenamiento (pueden tener errores)")
+    arg_parser.add_argument('-n', '--lines', type=int, default=2000, help="sentencias sintéticas a añadir al corpus")
+    arg_parser.add_argument('-o', '--output', default=DEFAULT_PATH, help="archivo de salida")
+    args = arg_parser.parse_args()
+
+    # Errors are part of the training: they warm up the recovery paths too
+    errors = CollectingErrorListener()
+    program_parser = TwoStageParser(errors)
+    line_parser = LineParser(errors)
+    programs = [FileStream(path) for path in args.corpus]
+    settings = WorkloadSettings(lines=args.lines, available_rate=0.05, filtered_list_rate=0.01, block_rate=0.01,
+                                weekly_rate=0.01)
+    programs.append(InputStream("\n".join(generate_statements(settings)) + "\n"))
+    for program in programs:
+        program_parser.parse(program)
+        for line_number, line in enumerate(str(program).split('\n'), start=1):
+            line_parser.parse(line, line_number)
+
+    save_dfa_cache(args.output)
+    states = {name: sum(len(dfa.states) for dfa in recognizer.decisionsToDFA)
+              for name, recognizer in RECOGNIZERS.items()}
+    print(f"{args.output}: {states['lexer']} estados DFA del lexer, {states['parser']} del parser, "
+          f"{len(errors.messages)} errores de sintaxis en el corpus")
+
+if __name__ == '__main__':
+    main()
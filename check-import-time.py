@@ -0,0 +1,124 @@
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+# Startup regression check: runs each entry point on a small valid program
+# under `python -X importtime` and fails if it imports a module it should only
+# load on demand, if the entry point or one of the repo's modules imports a
+# package that is not on that entry point's list, or if the time spent in the
+# repo's own modules (their self time, the median of the runs) goes over the
+# entry point's budget.  The total import time, over that of `python -c
+# pass`, varies too much between machines to fail on and is only reported.
+# The entry points run with bytecode writing enabled and once before
+# measuring, so compiling the sources is not counted.
+#
+# Only the packages the repo's own code imports (by top-level package name)
+# are checked, not what the standard library imports in turn, which changes
+# between Python versions.  Modules the standard library imports lazily, when
+# a function is first called, show up at the top level like the entry point's
+# own imports; those are listed in RUNTIME.
+
+VALID_PROGRAM = (
+    "RESERVA juan SALA 1 PARA 12/07/2024 DE 10:00 A 11:00\n"
+    "REPROGRAMAR 1 PARA 12/07/2024 DE 10:00 A 11:00 PARA 11:00 A 12:00\n"
+    "CANCELAR 1 PARA 12/07/2024 DE 11:00 A 12:00\n"
+    "LISTAR\n"
+)
+
+FAST_PATH = ('argparse', 'array', 'bisect', 'collections', 'contextlib', 'datetime', 'fast_frontend', 'functools',
+             'heapq', 'input_sources', 'itertools', 'json', 'mmap', 'notifications', 'output_sinks', 'profiling', 're',
+             'reservation_store', 'semantic_checker', 'statements', 'sys', 'time', 'token_decoding')
+RUNTIME = ('errno', 'locale', 'shutil')  # argparse and text I/O
+ANTLR_PATH = ('antlr4', 'ConfRoomSchedulerLexer', 'ConfRoomSchedulerParser', 'dfa_cache', 'hashlib', 'os', 'pickle',
+              'parse_cache', 'statement_parser')
+
+# name: (command line, packages it may import, modules that must not be
+# imported, budget in ms for the repo's own modules).  The budgets are about
+# twice what the entry points take now.
+CHECKS = {
+    'semantic-listener': (['semantic-listener.py'], FAST_PATH,
+                          ('antlr4', 'ConfRoomSchedulerParser', 'ConfRoomSchedulerLexer',
+                           'multiprocessing', 'sqlite3', 'pickle', 'hashlib', 'tempfile', 'parse_cache'), 8),
+    'semantic-listener-antlr': (['semantic-listener.py', '--frontend', 'antlr'], FAST_PATH + ANTLR_PATH,
+                                ('multiprocessing', 'sqlite3'), 20),
+    'initial-analyzer': (['initial-analyzer.py'], ('argparse', 'contextlib', 'datetime', 'input_sources', 'json', 'mmap',
+                                                   'profiling', 'sys', 'time') + ANTLR_PATH, ('parse_cache',), 12),
+}
+
+def repo_modules():
+    directory = os.path.dirname(os.path.abspath(__file__))
+    return {name[:-3] for name in os.listdir(directory) if name.endswith('.py')}
+
+def import_tree(command, path=None):
+    # Total import time in microseconds, {module: its self time} and
+    # {module: the module that imported it, or None at the top level}
+    env = {name: value for name, value in os.environ.items() if name != 'PYTHONDONTWRITEBYTECODE'}
+    completed = subprocess.run([sys.executable, '-X', 'importtime', *command, *([path] if path else [])],
+                               stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, check=True,
+                               cwd=os.path.dirname(os.path.abspath(__file__)), env=env)
+    total = 0
+    self_times = {}
+    lines = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        self_time, cumulative, name = line[len('import time:'):].split('|')
+        depth = len(name) - len(name.lstrip())
+        lines.append((depth, name.strip()))
+        self_times[name.strip()] = int(self_time)
+        if depth == 1:
+            total += int(cumulative)  # top-level imports include their dependencies
+
+    # A module is listed after everything it imports, one level deeper
+    parents = {}
+    stack = []
+    for depth, name in reversed(lines):
+        while stack and stack[-1][0] >= depth:
+            stack.pop()
+        parents[name] = stack[-1][1] if stack else None
+        stack.append((depth, name))
+    return total, self_times, parents
+
+def direct_imports(parents, baseline, own_modules):
+    # Top-level package names imported by the entry point or the repo's modules
+    return {name.split('.')[0] for name, parent in parents.items()
+            if (parent is None and name not in baseline) or (parent in own_modules)}
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Comprueba qué importan los puntos de entrada y cuánto tardan")
+    arg_parser.add_argument('--repeat', type=int, default=5, help="ejecuciones por punto de entrada (se usa la mediana)")
+    args = arg_parser.parse_args()
+
+    own_modules = repo_modules()
+    baseline_runs = [import_tree(['-c', 'pass']) for _ in range(args.repeat)]
+    baseline_time = statistics.median(total for total, _, _ in baseline_runs) / 1000
+    baseline = set(baseline_runs[0][2])
+
+    failures = 0
+    with tempfile.TemporaryDirectory() as workdir:
+        path = os.path.join(workdir, 'valid.confroomdsl')
+        with open(path, 'w', encoding='ascii', newline='\n') as f:
+            f.write(VALID_PROGRAM)
+
+        for name, (command, allowed, forbidden, budget) in CHECKS.items():
+            import_tree(command, path)  # writes the bytecode of the repo's modules
+            runs = [import_tree(command, path) for _ in range(args.repeat)]
+            median = statistics.median(total for total, _, _ in runs) / 1000 - baseline_time
+            own_time = statistics.median(sum(self_time for module, self_time in self_times.items()
+                                             if module in own_modules) for _, self_times, _ in runs) / 1000
+            parents = runs[0][2]
+            loaded = sorted(set(forbidden) & set(parents))
+            unexpected = sorted(direct_imports(parents, baseline, own_modules) - set(allowed) - set(RUNTIME))
+            ok = not loaded and not unexpected and own_time <= budget
+            failures += not ok
+            print(f"{'OK   ' if ok else 'FALLA'} {name:<24} {median:7.1f} ms más que python -c pass, "
+                  f"{own_time:5.1f} ms en módulos del repositorio (máximo {budget})"
+                  + (f", importa {', '.join(loaded)}" if loaded else "")
+                  + (f", importa además {', '.join(unexpected)}" if unexpected else ""))
+    sys.exit(1 if failures else 0)
+
+if __name__ == '__main__':
+    main()
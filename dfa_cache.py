@@ -0,0 +1,104 @@
+import hashlib
+import os
+import pickle
+import antlr4
+from antlr4.PredictionContext import PredictionContext
+from antlr4.atn.ATNSimulator import ATNSimulator
+from antlr4.atn.ATNState import ATNState
+from antlr4.atn.SemanticContext import SemanticContext
+import ConfRoomSchedulerLexer
+import ConfRoomSchedulerParser
+
+# The generated lexer and parser keep their ATN, DFA tables (decisionsToDFA)
+# and the parser's prediction context cache as class attributes, so every
+# instance in a process shares them and only the first parses pay for building
+# the DFA.  This module saves those tables after parsing a training corpus and
+# loads them back into a fresh process before its first parse.
+#
+# ATN states and the runtime's singletons are stored by reference, so the
+# loaded DFA points into the ATN of the running process.  The file is tied to
+# the serialized ATNs, the version of the ANTLR runtime whose objects it holds
+# and the pickle protocol it is written with; if any of them changed it is
+# ignored.
+
+DFA_CACHE_ENV = 'CONFROOM_DFA_CACHE'
+RUNTIME_DISTRIBUTION = 'antlr4-python3-runtime'
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'ConfRoomScheduler.dfa')
+RECOGNIZERS = {
+    'lexer': ConfRoomSchedulerLexer.ConfRoomSchedulerLexer,
+    'parser': ConfRoomSchedulerParser.ConfRoomSchedulerParser,
+}
+SINGLETONS = {
+    'semantic_none': SemanticContext.NONE,
+    'context_empty': PredictionContext.EMPTY,
+    'dfa_error': ATNSimulator.ERROR,
+}
+
+_loaded = False
+
+def runtime_version():
+    # Read from the runtime's .dist-info directory next to the antlr4 package
+    # when there is one: importlib.metadata finds the same file, but takes
+    # longer to import than the whole cache takes to load
+    directory = os.path.dirname(os.path.dirname(os.path.abspath(antlr4.__file__)))
+    prefix = RUNTIME_DISTRIBUTION.replace('-', '_') + '-'
+    for name in os.listdir(directory):
+        if name.startswith(prefix) and name.endswith('.dist-info'):
+            return name[len(prefix):-len('.dist-info')]
+    from importlib.metadata import version
+    return version(RUNTIME_DISTRIBUTION)
+
+def fingerprint():
+    digest = hashlib.sha256(f"{runtime_version()} {pickle.HIGHEST_PROTOCOL}".encode())
+    for module in (ConfRoomSchedulerLexer, ConfRoomSchedulerParser):
+        digest.update(repr(module.serializedATN()).encode())
+    return digest.hexdigest()
+
+class DFAPickler(pickle.Pickler):
+    def persistent_id(self, obj):
+        if isinstance(obj, ATNState):
+            for name, recognizer in RECOGNIZERS.items():
+                if recognizer.atn.states[obj.stateNumber] is obj:
+                    return ('state', name, obj.stateNumber)
+            raise pickle.PicklingError(f"ATN state {obj.stateNumber} does not belong to this grammar")
+        for name, singleton in SINGLETONS.items():
+            if obj is singleton:
+                return (name,)
+        return None
+
+class DFAUnpickler(pickle.Unpickler):
+    def persistent_load(self, pid):
+        if pid[0] == 'state':
+            return RECOGNIZERS[pid[1]].atn.states[pid[2]]
+        return SINGLETONS[pid[0]]
+
+def save_dfa_cache(path=DEFAULT_PATH):
+    tables = {name: recognizer.decisionsToDFA for name, recognizer in RECOGNIZERS.items()}
+    with open(path, 'wb') as f:
+        pickle.dump(fingerprint(), f)
+        DFAPickler(f, pickle.HIGHEST_PROTOCOL).dump(tables)
+
+def is_cold():
+    return all(dfa.s0 is None and not dfa.states
+               for recognizer in RECOGNIZERS.values() for dfa in recognizer.decisionsToDFA)
+
+def load_dfa_cache(path=None):
+    # Loads the tables once per process, before anything has been parsed.
+    # Returns whether a saved state is in use.
+    global _loaded
+    if _loaded or not is_cold():
+        return _loaded
+    path = path or os.environ.get(DFA_CACHE_ENV) or DEFAULT_PATH
+    try:
+        with open(path, 'rb') as f:
+            if pickle.load(f) != fingerprint():
+                return False
+            tables = DFAUnpickler(f).load()
+    except (OSError, EOFError, ValueError, pickle.UnpicklingError):
+        # ValueError is a pickle protocol this Python does not know
+        return False
+    for name, recognizer in RECOGNIZERS.items():
+        # In place, so simulators that already hold the list see the tables
+        recognizer.decisionsToDFA[:] = tables[name]
+    _loaded = True
+    return True
@@ -0,0 +1,253 @@
+import os
+import re
+from statements import (LIST_FILTER_FIELDS, AvailableStatement, BlockStatement, CancelStatement, ListStatement,
+                        ReprogramStatement, ReserveStatement)
+
+# A hand-written recognizer for the ConfRoomScheduler language, one compiled
+# regex per statement type.  It only accepts lines that ConfRoomSchedulerLexer
+# and ConfRoomSchedulerParser accept without any error and produces the same
+# statement records; anything else is left to ANTLR, which remains the source
+# of all error diagnostics.
+#
+# Tokens only need whitespace between them where the lexer would otherwise
+# merge them (two words in a row); USER must not be one of the keywords, which
+# the lexer always turns into their own tokens.
+#
+# An INICIO ... FIN block is the only statement that spans several lines:
+# INICIO and FIN each take a line of their own, with RESERVA or blank lines
+# in between.
+
+UNRECOGNIZED = object()
+
+def load_keywords():
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'ConfRoomScheduler.tokens')
+    with open(path) as f:
+        return frozenset(line.split("'")[1] for line in f if line.startswith("'"))
+
+KEYWORDS = load_keywords()
+
+_ = r'[ \t]*'
+DATE = r'([0-9]{2}/[0-9]{2}/[0-9]{4})'
+TIME = r'([0-9]{2}:[0-9]{2})'
+ID = r'([0-9]+)'
+USER = r'([a-zA-Z]+)'
+# Between two clauses: required after a word, optional after digits
+SEP = r'(?:(?<=[a-zA-Z])[ \t]+|(?<![a-zA-Z])[ \t]*)'
+KEYWORD = '|'.join(sorted(KEYWORDS, key=len, reverse=True))
+NOT_KEYWORD = rf'(?!(?:{KEYWORD})(?![a-zA-Z]))'
+
+class LazyRegex:
+    # Compiled the first time it is used: the whole-program regex alone takes
+    # longer to compile than the rest of this module takes to import, and
+    # --frontend antlr or the daemon never use it
+    def __init__(self, pattern, flags=0):
+        self.pattern = pattern
+        self.flags = flags
+
+    def __getattr__(self, name):
+        # Only reached until the compiled regex's methods are copied over
+        regex = re.compile(self.pattern, self.flags)
+        for method in ('match', 'fullmatch', 'search', 'finditer'):
+            setattr(self, method, getattr(regex, method))
+        return getattr(regex, name)
+
+def non_capturing(pattern):
+    return re.sub(r'\((?!\?)', '(?:', pattern)
+
+# One LISTAR clause: groups are room, user, date, since and until
+LIST_FILTER = (rf'{SEP}(?:SALA{_}{ID}|USUARIO[ \t]+{NOT_KEYWORD}{USER}|FECHA{_}{DATE}'
+               rf'|DESDE{_}{DATE}{_}HASTA{_}{DATE})')
+
+RESERVE_BODY = (rf'RESERVA[ \t]+{USER}[ \t]+SALA{_}{ID}{_}PARA{_}{DATE}{_}DE{_}{TIME}{_}A{_}{TIME}'
+                rf'(?:{_}CADA[ \t]+SEMANA[ \t]+HASTA{_}{DATE})?')
+CANCEL_BODY = rf'CANCELAR{_}{ID}{_}PARA{_}{DATE}{_}DE{_}{TIME}{_}A{_}{TIME}'
+LIST_BODY = rf'LISTAR((?:{non_capturing(LIST_FILTER)})*)(?:{SEP}LIMITE{_}{ID})?(?:{SEP}SALTAR{_}{ID})?'
+REPROGRAM_BODY = rf'REPROGRAMAR{_}{ID}{_}PARA{_}{DATE}{_}DE{_}{TIME}{_}A{_}{TIME}{_}PARA{_}{TIME}{_}A{_}{TIME}'
+AVAILABLE_BODY = rf'DISPONIBLE[ \t]+PARA{_}{DATE}{_}DE{_}{TIME}{_}A{_}{TIME}{_}DURACION{_}{ID}'
+
+# For the lines of a text that the recognizer accepts, the room each one is
+# about, or no room for LISTAR and DISPONIBLE, without building their records;
+# sharded_check routes lines with it
+ROUTE = LazyRegex(rf'^{_}(?:(?:RESERVA[ \t]+[a-zA-Z]+[ \t]+SALA|CANCELAR|REPROGRAMAR){_}{ID}|LISTAR|DISPONIBLE)',
+                   re.MULTILINE)
+
+RESERVE = LazyRegex(rf'{_}{RESERVE_BODY}{_}')
+CANCEL = LazyRegex(rf'{_}{CANCEL_BODY}{_}')
+LIST = LazyRegex(rf'{_}{LIST_BODY}{_}')
+LIST_FILTERS = LazyRegex(LIST_FILTER)
+REPROGRAM = LazyRegex(rf'{_}{REPROGRAM_BODY}{_}')
+AVAILABLE = LazyRegex(rf'{_}{AVAILABLE_BODY}{_}')
+BLANK = LazyRegex(_)
+BLOCK_START = LazyRegex(rf'{_}INICIO{_}')
+BLOCK_END = LazyRegex(rf'{_}FIN{_}')
+# The lines that can still belong to an open block: RESERVA lines, even
+# malformed ones, and blank lines
+BLOCK_LINE = LazyRegex(rf'{_}(?:RESERVA(?![a-zA-Z]).*)?')
+
+# The same language for a whole chunk of lines at once, without building
+# records: USER is checked against the keywords with a lookahead instead,
+# as LISTAR clauses already do.
+# Capturing groups inside the repetition would make the regex engine save
+# them for every line, so they are turned into non-capturing ones.
+RESERVE_LINE_BODY = RESERVE_BODY.replace(USER, NOT_KEYWORD + USER)
+LINE = (rf'{_}(?:(?:{RESERVE_LINE_BODY}|{CANCEL_BODY}|{LIST_BODY}|{REPROGRAM_BODY}'
+        rf'|{AVAILABLE_BODY}){_})?')
+BLOCK = rf'{_}INICIO{_}\r?\n(?:{_}(?:{RESERVE_LINE_BODY}{_})?\r?\n)*{_}FIN{_}'
+STAT = rf'(?:{BLOCK}|{LINE})'
+PROGRAM = LazyRegex(non_capturing(rf'(?:{STAT}\r?\n)*{STAT}'))
+
+def recognize_line(line):
+    # `line` without its NEWLINE.  Returns a statement record, None for a
+    # blank line or UNRECOGNIZED when ANTLR has to handle it.
+    match = RESERVE.fullmatch(line)
+    if match:
+        if match[1] in KEYWORDS:
+            return UNRECOGNIZED
+        return ReserveStatement(*match.groups())
+    match = CANCEL.fullmatch(line)
+    if match:
+        return CancelStatement(*match.groups())
+    match = LIST.fullmatch(line)
+    if match:
+        # A clause given twice keeps its last value, as in statements.list_statement
+        clauses = {}
+        for clause in LIST_FILTERS.finditer(line, match.start(1), match.end(1)):
+            for field, value in zip(LIST_FILTER_FIELDS, clause.groups()):
+                if value is not None:
+                    clauses[field] = value
+        return ListStatement(limit=match[2], offset=match[3], **clauses)
+    match = REPROGRAM.fullmatch(line)
+    if match:
+        return ReprogramStatement(*match.groups())
+    match = AVAILABLE.fullmatch(line)
+    if match:
+        return AvailableStatement(*match.groups())
+    if BLANK.fullmatch(line):
+        return None
+    return UNRECOGNIZED
+
+def recognize_text(text):
+    # Statement records for a whole program, or None if any line needs ANTLR
+    statements = []
+    for _, statement_text, is_block in statement_spans(text):
+        statement = recognize_block(statement_text) if is_block else recognize_line(statement_text)
+        if statement is UNRECOGNIZED:
+            return None
+        if statement is not None:
+            statements.append(statement)
+    return statements
+
+def recognize_block(text):
+    # A BlockStatement for the text of a whole INICIO ... FIN block without
+    # its last NEWLINE, or UNRECOGNIZED
+    lines = text.split('\n')
+    last = lines.pop()
+    if not lines or not BLOCK_START.fullmatch(without_cr(lines[0])) or not BLOCK_END.fullmatch(last):
+        return UNRECOGNIZED
+    reservations = []
+    for line in lines[1:]:
+        statement = recognize_line(without_cr(line))
+        if isinstance(statement, ReserveStatement):
+            reservations.append(statement)
+        elif statement is not None:
+            return UNRECOGNIZED
+    return BlockStatement(tuple(reservations))
+
+def recognize_statement(text):
+    # Like recognize_line, for the text of one statement without its NEWLINE:
+    # a line or a whole INICIO ... FIN block
+    if '\n' not in text:
+        return recognize_line(text)
+    return recognize_block(text)
+
+def is_recognized_text(text):
+    # Whether recognize_text(text) would return the records
+    return PROGRAM.fullmatch(text) is not None
+
+OPEN_BLOCK_LINE = LazyRegex(rf'^{_}INICIO{_}\r?$', re.MULTILINE)
+CLOSE_BLOCK_LINE = LazyRegex(rf'^{_}FIN{_}\r?$', re.MULTILINE)
+
+def block_aligned_chunks(chunks):
+    # The same text as `chunks` (each made of whole lines), cut so that no
+    # INICIO ... FIN block is split between two of them
+    pending = ''
+    for chunk in chunks:
+        text = pending + chunk
+        opened = None
+        if 'INICIO' in text:
+            for opened in OPEN_BLOCK_LINE.finditer(text):
+                pass
+        if opened is None or CLOSE_BLOCK_LINE.search(text, opened.end()):
+            yield text
+            pending = ''
+        else:
+            if opened.start():
+                yield text[:opened.start()]
+            pending = text[opened.start():]
+    if pending:
+        yield pending
+
+def without_cr(line):
+    # NEWLINE is '\r'? '\n', so only a '\r' right before '\n' belongs to it
+    return line[:-1] if line.endswith('\r') else line
+
+def without_newline(line):
+    if line.endswith('\n'):
+        return without_cr(line[:-1])
+    return line
+
+class BlockAssembler:
+    # Groups lines read one at a time into statement texts: each line on its
+    # own, except that an INICIO line and the RESERVA and blank lines after it
+    # are joined up to FIN.  Any other line ends the block there; the
+    # unfinished block and that line are passed on as two statements.
+    def __init__(self):
+        self.lines = []
+        self.line_number = None
+
+    def feed(self, line, line_number):
+        # The statements `line` (with its NEWLINE) completes, as (number of
+        # the first line, text); `line_number` can be any position
+        bare = without_newline(line)
+        if self.lines:
+            if BLOCK_END.fullmatch(bare):
+                self.lines.append(line)
+                return self.flush()
+            if BLOCK_LINE.fullmatch(bare):
+                self.lines.append(line)
+                return []
+            return self.flush() + self.feed(line, line_number)
+        if BLOCK_START.fullmatch(bare):
+            self.lines.append(line)
+            self.line_number = line_number
+            return []
+        return [(line_number, line)]
+
+    def flush(self):
+        # The open block, if any; also an unfinished one at the end of the input
+        if not self.lines:
+            return []
+        text = ''.join(self.lines)
+        self.lines = []
+        return [(self.line_number, text)]
+
+def statement_spans(text):
+    # (offset in `text`, statement text without its NEWLINE, whether it is a
+    # block) for each statement of a text made of whole lines, split as
+    # BlockAssembler does.  Lines outside blocks skip the assembler.
+    lines = text.split('\n')
+    last = len(lines) - 1
+    assembler = BlockAssembler()
+    offset = 0
+    for i, line in enumerate(lines):
+        if assembler.lines or 'INICIO' in line:
+            yield from block_spans(assembler.feed(line + '\n' if i < last else line, offset))
+        else:
+            yield offset, without_cr(line) if i < last else line, False
+        offset += len(line) + 1
+    yield from block_spans(assembler.flush())
+
+def block_spans(statements):
+    for start, statement_text in statements:
+        statement_text = without_newline(statement_text)
+        yield start, statement_text, '\n' in statement_text
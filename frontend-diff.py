@@ -0,0 +1,137 @@
+import argparse
+import random
+import sys
+from antlr4 import *
+from ConfRoomSchedulerLexer import ConfRoomSchedulerLexer
+from ConfRoomSchedulerParser import ConfRoomSchedulerParser
+from fast_frontend import KEYWORDS, UNRECOGNIZED, is_recognized_text, recognize_statement, recognize_text
+from output_sinks import CollectingOutput
+from semantic_checker import ConfRoomSchedulerSemanticChecker
+from statement_parser import CollectingErrorListener, LineParser
+from statements import AvailableStatement, ListStatement, statement_from_context, statements_from_tree
+from workload import WorkloadSettings, generate_statements
+
+# Differential check of fast_frontend against ConfRoomSchedulerParser: every
+# line the fast path accepts must parse without errors in ANTLR and give the
+# same statement record, and every line ANTLR accepts must be taken by the
+# fast path too.  The whole-program check must agree with both.  Besides the
+# given programs, synthetic statements and random mutations of them are
+# checked.
+#
+# The record ANTLR builds for each line, even one patched up by error recovery
+# (with tokens such as '<missing ID>'), is also executed by a checker, as
+# --stream does, and the reservations left at the end are listed and searched
+# for free slots; none of that may raise.
+
+MUTATION_CHARS = " \t\r:/0123456789ADEPRSLaxz"
+
+def mutate(line, rng):
+    for _ in range(rng.randint(1, 3)):
+        i = rng.randrange(len(line) + 1)
+        edit = rng.randrange(5)
+        if edit == 0:
+            line = line[:i] + line[i + 1:]
+        elif edit == 1:
+            line = line[:i] + rng.choice(MUTATION_CHARS) + line[i:]
+        elif edit == 2:
+            words = line.split(' ')
+            words.insert(rng.randrange(len(words) + 1), rng.choice(words))
+            line = ' '.join(words)
+        elif edit == 3:
+            line = line.replace(' ', rng.choice(('', '\t', '  ')), 1)
+        else:
+            words = line.split(' ')
+            words[rng.randrange(len(words))] = rng.choice(sorted(KEYWORDS))
+            line = ' '.join(words)
+    return line
+
+class FrontendDiff:
+    def __init__(self):
+        self.errors = CollectingErrorListener()
+        self.line_parser = LineParser(self.errors)
+        self.semantic_checker = ConfRoomSchedulerSemanticChecker(CollectingOutput())
+        self.checked = 0
+        self.mismatches = 0
+
+    def check_line(self, line, origin):
+        # `line` may also be a whole INICIO ... FIN block
+        self.checked += 1
+        fast = recognize_statement(line)
+        self.errors.messages.clear()
+        tree = self.line_parser.parse(line)
+        antlr = UNRECOGNIZED if self.errors.messages else statement_from_context(tree)
+        if fast != antlr or is_recognized_text(line) != (fast is not UNRECOGNIZED):
+            self.mismatches += 1
+            print(f"{origin}: {line!r}", file=sys.stderr)
+            print(f"  fast:  {describe(fast)}", file=sys.stderr)
+            print(f"  antlr: {describe(antlr)} {self.errors.messages}", file=sys.stderr)
+        self.execute(statement_from_context(tree), origin)
+
+    def execute(self, statement, origin):
+        if statement is None:
+            return
+        try:
+            self.semantic_checker.execute(statement)
+        except Exception as e:
+            self.mismatches += 1
+            print(f"{origin}: el comprobador falló con {statement!r}: {e!r}", file=sys.stderr)
+        self.semantic_checker.output.take()
+
+    def check_queries(self):
+        # Filtered listings and free slots go over every stored room ID
+        for date in sorted({reservation.date for _, reservation in self.semantic_checker.reservations.items()}):
+            self.execute(ListStatement(date=date, limit='10'), "consulta")
+            self.execute(AvailableStatement(date, '00:00', '23:59', '1'), "consulta")
+
+    def check_program(self, path):
+        with open(path, 'rb') as f:
+            text = f.read().decode('ascii')
+        for line_number, line in enumerate(text.split('\n'), start=1):
+            self.check_line(line[:-1] if line.endswith('\r') else line, f"{path}:{line_number}")
+
+        # The whole program, as semantic-listener.py reads it
+        fast = recognize_text(text)
+        errors = CollectingErrorListener()
+        lexer = ConfRoomSchedulerLexer(InputStream(text))
+        parser = ConfRoomSchedulerParser(CommonTokenStream(lexer))
+        for recognizer in (lexer, parser):
+            recognizer.removeErrorListeners()
+            recognizer.addErrorListener(errors)
+        statements = list(statements_from_tree(parser.prog()))
+        mismatch = is_recognized_text(text) != (fast is not None)
+        if fast is not None and (errors.messages or fast != statements):
+            mismatch = True
+        if mismatch:
+            self.mismatches += 1
+            print(f"{path}: el programa completo no coincide {errors.messages}", file=sys.stderr)
+
+def describe(statement):
+    return 'sin reconocer' if statement is UNRECOGNIZED else repr(statement)
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Compara el reconocedor rápido con ConfRoomSchedulerParser")
+    arg_parser.add_argument('inputs', nargs='*', help="programas a comparar línea por línea")
+    arg_parser.add_argument('-n', '--lines', type=int, default=2000, help="sentencias sintéticas a comparar")
+    arg_parser.add_argument('--mutations', type=int, default=20000, help="mutaciones aleatorias a comparar")
+    arg_parser.add_argument('--seed', type=int, default=0, help="semilla del generador")
+    args = arg_parser.parse_args()
+
+    diff = FrontendDiff()
+    for path in args.inputs:
+        diff.check_program(path)
+
+    settings = WorkloadSettings(lines=args.lines, available_rate=0.05, filtered_list_rate=0.01, block_rate=0.01,
+                                weekly_rate=0.01, seed=args.seed)
+    lines = list(generate_statements(settings))
+    for i, line in enumerate(lines):
+        diff.check_line(line, f"sintética {i}")
+    rng = random.Random(args.seed)
+    for i in range(args.mutations if lines else 0):
+        diff.check_line(mutate(rng.choice(lines), rng), f"mutación {i}")
+    diff.check_queries()
+
+    print(f"{diff.checked} líneas comparadas, {diff.mismatches} diferencias")
+    sys.exit(1 if diff.mismatches else 0)
+
+if __name__ == '__main__':
+    main()
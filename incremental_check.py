@@ -0,0 +1,287 @@
+import hashlib
+import os
+import pickle
+import struct
+import sys
+from array import array
+from collections import namedtuple
+
+# Re-checks a script that is edited a few lines at a time.  The cache file
+# keeps a digest of every statement of the last run, what each statement
+# emitted, and every K statements (plus after the last one) a pickled copy of
+# the checker's reservations and notification queue.
+#
+# A run replays the cached results up to the last checkpoint before the first
+# statement whose text changed, restores the checker from it and executes
+# only from there on.  Results are stored in segments of SEGMENT_SIZE
+# statements, rendered in the output format of the run that produced them, so
+# replaying a segment is a single write; a run in another format executes the
+# whole script.  Results depend on the clock only through notifications: a
+# segment is treated as changed once a start that was still pending after one
+# of its statements has become due.
+#
+# Segments and checkpoints are pickled records, in the order they were made,
+# followed by an index (the digests, where each record is) and a FOOTER that
+# points at it.  A run reads only the records it replays or resumes from, cuts
+# the file after the last record it keeps and appends the rest, so nothing
+# before the resume point is loaded as a whole or written again.  A run that
+# is interrupted leaves a file without a valid footer, which the next run
+# treats as an empty cache.
+#
+# Statements are parsed one at a time, as with --stream.  The records of the
+# statements that needed the ANTLR parser are cached by digest, with their
+# syntax errors counted from the statement's first line, so moving a line
+# does not parse it again.
+
+CACHE_VERSION = 3
+SEGMENT_SIZE = 1024
+DIGEST_SIZE = 16
+CHECKPOINTS = 64  # by default, at most this many per script
+# The cached records and results are only valid for the code that made them
+SOURCES = ('fast_frontend.py', 'statements.py', 'semantic_checker.py', 'reservation_store.py', 'notifications.py',
+           'ConfRoomSchedulerLexer.py', 'ConfRoomSchedulerParser.py')
+FOOTER = struct.Struct('<QQ16s')  # offset, size and digest of the index
+
+# Where a record is in the file.  `due` is, for a segment, the earliest start
+# still pending after one of its statements (or None).
+Record = namedtuple('Record', 'offset size due', defaults=(None,))
+
+def fingerprint():
+    digest = hashlib.sha256(f"{CACHE_VERSION} {sys.version.split()[0]}".encode())
+    directory = os.path.dirname(os.path.abspath(__file__))
+    for name in SOURCES:
+        with open(os.path.join(directory, name), 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+def statement_digest(text):
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=DIGEST_SIZE).digest()
+
+def default_interval(statements):
+    # A power-of-two number of segments, so the checkpoints of a shorter
+    # version of the script are still on the grid after it grows
+    interval = SEGMENT_SIZE
+    while statements > interval * CHECKPOINTS:
+        interval *= 2
+    return interval
+
+class IncrementalCache:
+    # The index of an open cache file
+    def __init__(self, f, output_format):
+        self.file = f
+        self.output_format = output_format
+        self.digests = b''  # concatenated statement digests
+        self.segments = []
+        self.checkpoints = {}  # statements executed -> Record of the pickled checker state
+        self.parsed = {}  # digest -> (record, syntax errors), for statements ANTLR parsed
+        self.end = 0  # where the records end
+
+    @classmethod
+    def open(cls, path, output_format):
+        # An empty cache if the file is missing, unreadable, from other code
+        # or for another output format
+        try:
+            f = open(path, 'r+b')
+        except FileNotFoundError:
+            f = open(path, 'w+b')
+        cache = cls(f, output_format)
+        index = cache.read_index()
+        if index is not None and index[:2] == (fingerprint(), output_format):
+            _, _, cache.digests, cache.segments, cache.checkpoints, cache.parsed, cache.end = index
+        return cache
+
+    def read_index(self):
+        size = self.file.seek(0, os.SEEK_END)
+        if size < FOOTER.size:
+            return None
+        self.file.seek(size - FOOTER.size)
+        offset, length, digest = FOOTER.unpack(self.file.read(FOOTER.size))
+        if offset + length + FOOTER.size != size:
+            return None
+        self.file.seek(offset)
+        data = self.file.read(length)
+        if hashlib.blake2b(data, digest_size=16).digest() != digest:
+            return None
+        try:
+            return pickle.loads(data)
+        except (EOFError, pickle.UnpicklingError, ValueError):
+            return None
+
+    def read(self, record):
+        self.file.seek(record.offset)
+        return pickle.loads(self.file.read(record.size))
+
+    def append(self, value, due=None):
+        data = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        self.file.seek(self.end)
+        self.file.write(data)
+        record = Record(self.end, len(data), due)
+        self.end += len(data)
+        return record
+
+    def truncate(self, segments, checkpoint):
+        # Drops the records of the segments from `segments` on and of the
+        # checkpoints after `checkpoint`, and everything written after them,
+        # along with the index
+        dropped = self.segments[segments:] + [record for index, record in self.checkpoints.items() if index > checkpoint]
+        self.end = min((record.offset for record in dropped), default=self.end)
+        self.segments = [record for record in self.segments if record.offset < self.end]
+        self.checkpoints = {index: record for index, record in self.checkpoints.items() if record.offset < self.end}
+        self.file.truncate(self.end)
+
+    def save(self):
+        data = pickle.dumps((fingerprint(), self.output_format, self.digests, self.segments, self.checkpoints,
+                             self.parsed, self.end), pickle.HIGHEST_PROTOCOL)
+        self.file.seek(self.end)
+        self.file.write(data)
+        self.file.write(FOOTER.pack(self.end, len(data), hashlib.blake2b(data, digest_size=16).digest()))
+        self.file.truncate()
+
+    def close(self):
+        self.file.close()
+
+    def resume_point(self, digests, due):
+        # Index of the first statement whose cached results cannot be used
+        old = self.digests
+        limit = min(len(old), len(digests)) // DIGEST_SIZE
+        common = 0
+        while common < limit:
+            end = min(common + SEGMENT_SIZE, limit)
+            if old[common * DIGEST_SIZE:end * DIGEST_SIZE] != digests[common * DIGEST_SIZE:end * DIGEST_SIZE]:
+                while old[common * DIGEST_SIZE:(common + 1) * DIGEST_SIZE] == \
+                        digests[common * DIGEST_SIZE:(common + 1) * DIGEST_SIZE]:
+                    common += 1
+                break
+            common = end
+        for i, segment in enumerate(self.segments):
+            if i * SEGMENT_SIZE >= common:
+                break
+            if segment.due is not None and segment.due <= due:
+                return i * SEGMENT_SIZE
+        return common
+
+class RecordingOutput:
+    # Writes results in the output's format and keeps their text
+    def __init__(self, output):
+        self.output = output
+        self.lines = []
+
+    def emit(self, code, message, **fields):
+        text = self.output.render(code, message, fields)
+        self.output.write_rendered(text)
+        self.lines.append(text)
+
+    def flush(self):
+        self.output.flush()
+
+def report_errors(first_line, errors):
+    # Same format as ConsoleErrorListener
+    for line, column, message in errors:
+        print(f"line {first_line + line - 1}:{column} {message}", file=sys.stderr)
+
+# A segment record is (rendered text, number of lines per statement, earliest
+# start pending after each statement, (offset, syntax errors) of the
+# statements that had any)
+
+def save_segment(cache, lines, counts, pending, errors):
+    due = min((start for start in pending if start is not None), default=None)
+    cache.segments.append(cache.append(("\n".join(lines), counts, pending, errors), due))
+
+def replay(segment, statements, first, output, count=SEGMENT_SIZE):
+    # Results of the first `count` statements of the segment that starts at
+    # statements[first]
+    text, counts, _, errors = segment
+    for offset, messages in errors:
+        if offset < count:
+            report_errors(statements[first + offset][0], messages)
+    if count < len(counts):
+        text = "\n".join(text.split("\n")[:sum(counts[:count])])
+    if text:
+        output.write_rendered(text)
+
+def check_incremental(statements, cache_path, semantic_checker, recognize, parse, profiler, checkpoint_interval=None):
+    # `statements` are (first line number, text) pairs.  recognize(text)
+    # returns the record of a valid statement or UNRECOGNIZED (None to always
+    # parse); parse(text) returns the record (or None) and the syntax errors as
+    # (line, column, message), counting lines from the statement's first line.
+    output = semantic_checker.output
+    with profiler.phase('load_cache'):
+        cache = IncrementalCache.open(cache_path, type(output).__name__)
+    try:
+        check_cached(statements, cache, semantic_checker, recognize, parse, profiler, checkpoint_interval)
+    finally:
+        cache.close()
+
+def check_cached(statements, cache, semantic_checker, recognize, parse, profiler, checkpoint_interval):
+    from fast_frontend import UNRECOGNIZED
+    with profiler.phase('scan'):
+        statements = list(statements)
+        digests = b''.join(statement_digest(text) for _, text in statements)
+    interval = checkpoint_interval or default_interval(len(statements))
+    resume = cache.resume_point(digests, semantic_checker.clock() + semantic_checker.NOTIFICATION_TIME)
+    start = max((index for index in cache.checkpoints if index <= resume), default=0)
+    first_segment, replayed = divmod(start, SEGMENT_SIZE)
+
+    output = semantic_checker.output
+    lines, counts, pending, errors = [], array('L'), [], []
+    with profiler.phase('replay'):
+        for i in range(first_segment):
+            replay(cache.read(cache.segments[i]), statements, i * SEGMENT_SIZE, output)
+        if replayed:
+            # The checkpoint is inside a segment, the last one of the cache
+            segment = cache.read(cache.segments[first_segment])
+            replay(segment, statements, first_segment * SEGMENT_SIZE, output, replayed)
+            text, counts, pending, errors = segment
+            counts, pending = counts[:replayed], pending[:replayed]
+            lines = text.split("\n")[:sum(counts)]
+            errors = [(offset, messages) for offset, messages in errors if offset < replayed]
+        if start:
+            semantic_checker.reservations, semantic_checker.next_reservations = cache.read(cache.checkpoints[start])
+            semantic_checker.next_reservations.clock = semantic_checker.clock
+    cache.truncate(first_segment, start)
+    cache.digests = digests
+    old_parsed, cache.parsed = cache.parsed, {}
+
+    recording = semantic_checker.output = RecordingOutput(output)
+    recording.lines = lines
+    try:
+        for i in range(start, len(statements)):
+            if i % interval == 0 and i not in cache.checkpoints:
+                save_checkpoint(cache, i, semantic_checker, profiler)
+            line_number, text = statements[i]
+            record = UNRECOGNIZED if recognize is None else recognize(text)
+            if record is UNRECOGNIZED:
+                digest = digests[i * DIGEST_SIZE:(i + 1) * DIGEST_SIZE]
+                parsed = old_parsed.get(digest) or cache.parsed.get(digest) or parse(text)
+                cache.parsed[digest] = parsed
+                record, messages = parsed
+                if messages:
+                    report_errors(line_number, messages)
+                    errors.append((i % SEGMENT_SIZE, messages))
+            emitted = len(recording.lines)
+            if record is not None:
+                semantic_checker.execute(record)
+            counts.append(len(recording.lines) - emitted)
+            upcoming = semantic_checker.next_reservations.peek()
+            pending.append(upcoming and upcoming[0])
+            if len(counts) == SEGMENT_SIZE:
+                save_segment(cache, recording.lines, counts, pending, errors)
+                recording.lines, counts, pending, errors = [], array('L'), [], []
+        if counts:
+            save_segment(cache, recording.lines, counts, pending, errors)
+        if len(statements) not in cache.checkpoints:
+            save_checkpoint(cache, len(statements), semantic_checker, profiler)
+    finally:
+        semantic_checker.output = output
+
+    with profiler.phase('save_cache'):
+        # Parsed records of the replayed statements that are still in the script
+        for i in range(start if old_parsed else 0):
+            digest = digests[i * DIGEST_SIZE:(i + 1) * DIGEST_SIZE]
+            if digest in old_parsed:
+                cache.parsed[digest] = old_parsed[digest]
+        cache.save()
+
+def save_checkpoint(cache, index, semantic_checker, profiler):
+    with profiler.phase('checkpoint'):
+        cache.checkpoints[index] = cache.append((semantic_checker.reservations, semantic_checker.next_reservations))
@@ -1,15 +1,61 @@
+import argparse
+import os
 import sys
-from antlr4 import *
-from ConfRoomSchedulerLexer import ConfRoomSchedulerLexer
-from ConfRoomSchedulerParser import ConfRoomSchedulerParser
+from input_sources import InputSource
+from profiling import PROFILE_ENV, make_profiler
+
+PARSE_CACHE_ENV = 'CONFROOM_PARSE_CACHE'  # as in parse_cache, which is only imported if a cache is used
+
+def parse_tree_text(text, profiler):
+    # (tree.toStringTree() text, syntax error messages)
+    from antlr4.InputStream import InputStream
+    from dfa_cache import load_dfa_cache
+    from statement_parser import CollectingErrorListener, TwoStageParser
+    with profiler.phase('load_dfa'):
+        load_dfa_cache()
+    errors = CollectingErrorListener()
+    program_parser = TwoStageParser(errors)
+    profiler.instrument_lexer(program_parser.lexer)
+    with profiler.phase('parse'):
+        tree = program_parser.parse(InputStream(text))
+    with profiler.phase('render'):
+        return tree.toStringTree(recog=program_parser.parser), tuple(errors.messages)
 
 def main():
-    input_stream = FileStream(sys.argv[1])
-    lexer = ConfRoomSchedulerLexer(input_stream)
-    stream = CommonTokenStream(lexer)
-    parser = ConfRoomSchedulerParser(stream)
-    tree = parser.prog()
-    print(tree.toStringTree(recog=parser))
+    arg_parser = argparse.ArgumentParser(description="Imprime el árbol sintáctico de un programa de ConfRoomScheduler")
+    arg_parser.add_argument('path', help="archivo con el programa, '-' para la entrada estándar; "
+                                         "puede estar comprimido con gzip")
+    arg_parser.add_argument('--parse-cache', metavar='DIR',
+                            help="reutilizar el árbol de programas que no cambiaron, guardado en este directorio "
+                                 f"(también con {PARSE_CACHE_ENV})")
+    arg_parser.add_argument('--profile', metavar='FILE',
+                            help=f"guardar tiempos por fase en un archivo JSON (también con {PROFILE_ENV})")
+    args = arg_parser.parse_args()
+
+    profiler = make_profiler(args.profile)
+    with profiler.phase('read'):
+        source = InputSource(args.path)
+        text = source.read_text()
+        source.close()
+    parse_cache = None
+    if args.parse_cache or os.environ.get(PARSE_CACHE_ENV):
+        from parse_cache import open_parse_cache
+        parse_cache = open_parse_cache(args.parse_cache)
+    result = None
+    if parse_cache:
+        with profiler.phase('parse_cache'):
+            result = parse_cache.get('tree', text)
+    if result is None:
+        result = parse_tree_text(text, profiler)
+        if parse_cache:
+            with profiler.phase('parse_cache'):
+                parse_cache.put('tree', text, result)
+    tree_text, messages = result
+    with profiler.phase('output'):
+        for message in messages:
+            print(message, file=sys.stderr)
+        print(tree_text)
+    profiler.write(input=args.path)
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
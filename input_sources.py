@@ -0,0 +1,96 @@
+import mmap
+import sys
+from contextlib import contextmanager
+
+# Programs are read from a path, from stdin ('-') or from a gzip-compressed
+# file (detected by its magic number), in bounded chunks that always end on a
+# NEWLINE.  Regular files are memory-mapped, so only the chunk being looked at
+# is ever copied into Python objects.
+
+CHUNK_SIZE = 1 << 20
+GZIP_MAGIC = b'\x1f\x8b'
+
+class InputSource:
+    def __init__(self, path, chunk_size=CHUNK_SIZE):
+        self.path = path
+        self.chunk_size = chunk_size
+        self._spool = None
+
+    @contextmanager
+    def _open(self):
+        # Binary file object over the decompressed input, and whether it can
+        # be memory-mapped
+        if self.path == '-' and self._spool is not None:
+            f, owned = self._spool, False
+            f.seek(0)
+        elif self.path == '-':
+            f, owned = sys.stdin.buffer, False
+        else:
+            f, owned = open(self.path, 'rb'), True
+        try:
+            if f.peek(2)[:2] == GZIP_MAGIC:
+                import gzip
+                with gzip.GzipFile(fileobj=f) as decompressed:
+                    yield decompressed, False
+            else:
+                yield f, f is not sys.stdin.buffer
+        finally:
+            if owned:
+                f.close()
+
+    def lines(self):
+        # One pass, line by line; stdin is consumed as it arrives
+        with self._open() as (f, _):
+            for line in f:
+                yield line.decode('ascii')
+
+    def chunks(self):
+        # Decoded text made of whole lines, about chunk_size bytes at a time.
+        # Can be called again; stdin is spooled to a temporary file for that.
+        if self.path == '-' and self._spool is None:
+            import shutil
+            import tempfile
+            self._spool = tempfile.TemporaryFile()
+            shutil.copyfileobj(sys.stdin.buffer, self._spool)
+        with self._open() as (f, mappable):
+            if mappable:
+                yield from self._mapped_chunks(f)
+            else:
+                yield from self._streamed_chunks(f)
+
+    def _mapped_chunks(self, f):
+        size = f.seek(0, 2)
+        if size == 0:
+            return  # empty files cannot be mapped
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            start = 0
+            while start < size:
+                end = data.rfind(b'\n', start, start + self.chunk_size) + 1
+                if end == 0:
+                    # A line longer than a chunk
+                    end = data.find(b'\n', start + self.chunk_size) + 1 or size
+                yield data[start:end].decode('ascii')
+                start = end
+
+    def _streamed_chunks(self, f):
+        pending = b''
+        while True:
+            block = f.read(self.chunk_size)
+            if not block:
+                break
+            block = pending + block
+            end = block.rfind(b'\n') + 1
+            pending = block[end:]
+            if end:
+                yield block[:end].decode('ascii')
+        if pending:
+            yield pending.decode('ascii')
+
+    def read_text(self):
+        # The whole program, for the ANTLR parser
+        return ''.join(self.chunks())
+
+    def close(self):
+        if self._spool is not None:
+            self._spool.close()
+            self._spool = None
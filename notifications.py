@@ -0,0 +1,61 @@
+import heapq
+from datetime import datetime
+
+# Upcoming reservation starts, in a min-heap ordered by start time.  Entries
+# of cancelled or moved reservations are not searched for: their key is
+# forgotten and the entry is dropped once it reaches the top of the heap, so
+# the top is always a live entry and peek() is O(1).  The heap is rebuilt
+# from the live entries when dropped ones make up most of it.
+
+COMPACT_SLACK = 1024
+
+class NotificationQueue:
+    def __init__(self, clock=datetime.now):
+        self.clock = clock
+        self._heap = []  # (start, sequence, key)
+        self._pending = {}  # key -> sequence of its live entry
+        self._sequence = 0
+
+    def __len__(self):
+        return len(self._pending)
+
+    def __contains__(self, key):
+        return key in self._pending
+
+    def push(self, key, start):
+        # Replaces the entry the key had, if any
+        self._sequence += 1
+        self._pending[key] = self._sequence
+        heapq.heappush(self._heap, (start, self._sequence, key))
+        self._drop_stale()
+
+    def discard(self, key):
+        if self._pending.pop(key, None) is None:
+            return
+        if len(self._heap) > 2 * len(self._pending) + COMPACT_SLACK:
+            self._heap = [entry for entry in self._heap if self._pending.get(entry[2]) == entry[1]]
+            heapq.heapify(self._heap)
+        self._drop_stale()
+
+    def peek(self):
+        # (start, key) of the next start, or None
+        if not self._heap:
+            return None
+        start, _, key = self._heap[0]
+        return start, key
+
+    def pop_due(self, deadline):
+        # (start, key) of every entry starting at or before `deadline`, in
+        # start order; each one is returned once
+        due = []
+        while self._heap and self._heap[0][0] <= deadline:
+            start, _, key = heapq.heappop(self._heap)
+            del self._pending[key]
+            due.append((start, key))
+            self._drop_stale()
+        return due
+
+    def _drop_stale(self):
+        heap = self._heap
+        while heap and self._pending.get(heap[0][2]) != heap[0][1]:
+            heapq.heappop(heap)
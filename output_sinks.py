@@ -0,0 +1,81 @@
+import json
+
+# Where the semantic checker sends its results.  Every result has a stable
+# machine-readable code (reserved, cancelled, overlap, exceeds_max, ...), the
+# Spanish message that has always been printed and the fields it refers to.
+
+def as_record(code, message, fields):
+    return {'code': code, **fields, 'message': message}
+
+class TextOutput:
+    # Buffered writer for the plain text messages
+    def __init__(self, stream, line_buffered=False, buffer_size=4096):
+        self.stream = stream
+        self.line_buffered = line_buffered
+        self.buffer_size = buffer_size
+        self._pending = []
+
+    def emit(self, code, message, **fields):
+        self._pending.append(self.render(code, message, fields))
+        if self.line_buffered or len(self._pending) >= self.buffer_size:
+            self.flush()
+
+    def render(self, code, message, fields):
+        return message
+
+    def write_rendered(self, text):
+        # Results rendered earlier by this same format, one per line
+        self._pending.append(text)
+        if self.line_buffered or len(self._pending) >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        if self._pending:
+            self.stream.write("\n".join(self._pending) + "\n")
+            self._pending.clear()
+        self.stream.flush()
+
+class JsonLinesOutput(TextOutput):
+    # One JSON object per result
+    def render(self, code, message, fields):
+        return json.dumps(as_record(code, message, fields), ensure_ascii=False)
+
+class CollectingOutput:
+    # Keeps results in memory, e.g. to send them back from a worker process
+    def __init__(self):
+        self.results = []
+
+    def emit(self, code, message, **fields):
+        self.results.append((code, message, fields))
+
+    def take(self):
+        results = self.results
+        self.results = []
+        return results
+
+    def flush(self):
+        pass
+
+class RenderingOutput:
+    # Renders results as `output_class` would and keeps the text, e.g. to send
+    # it back from a worker process
+    def __init__(self, output_class):
+        self.format = output_class(None)
+        self.lines = []
+
+    def emit(self, code, message, **fields):
+        self.lines.append(self.format.render(code, message, fields))
+
+    def take(self):
+        # The text of the results since the last call, one per line
+        text = "\n".join(self.lines)
+        self.lines = []
+        return text
+
+    def flush(self):
+        pass
+
+OUTPUT_FORMATS = {
+    'text': TextOutput,
+    'jsonl': JsonLinesOutput,
+}
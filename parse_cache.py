@@ -0,0 +1,125 @@
+import hashlib
+import os
+import pickle
+import sys
+from functools import lru_cache
+
+# On-disk cache of parse results, so a program that has not changed since an
+# earlier run is not lexed or parsed again (and the ANTLR runtime is not even
+# imported).  Each entry is one file, named after the digest of the program's
+# text, the kind of result and the grammar version: the serialized ATNs in the
+# .interp files ANTLR writes next to the generated code, plus the sources that
+# turn a parse into that kind of result.
+#
+# Reading an entry touches its modification time.  The total size of the
+# entries is kept in a small USAGE_FILE, updated on every write; only when a
+# write takes it over the limit is the directory scanned, and the least
+# recently used entries are then removed down to LOW_WATER of the limit, so
+# scans are rare even when the cache is full.  Concurrent runs can lose an
+# update of the usage file, which only moves the next scan; every scan
+# writes the real total back.
+
+PARSE_CACHE_ENV = 'CONFROOM_PARSE_CACHE'
+CACHE_VERSION = 1
+MAX_BYTES = 256 << 20
+LOW_WATER = 3 / 4
+SUFFIX = '.parse'
+USAGE_FILE = 'usage'
+GRAMMAR_FILES = ('ConfRoomScheduler.interp', 'ConfRoomSchedulerLexer.interp', 'statement_parser.py')
+# kind: sources it also depends on.  Both kinds are a (result, syntax error
+# messages) pair, the messages in ConsoleErrorListener format.
+KINDS = {
+    'records': ('statements.py',),  # a tuple of statement records
+    'tree': (),  # the text of tree.toStringTree()
+}
+
+@lru_cache(maxsize=None)
+def fingerprint(kind):
+    digest = hashlib.sha256(f"{CACHE_VERSION} {kind} {sys.version.split()[0]}".encode())
+    directory = os.path.dirname(os.path.abspath(__file__))
+    for name in GRAMMAR_FILES + KINDS[kind]:
+        with open(os.path.join(directory, name), 'rb') as f:
+            digest.update(f.read())
+    return digest.digest()
+
+def open_parse_cache(directory=None):
+    # The cache in `directory` or in $CONFROOM_PARSE_CACHE, or None
+    directory = directory or os.environ.get(PARSE_CACHE_ENV)
+    return ParseCache(directory) if directory else None
+
+class ParseCache:
+    def __init__(self, directory, max_bytes=MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    def path(self, kind, text):
+        digest = hashlib.blake2b(text.encode('utf-8'), digest_size=32, key=fingerprint(kind))
+        return os.path.join(self.directory, digest.hexdigest() + SUFFIX)
+
+    def get(self, kind, text):
+        # The cached result, or None
+        path = self.path(kind, text)
+        try:
+            with open(path, 'rb') as f:
+                result = pickle.load(f)
+            os.utime(path)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return None
+        return result
+
+    def put(self, kind, text, result):
+        # Written next to the entries and renamed into place, so concurrent
+        # runs never read half an entry
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.path(kind, text)
+        size = self._write(path, pickle.dumps(result, pickle.HIGHEST_PROTOCOL))
+        usage = self.usage()
+        if usage is None or usage + size > self.max_bytes:
+            usage = self.evict()
+        else:
+            usage += size
+        self._write(os.path.join(self.directory, USAGE_FILE), str(usage).encode())
+
+    def usage(self):
+        # Total size of the entries as last recorded, or None
+        try:
+            with open(os.path.join(self.directory, USAGE_FILE), 'rb') as f:
+                return int(f.read())
+        except (OSError, ValueError):
+            return None
+
+    def _write(self, path, data):
+        # Returns how much the file grew
+        import tempfile
+        with tempfile.NamedTemporaryFile('wb', dir=self.directory, suffix='.tmp', delete=False) as f:
+            f.write(data)
+        try:
+            old_size = os.stat(path).st_size
+        except OSError:
+            old_size = 0
+        os.replace(f.name, path)
+        return len(data) - old_size
+
+    def evict(self):
+        # Scans the entries and, if they are over the limit, removes the least
+        # recently used ones down to LOW_WATER of it.  Returns their total size.
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(SUFFIX):
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue  # removed by another run
+                entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in entries)
+        if total <= self.max_bytes:
+            return total
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes * LOW_WATER:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total -= size
+        return total
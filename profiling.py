@@ -0,0 +1,128 @@
+import os
+import time
+from contextlib import contextmanager, nullcontext
+
+# Opt-in instrumentation, enabled with --profile FILE or the CONFROOM_PROFILE
+# environment variable.  Records wall and CPU time per phase, token and
+# statement throughput, and call counts plus latency histograms for each
+# checker handler, and writes everything to a JSON file.
+
+PROFILE_ENV = 'CONFROOM_PROFILE'
+HANDLERS = ('reserve', 'cancel', 'list_reservations', 'reprogram', 'find_available', 'reserve_block',
+            'incomplete')
+
+class HandlerStats:
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.histogram = {}  # power-of-two microsecond buckets
+
+    def record(self, seconds):
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        bucket = 1 << int(seconds * 1e6).bit_length()
+        self.histogram[bucket] = self.histogram.get(bucket, 0) + 1
+
+    def as_dict(self):
+        return {
+            'count': self.count,
+            'total_seconds': self.total,
+            'mean_us': self.total / self.count * 1e6 if self.count else 0.0,
+            'max_us': self.max * 1e6,
+            'histogram_us': {f"<{bucket}": self.histogram[bucket] for bucket in sorted(self.histogram)},
+        }
+
+class Profiler:
+    def __init__(self, path):
+        self.path = path
+        self.phases = {}
+        self.handlers = {}
+        self.tokens = 0
+        self._open_phases = []
+
+    @contextmanager
+    def phase(self, name):
+        # Phases entered several times (e.g. once per line) are accumulated.
+        # Time spent in a nested phase (lexing on demand while parsing) is
+        # only counted for the inner one.
+        nested = [0.0, 0.0]
+        self._open_phases.append(nested)
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - wall
+            cpu = time.process_time() - cpu
+            self._open_phases.pop()
+            if self._open_phases:
+                self._open_phases[-1][0] += wall
+                self._open_phases[-1][1] += cpu
+            totals = self.phases.setdefault(name, {'wall_seconds': 0.0, 'cpu_seconds': 0.0})
+            totals['wall_seconds'] += wall - nested[0]
+            totals['cpu_seconds'] += cpu - nested[1]
+
+    def instrument_lexer(self, lexer):
+        next_token = lexer.nextToken
+
+        def timed_next_token():
+            self.tokens += 1
+            with self.phase('lex'):
+                return next_token()
+        lexer.nextToken = timed_next_token
+
+    def instrument(self, semantic_checker):
+        # Shadow each handler on the instance with a timed wrapper
+        for name in HANDLERS:
+            setattr(semantic_checker, name, self._timed(name, getattr(semantic_checker, name)))
+
+    def _timed(self, name, handler):
+        stats = self.handlers.setdefault(name, HandlerStats())
+
+        def timed_handler(statement):
+            start = time.perf_counter()
+            try:
+                return handler(statement)
+            finally:
+                stats.record(time.perf_counter() - start)
+        return timed_handler
+
+    def report(self):
+        from datetime import datetime
+        statements = sum(stats.count for stats in self.handlers.values())
+        lex = self.phases.get('lex', {}).get('wall_seconds')
+        total = sum(phase['wall_seconds'] for phase in self.phases.values())
+        return {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'phases': self.phases,
+            'total_wall_seconds': total,
+            'tokens': self.tokens,
+            'tokens_per_second': self.tokens / lex if lex else None,
+            'statements': statements,
+            'statements_per_second': statements / total if total else None,
+            'handlers': {name: stats.as_dict() for name, stats in self.handlers.items()},
+        }
+
+    def write(self, **extra):
+        import json
+        with open(self.path, 'w') as f:
+            json.dump({**extra, **self.report()}, f, indent=2)
+
+class NullProfiler:
+    def phase(self, name):
+        return nullcontext()
+
+    def instrument_lexer(self, lexer):
+        pass
+
+    def instrument(self, semantic_checker):
+        pass
+
+    def write(self, **extra):
+        pass
+
+def make_profiler(path=None):
+    path = path or os.environ.get(PROFILE_ENV)
+    return Profiler(path) if path else NullProfiler()
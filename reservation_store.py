@@ -0,0 +1,510 @@
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from datetime import date, datetime, time, timedelta
+from functools import lru_cache
+from heapq import merge
+from token_decoding import CACHE_SIZE, decode_date
+
+WEEK = timedelta(days=7)
+
+# A reservation key is a single integer: room index, day (proleptic Gregorian
+# ordinal, as date.toordinal()) and start and end minutes.  The low bits, the
+# "slot", are start and end; the bits above them, the "bucket", are room and
+# day, so the keys of a room and day sort by start and then end time.
+MINUTE_BITS = 11
+DAY_BITS = 22
+SLOT_BITS = 2 * MINUTE_BITS
+ROW_BITS = 40
+MINUTE_MASK = (1 << MINUTE_BITS) - 1
+DAY_MASK = (1 << DAY_BITS) - 1
+SLOT_MASK = (1 << SLOT_BITS) - 1
+ROW_MASK = (1 << ROW_BITS) - 1
+COMPACT_SLACK = 1024
+# Keys are stored in signed 64-bit arrays, which leaves 19 bits for the room
+MAX_ROOMS = 1 << (63 - DAY_BITS - SLOT_BITS)
+
+
+class Reservation:
+    # A booking as the checker sees it; start and end are minutes since
+    # midnight.  The store does not keep these objects, it builds one from
+    # its columns whenever a reservation is looked up.
+    #
+    # A weekly reservation (`until` set) is a single rule: it takes place on
+    # `date` and every 7 days after it up to `until`, and its occurrences are
+    # only ever worked out arithmetically.
+    __slots__ = ('room_id', 'user', 'date', 'start', 'end', 'until')
+
+    def __init__(self, room_id, user, date, start, end, until=None):
+        self.room_id = room_id
+        self.user = user
+        self.date = date
+        self.start = start
+        self.end = end
+        self.until = until
+
+    def days(self):
+        # First and last day it takes place on
+        first = decode_date(self.date)
+        if self.until is None:
+            return first, first
+        return first, first + (decode_date(self.until) - first) // WEEK * WEEK
+
+    def occurs_on(self, day):
+        first, last = self.days()
+        return first <= day <= last and (day - first).days % 7 == 0
+
+    def occurs_between(self, since, until):
+        # Whether it takes place on some day of [since, until]; None is open
+        first, last = self.days()
+        if since is not None and since > first:
+            if since > last:
+                return False
+            # The first occurrence on or after `since`, at most `last`, so it
+            # cannot step past date.max
+            first += -((first - since) // WEEK) * WEEK
+        return until is None or first <= until
+
+    def next_start(self, after=None):
+        # Start (datetime) of the first occurrence later than `after`, or of
+        # the very first one; None when no occurrence is left
+        first, last = self.days()
+        at = time(self.start // 60, self.start % 60)
+        day = first
+        if after is not None:
+            # Never steps past `last`, which can be as late as date.max
+            if after.date() > last:
+                return None
+            if after.date() > first:
+                day += -((first - after.date()) // WEEK) * WEEK
+            if datetime.combine(day, at) <= after:
+                if day == last:
+                    return None
+                day += WEEK
+        return datetime.combine(day, at)
+
+    def overlaps(self, other):
+        # Same room, some common day and intersecting times.  Two weekly
+        # series (or a series and a single day) share a day when they fall on
+        # the same weekday and their date ranges intersect.
+        if self.room_id != other.room_id or not (self.start < other.end and self.end > other.start):
+            return False
+        first, last = self.days()
+        other_first, other_last = other.days()
+        return ((first - other_first).days % 7 == 0
+                and max(first, other_first) <= min(last, other_last))
+
+
+class ReservationStore:
+    # Column store.  Rooms and users are interned to small indexes (room IDs
+    # are compared as text, so "01" and "1" stay apart), and each reservation
+    # is a row of two arrays: its key and its user index.  Rows are appended,
+    # so row order is insertion order (used by LISTAR); a removed row is
+    # marked with key -1 and the arrays are compacted once most rows are dead.
+    #
+    # The reservations of each room and day are a sorted array of records,
+    # slot << ROW_BITS | row, so finding a key, its row or its neighbours is a
+    # bisection and no Python object is kept per reservation.  Valid
+    # reservations of a day never overlap each other, so their end times are
+    # sorted as well: an overlap check only needs to look at the last interval
+    # that starts before the new one ends.  Empty or inverted intervals
+    # (end <= start) break that ordering and are kept apart in arrays of their
+    # own that are checked linearly.
+    #
+    # Filtered listings are served by two secondary indexes: the sorted keys
+    # of each user, and the rooms booked on each day together with the sorted
+    # list of those days, so a date range is a slice of that list.
+    #
+    # Weekly reservations are kept out of the per-day indexes, in a dict per
+    # (room, weekday).  Checking a new series against single bookings only
+    # visits the days of that room and weekday that have bookings, taken from
+    # a sorted list per (room, weekday).
+
+    def __init__(self):
+        self._room_ids = []  # room index -> room ID
+        self._room_index = {}
+        self._user_names = []  # user index -> user
+        self._user_index = {}
+        self._keys = array('q')  # row -> key, -1 once removed
+        self._users = array('I')  # row -> user index
+        self._live = 0
+        self._slots = {}  # bucket -> sorted records of valid intervals
+        self._degenerate = {}  # bucket -> sorted records of empty or inverted intervals
+        self._series = {}  # key -> (row, last day) of weekly reservations
+        self._room_counts = {}  # room index -> number of reservations, on any date
+        self._by_user = {}  # user index -> sorted keys
+        self._day_rooms = {}  # day -> sorted indexes of the rooms with single bookings that day
+        self._days = array('l')  # the days in _day_rooms, sorted
+        self._weekly = {}  # (room index, weekday) -> {key: None} of weekly reservations
+        self._weekday_days = {}  # (room index, weekday) -> sorted days with a single booking in the room
+
+    def key(self, room_id, date, start, end):
+        # Key of the room's reservation on the DATE text `date` from start to
+        # end (minutes), or None if the date or a time is not valid or the
+        # room was never booked (so a lookup never adds a room)
+        room = self._room_index.get(room_id)
+        day = decode_date(date)
+        if room is None or day is None or start is None or end is None:
+            return None
+        return ((room << DAY_BITS | day.toordinal()) << SLOT_BITS) | start << MINUTE_BITS | end
+
+    def booking_key(self, room_id, date, start, end):
+        # Like key(), for a reservation that is about to be added: a new room
+        # gets its index here.  Raises OverflowError past MAX_ROOMS rooms;
+        # has_room_for() tells beforehand.
+        if room_id not in self._room_index and decode_date(date) is not None:
+            if not self.has_room_for((room_id,)):
+                raise OverflowError(f"more than {MAX_ROOMS} rooms")
+            self._room_index[room_id] = len(self._room_ids)
+            self._room_ids.append(room_id)
+        return self.key(room_id, date, start, end)
+
+    def has_room_for(self, room_ids):
+        # Whether reservations in all these rooms can be added
+        new_rooms = {room_id for room_id in room_ids if room_id not in self._room_index}
+        return len(self._room_ids) + len(new_rooms) <= MAX_ROOMS
+
+    def _row(self, key):
+        # Row of the key, or -1
+        series = self._series.get(key)
+        if series is not None:
+            return series[0]
+        slot = key & SLOT_MASK
+        records = (self._degenerate if is_degenerate(slot) else self._slots).get(key >> SLOT_BITS)
+        if records:
+            i = bisect_left(records, slot << ROW_BITS)
+            if i < len(records) and records[i] >> ROW_BITS == slot:
+                return records[i] & ROW_MASK
+        return -1
+
+    def _reservation(self, key, row):
+        bucket = key >> SLOT_BITS
+        series = self._series.get(key)
+        return Reservation(self._room_ids[bucket >> DAY_BITS], self._user_names[self._users[row]],
+                           day_text(bucket & DAY_MASK), (key >> MINUTE_BITS) & MINUTE_MASK, key & MINUTE_MASK,
+                           None if series is None else day_text(series[1]))
+
+    def __contains__(self, key):
+        return self._row(key) >= 0
+
+    def __getitem__(self, key):
+        row = self._row(key)
+        if row < 0:
+            raise KeyError(key)
+        return self._reservation(key, row)
+
+    def __len__(self):
+        return self._live
+
+    def items(self):
+        # (key, Reservation) pairs in insertion order
+        for row, key in enumerate(self._keys):
+            if key >= 0:
+                yield key, self._reservation(key, row)
+
+    def rooms(self):
+        # Rooms with at least one reservation, in room ID order
+        return sorted((self._room_ids[room] for room in self._room_counts), key=room_order)
+
+    def add(self, key, reservation):
+        row = self._row(key)
+        if row >= 0:
+            # Replacing a reservation keeps its place in insertion order
+            self._unindex(key, row)
+        else:
+            row = len(self._keys)
+            self._keys.append(key)
+            self._users.append(0)
+            self._live += 1
+        user = self._user_index.get(reservation.user)
+        if user is None:
+            user = self._user_index[reservation.user] = len(self._user_names)
+            self._user_names.append(reservation.user)
+        self._users[row] = user
+        self._index(key, row, reservation.until)
+
+    def remove(self, key):
+        row = self._row(key)
+        if row < 0:
+            raise KeyError(key)
+        self._unindex(key, row)
+        self._keys[row] = -1
+        self._live -= 1
+        self._compact_if_sparse()
+
+    def move(self, key, new_key, start, end):
+        # Same reservation at other times of its day (or days, for a weekly
+        # one), stored under new_key as the newest row.  Room, user and dates
+        # do not change, so only the key, its records and the user's keys are
+        # updated; the room and day indexes are left as they are.  Returns the
+        # new Reservation.
+        row = self._row(key)
+        if row < 0:
+            raise KeyError(key)
+        new_row = len(self._keys)
+        self._keys.append(new_key)
+        self._users.append(self._users[row])
+        self._keys[row] = -1
+        user_keys = self._by_user[self._users[row]]
+        del user_keys[bisect_left(user_keys, key)]
+        insort(user_keys, new_key)
+        series = self._series.pop(key, None)
+        if series is not None:
+            self._series[new_key] = (new_row, series[1])
+            weekly = self._weekly[(key >> (SLOT_BITS + DAY_BITS), weekday((key >> SLOT_BITS) & DAY_MASK))]
+            del weekly[key]
+            weekly[new_key] = None
+        else:
+            self._unindex_record(key, row)
+            self._index_record(new_key, new_row)
+        reservation = self._reservation(new_key, new_row)
+        self._compact_if_sparse()
+        return reservation
+
+    def _index(self, key, row, until):
+        bucket = key >> SLOT_BITS
+        room = bucket >> DAY_BITS
+        day = bucket & DAY_MASK
+        self._room_counts[room] = self._room_counts.get(room, 0) + 1
+        insort(self._by_user.setdefault(self._users[row], array('q')), key)
+        if until is not None:
+            self._series[key] = (row, decode_date(until).toordinal())
+            self._weekly.setdefault((room, weekday(day)), {})[key] = None
+            return
+        if bucket not in self._slots and bucket not in self._degenerate:
+            # The room's first reservation that day
+            day_rooms = self._day_rooms.get(day)
+            if day_rooms is None:
+                day_rooms = self._day_rooms[day] = array('l')
+                insort(self._days, day)
+            insort(day_rooms, room)
+            insort(self._weekday_days.setdefault((room, weekday(day)), array('l')), day)
+        self._index_record(key, row)
+
+    def _unindex(self, key, row):
+        bucket = key >> SLOT_BITS
+        room = bucket >> DAY_BITS
+        day = bucket & DAY_MASK
+        self._room_counts[room] -= 1
+        if not self._room_counts[room]:
+            del self._room_counts[room]
+        user_keys = self._by_user[self._users[row]]
+        del user_keys[bisect_left(user_keys, key)]
+        if not user_keys:
+            del self._by_user[self._users[row]]
+        if self._series.pop(key, None) is not None:
+            weekly = self._weekly[(room, weekday(day))]
+            del weekly[key]
+            if not weekly:
+                del self._weekly[(room, weekday(day))]
+            return
+        self._unindex_record(key, row)
+        if bucket not in self._slots and bucket not in self._degenerate:
+            # It was the room's last reservation that day
+            day_rooms = self._day_rooms[day]
+            del day_rooms[bisect_left(day_rooms, room)]
+            weekday_days = self._weekday_days[(room, weekday(day))]
+            del weekday_days[bisect_left(weekday_days, day)]
+            if not weekday_days:
+                del self._weekday_days[(room, weekday(day))]
+            if not day_rooms:
+                del self._day_rooms[day]
+                del self._days[bisect_left(self._days, day)]
+
+    def _index_record(self, key, row):
+        slot = key & SLOT_MASK
+        table = self._degenerate if is_degenerate(slot) else self._slots
+        insort(table.setdefault(key >> SLOT_BITS, array('q')), slot << ROW_BITS | row)
+
+    def _unindex_record(self, key, row):
+        slot = key & SLOT_MASK
+        table = self._degenerate if is_degenerate(slot) else self._slots
+        records = table[key >> SLOT_BITS]
+        del records[bisect_left(records, slot << ROW_BITS | row)]
+        if not records:
+            del table[key >> SLOT_BITS]
+
+    def _compact_if_sparse(self):
+        # Drops the dead rows once they outnumber the live ones; row numbers
+        # keep their order, so the records stay sorted
+        dead = len(self._keys) - self._live
+        if dead <= self._live + COMPACT_SLACK:
+            return
+        renumbered = array('q', bytes(8 * len(self._keys)))
+        keys = array('q')
+        users = array('I')
+        for row, key in enumerate(self._keys):
+            if key >= 0:
+                renumbered[row] = len(keys)
+                keys.append(key)
+                users.append(self._users[row])
+        for table in (self._slots, self._degenerate):
+            for records in table.values():
+                for i, record in enumerate(records):
+                    records[i] = record & ~ROW_MASK | renumbered[record & ROW_MASK]
+        for key, (row, last) in self._series.items():
+            self._series[key] = (renumbered[row], last)
+        self._keys = keys
+        self._users = users
+
+    def overlaps(self, room_id, date, start, end, until=None, ignore=None):
+        # Whether [start, end) on `date`, or on every week from `date` to
+        # `until`, overlaps a stored reservation of the room other than the
+        # one stored under `ignore`
+        room = self._room_index.get(room_id)
+        if room is None:
+            return False
+        first = decode_date(date)
+        if until is None and not self._weekly:
+            return self._overlaps_on(room << DAY_BITS | first.toordinal(), start, end, ignore)
+
+        booking = Reservation(room_id, None, date, start, end, until)
+        first, last = booking.days()
+        for key in self._weekly.get((room, first.weekday()), ()):
+            if key != ignore and booking.overlaps(self[key]):
+                return True
+        if until is None:
+            return self._overlaps_on(room << DAY_BITS | first.toordinal(), start, end, ignore)
+
+        days = self._weekday_days.get((room, first.weekday()), ())
+        for i in range(bisect_left(days, first.toordinal()), bisect_right(days, last.toordinal())):
+            # Same weekday as `first`, so a day of the series
+            if self._overlaps_on(room << DAY_BITS | days[i], start, end, ignore):
+                return True
+        return False
+
+    def _overlaps_on(self, bucket, start, end, ignore=None):
+        # Against the single bookings of that room and day
+        ignored = -1 if ignore is None or ignore >> SLOT_BITS != bucket else ignore & SLOT_MASK
+        records = self._slots.get(bucket)
+        if records:
+            # Index of the first interval starting at or after `end`; the one
+            # before it ends after every earlier one, so when it is the
+            # ignored reservation the one before that decides
+            i = bisect_left(records, end << (MINUTE_BITS + ROW_BITS))
+            if i > 0 and records[i - 1] >> ROW_BITS == ignored:
+                i -= 1
+            if i > 0 and (records[i - 1] >> ROW_BITS) & MINUTE_MASK > start:
+                return True
+
+        for record in self._degenerate.get(bucket, ()):
+            slot = record >> ROW_BITS
+            if slot != ignored and start < slot & MINUTE_MASK and end > slot >> MINUTE_BITS:
+                return True
+        return False
+
+    def chronological(self, room_id=None, user=None, since=None, until=None):
+        # (key, Reservation) pairs in chronological_key order, restricted to
+        # the given room, user and days (datetime.date, both inclusive).
+        # Lazy, so a paginated listing stops at the last page it shows.
+        # A weekly reservation is listed once, at its first day, if it takes
+        # place on any of the given days.
+        room = None
+        if room_id is not None:
+            room = self._room_index.get(room_id)
+            if room is None:
+                return
+        if user is not None:
+            user_keys = self._by_user.get(self._user_index.get(user), ())
+            matches = [(key, self[key]) for key in user_keys
+                       if room is None or key >> (SLOT_BITS + DAY_BITS) == room]
+            matches.sort(key=lambda item: chronological_key(*item))
+            for key, reservation in matches:
+                if reservation.occurs_between(since, until):
+                    yield key, reservation
+            return
+
+        weekly = [(key, self[key])
+                  for (weekly_room, _), keys in self._weekly.items() if room is None or weekly_room == room
+                  for key in keys]
+        weekly = [item for item in weekly if item[1].occurs_between(since, until)]
+        weekly.sort(key=lambda item: chronological_key(*item))
+        yield from merge(self._single_chronological(room, since, until), weekly,
+                         key=lambda item: chronological_key(*item))
+
+    def _single_chronological(self, room, since, until):
+        first = 0 if since is None else bisect_left(self._days, since.toordinal())
+        last = len(self._days) if until is None else bisect_right(self._days, until.toordinal())
+        for i in range(first, last):
+            day = self._days[i]
+            rooms = self._day_rooms[day]
+            if room is not None:
+                i = bisect_left(rooms, room)
+                if i == len(rooms) or rooms[i] != room:
+                    continue
+                rooms = (room,)
+            matches = []
+            for booked_room in rooms:
+                bucket = booked_room << DAY_BITS | day
+                for table in (self._slots, self._degenerate):
+                    for record in table.get(bucket, ()):
+                        key = bucket << SLOT_BITS | record >> ROW_BITS
+                        matches.append((key, self._reservation(key, record & ROW_MASK)))
+            matches.sort(key=lambda item: chronological_key(*item))
+            yield from matches
+
+    def free_gaps(self, room_id, date, start, end):
+        # Free (start, end) intervals of the room inside [start, end), in
+        # time order.  Only the intervals that reach into the window are
+        # looked at; an empty or inverted interval blocks the minutes between
+        # its two times.
+        room = self._room_index.get(room_id)
+        if room is None:
+            return [(start, end)]
+        day = decode_date(date)
+        bucket = room << DAY_BITS | day.toordinal()
+        records = self._slots.get(bucket, ())
+        first = max(bisect_left(records, start << (MINUTE_BITS + ROW_BITS)) - 1, 0)
+        last = bisect_left(records, end << (MINUTE_BITS + ROW_BITS))
+        busy = [((record >> ROW_BITS) >> MINUTE_BITS, (record >> ROW_BITS) & MINUTE_MASK)
+                for record in records[first:last]]
+        degenerate = [((record >> ROW_BITS) >> MINUTE_BITS, (record >> ROW_BITS) & MINUTE_MASK)
+                      for record in self._degenerate.get(bucket, ())]
+        weekly = [(min(reservation.start, reservation.end), max(reservation.start, reservation.end))
+                  for reservation in map(self.__getitem__, self._weekly.get((room, day.weekday()), ()))
+                  if reservation.occurs_on(day)]
+        if degenerate or weekly:
+            busy = sorted([(min(s, e), max(s, e)) for s, e in degenerate] + busy + weekly)
+
+        gaps = []
+        cursor = start
+        for busy_start, busy_end in busy:
+            if busy_start > cursor:
+                gaps.append((cursor, min(busy_start, end)))
+            cursor = max(cursor, busy_end)
+            if cursor >= end:
+                return gaps
+        gaps.append((cursor, end))
+        return gaps
+
+
+def is_degenerate(slot):
+    # Empty or inverted interval: end at or before start
+    return slot & MINUTE_MASK <= slot >> MINUTE_BITS
+
+
+def weekday(day):
+    # Of a day ordinal; day 1 (1 January of year 1) was a Monday
+    return (day - 1) % 7
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def day_text(day):
+    # DD/MM/YYYY text of a day ordinal
+    return format_date(date.fromordinal(day))
+
+
+def format_date(day):
+    # DD/MM/YYYY text of a datetime.date, as the DATE token writes it
+    return f"{day.day:02d}/{day.month:02d}/{day.year:04d}"
+
+
+def room_order(room_id):
+    # Room IDs are digit strings; "01" and "1" are different rooms.  Error
+    # recovery can store a booking under '<missing ID>', which sorts last.
+    return (0, int(room_id), room_id) if room_id.isdigit() else (1, 0, room_id)
+
+
+def chronological_key(key, reservation):
+    # Order of filtered listings: by day, start and end time, then room
+    return (decode_date(reservation.date), reservation.start, reservation.end,
+            room_order(reservation.room_id), key)
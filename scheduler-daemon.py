@@ -0,0 +1,89 @@
+import argparse
+import asyncio
+import json
+from dfa_cache import load_dfa_cache
+from fast_frontend import BlockAssembler
+from output_sinks import CollectingOutput, as_record
+from semantic_checker import ConfRoomSchedulerSemanticChecker
+from state_store import SqliteStateStore
+from statement_parser import CollectingErrorListener, LineParser
+from statements import statement_from_context
+
+class SchedulerServer:
+    # One warm checker and parser shared by every connection.  Requests are
+    # handled one at a time on the event loop, so they never interleave.
+    def __init__(self, state_path=None):
+        load_dfa_cache()
+        self.errors = CollectingErrorListener()
+        self.line_parser = LineParser(self.errors)
+        self.output = CollectingOutput()
+        self.semantic_checker = ConfRoomSchedulerSemanticChecker(self.output)
+        self.state = None
+        if state_path:
+            self.state = SqliteStateStore(state_path)
+            self.semantic_checker.load_reservations(self.state.load())
+
+    def execute(self, line):
+        self.errors.messages = []
+        tree = self.line_parser.parse(line)
+        statement = statement_from_context(tree)
+
+        # Statements with syntax errors are rejected instead of being run
+        # with whatever the parser recovered
+        if statement is not None and not self.errors.messages:
+            self.semantic_checker.execute(statement)
+            if self.state:
+                self.state.save(self.semantic_checker.reservations)
+        # Starts that became due while the daemon was idle
+        self.semantic_checker.check_for_notifications()
+
+        results = [as_record(code, message, fields) for code, message, fields in self.output.take()]
+        return {'results': results, 'errors': self.errors.messages}
+
+    async def handle_client(self, reader, writer):
+        # The lines of an INICIO ... FIN block get a single response, once FIN
+        # or a line that cannot be part of the block arrives (that line gets
+        # a response of its own); an unfinished block is dropped with the
+        # connection
+        assembler = BlockAssembler()
+        try:
+            while line := await reader.readline():
+                for _, text in assembler.feed(line.decode('utf-8', errors='replace'), None):
+                    response = self.execute(text.rstrip('\r\n'))
+                    writer.write(json.dumps(response, ensure_ascii=False).encode('utf-8') + b'\n')
+                await writer.drain()
+        finally:
+            writer.close()
+
+    def close(self):
+        if self.state:
+            self.state.close()
+
+async def serve(args):
+    server = SchedulerServer(args.state)
+    if args.socket:
+        listener = await asyncio.start_unix_server(server.handle_client, path=args.socket)
+    else:
+        listener = await asyncio.start_server(server.handle_client, host=args.host, port=args.port)
+    try:
+        async with listener:
+            await listener.serve_forever()
+    finally:
+        server.close()
+
+def main():
+    arg_parser = argparse.ArgumentParser(
+        description="Servidor de ConfRoomScheduler: recibe una sentencia por línea y responde una línea JSON")
+    arg_parser.add_argument('--socket', help="ruta del socket Unix donde escuchar")
+    arg_parser.add_argument('--host', default='127.0.0.1', help="dirección TCP (por defecto 127.0.0.1)")
+    arg_parser.add_argument('--port', type=int, default=8765, help="puerto TCP (por defecto 8765)")
+    arg_parser.add_argument('--state', metavar='DB', help="base de datos SQLite donde guardar las reservas")
+    args = arg_parser.parse_args()
+
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == '__main__':
+    main()
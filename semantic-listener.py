@@ -1,172 +1,234 @@
+import argparse
 import sys
-from antlr4 import *
-from ConfRoomSchedulerLexer import ConfRoomSchedulerLexer
-from ConfRoomSchedulerParser import ConfRoomSchedulerParser
-from ConfRoomSchedulerListener import ConfRoomSchedulerListener
-from datetime import datetime, timedelta
-
-class ConfRoomSchedulerSemanticChecker(ConfRoomSchedulerListener):
-    MAX_DURATION = 120
-    NOTIFICATION_TIME = timedelta(hours=1)  # Notificación 1 hora antes de la reserva
-
-    def __init__(self):
-        self.reservations = {}  # Dict to keep track of active reservations
-        self.next_reservations = []  # List to keep track of upcoming reservations
-
-    def enterReserveStat(self, ctx):
-        try:
-            user = ctx.reserve().USER().getText()
-            id = ctx.reserve().ID().getText()
-            date = ctx.reserve().DATE().getText()
-            start_time = ctx.reserve().TIME(0).getText()
-            end_time = ctx.reserve().TIME(1).getText()
-        except AttributeError as e:
-            print(f"Error: Faltan datos en la reserva ({e})")
-            return
-
-        if not self.is_valid_time_format(start_time) or not self.is_valid_time_format(end_time):
-            print("Error: La hora de inicio o fin no tiene un formato válido.")
-            return
-
-        try:
-            start = datetime.strptime(start_time, '%H:%M').time()
-            end = datetime.strptime(end_time, '%H:%M').time()
-            reservation_date = datetime.strptime(date, '%d/%m/%Y')
-            reservation_start = datetime.combine(reservation_date, start)
-            reservation_end = datetime.combine(reservation_date, end)
-        except ValueError:
-            print(f"Error: La hora de inicio '{start_time}' o fin '{end_time}' no es válida.")
-            return
-
-        if not self.is_valid_time_range(start, end):
-            print(f"Error: La hora de inicio {start_time} debe ser anterior a la hora de fin {end_time}")
-            return
+from fast_frontend import (UNRECOGNIZED, BlockAssembler, block_aligned_chunks, is_recognized_text, recognize_statement,
+                           recognize_text, without_newline)
+from input_sources import InputSource
+from output_sinks import OUTPUT_FORMATS
+from profiling import PROFILE_ENV, make_profiler
+from semantic_checker import ConfRoomSchedulerSemanticChecker
+from statements import BlockStatement, statement_from_context, statements_from_tree
+
+# The ANTLR runtime, the generated modules, multiprocessing and sqlite3 are
+# only imported by the code paths that need them, so checking a valid program
+# with the fast front end starts quickly.
+
+def stream_file(source, semantic_checker, profiler, fast=False):
+    # Lex, parse and check one `stat NEWLINE` at a time, so memory does not
+    # grow with the size of the input
+    line_parser = errors = None
+    for line_number, text in statement_texts(source.lines()):
+        if fast:
+            with profiler.phase('scan'):
+                statement = recognize_line(text)
+            if statement is not UNRECOGNIZED:
+                if statement is not None:
+                    with profiler.phase('check'):
+                        semantic_checker.execute(statement)
+                continue
+        if line_parser is None:
+            from statement_parser import CountingErrorListener
+            errors = CountingErrorListener()
+            line_parser = make_line_parser(profiler, errors)
+        errors.count = 0
+        with profiler.phase('parse'):
+            tree = line_parser.parse(text, line_number)
+        with profiler.phase('walk'):
+            statement = runnable(statement_from_context(tree), errors.count)
+        if statement is not None:
+            with profiler.phase('check'):
+                semantic_checker.execute(statement)
+
+def statement_texts(lines):
+    # (first line number, text) per statement; a block is read up to its FIN
+    assembler = BlockAssembler()
+    for line_number, line in enumerate(lines, start=1):
+        yield from assembler.feed(line, line_number)
+    yield from assembler.flush()
+
+def runnable(statement, has_errors):
+    # A block is stored all or none, so one with syntax errors is not run at
+    # all, as the daemon does with any statement; other statements run with
+    # what error recovery made of them, as in the whole-program check
+    if has_errors and isinstance(statement, BlockStatement):
+        return None
+    return statement
+
+def recognize_line(text):
+    return recognize_statement(without_newline(text))
+
+def statement_parser(profiler):
+    # parse(text) -> (record or None, syntax errors as (line, column, message)
+    # counted from the statement's first line)
+    line_parser = error_listener = None
+
+    def parse(text):
+        nonlocal line_parser, error_listener
+        if line_parser is None:
+            from statement_parser import PositionErrorListener
+            error_listener = PositionErrorListener()
+            line_parser = make_line_parser(profiler, error_listener)
+        error_listener.errors = []
+        with profiler.phase('parse'):
+            tree = line_parser.parse(text)
+        with profiler.phase('walk'):
+            return runnable(statement_from_context(tree), error_listener.errors), tuple(error_listener.errors)
+    return parse
+
+def make_line_parser(profiler, error_listener=None):
+    from dfa_cache import load_dfa_cache
+    from statement_parser import LineParser
+    with profiler.phase('load_dfa'):
+        load_dfa_cache()
+    line_parser = LineParser(error_listener)
+    profiler.instrument_lexer(line_parser.lexer)
+    return line_parser
+
+def make_program_parser(profiler, error_listener=None):
+    from dfa_cache import load_dfa_cache
+    from statement_parser import TwoStageParser
+    with profiler.phase('load_dfa'):
+        load_dfa_cache()
+    program_parser = TwoStageParser(error_listener)
+    profiler.instrument_lexer(program_parser.lexer)
+    return program_parser
 
-        if self.is_exceeding_max_duration(start, end):
-            print(f"Error: La reserva excede el tiempo máximo permitido de {self.MAX_DURATION} minutos")
-            return
-
-        if self.is_conflicting_reservation(id, date, reservation_start, reservation_end):
-            print(f"Error: La reserva se solapa con una reserva existente para {id} el {date} de {start_time} a {end_time}")
-        else:
-            reservation_key = f"{id}_{date}_{start_time}_{end_time}"
-            self.reservations[reservation_key] = (id, user, reservation_start, reservation_end)
-            print(f"Reservado: {id} para {date} de {start_time} a {end_time} por {user}")
-            self.check_for_notifications(reservation_start)
-
-    def enterCancelStat(self, ctx):
-        try:
-            id = ctx.cancel().ID().getText()
-            date = ctx.cancel().DATE().getText()
-            start_time = ctx.cancel().TIME(0).getText()
-            end_time = ctx.cancel().TIME(1).getText()
-        except AttributeError as e:
-            print(f"Error: Faltan datos en la cancelación ({e})")
+def main():
+    arg_parser = argparse.ArgumentParser(description="Analizador semántico de ConfRoomScheduler")
+    arg_parser.add_argument('path', help="archivo con el programa a analizar, '-' para la entrada estándar; "
+                                              "puede estar comprimido con gzip")
+    mode = arg_parser.add_mutually_exclusive_group()
+    mode.add_argument('--stream', action='store_true',
+                      help="procesar una sentencia a la vez en lugar de construir el árbol completo")
+    mode.add_argument('-j', '--jobs', type=int,
+                      help="repartir las sentencias por sala entre varios procesos")
+    mode.add_argument('--incremental', metavar='CACHE',
+                      help="volver a comprobar solo desde la primera sentencia que cambió desde la última ejecución "
+                           "con este archivo de caché (las sentencias se analizan una a una, como con --stream)")
+    arg_parser.add_argument('--checkpoint-every', type=int, metavar='K',
+                            help="con --incremental, guardar el estado del comprobador cada K sentencias "
+                                 "(por defecto, unas 64 veces por programa)")
+    arg_parser.add_argument('--frontend', choices=('fast', 'antlr'), default='fast',
+                            help="reconocer las sentencias válidas con expresiones regulares y usar ANTLR solo "
+                                 "si hay errores (fast), o usar siempre ANTLR (antlr)")
+    arg_parser.add_argument('--format', choices=OUTPUT_FORMATS, default='text',
+                            help="formato de salida: mensajes de texto o JSON Lines con códigos")
+    arg_parser.add_argument('--state', metavar='DB',
+                            help="base de datos SQLite con las reservas de ejecuciones anteriores; se actualiza al terminar")
+    arg_parser.add_argument('--parse-cache', metavar='DIR',
+                            help="reutilizar el análisis sintáctico de programas que no cambiaron, guardado en este "
+                                 "directorio (también con CONFROOM_PARSE_CACHE)")
+    arg_parser.add_argument('--profile', metavar='FILE',
+                            help=f"guardar tiempos por fase y por manejador en un archivo JSON (también con {PROFILE_ENV})")
+    args = arg_parser.parse_args()
+    if args.jobs is not None and args.jobs < 1:
+        arg_parser.error("--jobs tiene que ser al menos 1")
+    if args.state and args.jobs:
+        arg_parser.error("--state no se puede combinar con --jobs")
+    if args.state and args.incremental:
+        arg_parser.error("--state no se puede combinar con --incremental")
+
+    output = OUTPUT_FORMATS[args.format](sys.stdout, line_buffered=sys.stdout.isatty())
+    semantic_checker = ConfRoomSchedulerSemanticChecker(output)
+    profiler = make_profiler(args.profile)
+    profiler.instrument(semantic_checker)
+    state = None
+    if args.state:
+        from state_store import SqliteStateStore
+        with profiler.phase('load_state'):
+            state = SqliteStateStore(args.state)
+            semantic_checker.load_reservations(state.load())
+    try:
+        check_file(args, semantic_checker, profiler)
+    finally:
+        with profiler.phase('output'):
+            output.flush()
+
+    if state:
+        with profiler.phase('save_state'):
+            state.save(semantic_checker.reservations)
+            state.close()
+    profiler.write(input=args.path)
+
+def fast_statements(source):
+    for chunk in block_aligned_chunks(source.chunks()):
+        yield from recognize_text(chunk)
+
+def check_file(args, semantic_checker, profiler):
+    if not (args.jobs and args.frontend == 'fast' and args.path == '-'):
+        check_path(args, args.path, semantic_checker, profiler)
+        return
+    # Every worker of -j reads the program by itself
+    import os
+    import shutil
+    import tempfile
+    spool = tempfile.NamedTemporaryFile(suffix='.confroomdsl', delete=False)
+    try:
+        with spool:
+            shutil.copyfileobj(sys.stdin.buffer, spool)
+        check_path(args, spool.name, semantic_checker, profiler)
+    finally:
+        os.remove(spool.name)
+
+def check_path(args, path, semantic_checker, profiler):
+    fast = args.frontend == 'fast'
+    if args.jobs and fast:
+        from sharded_check import check_sharded
+        if check_sharded(path, args.jobs, semantic_checker, profiler):
             return
-
-        reservation_key = f"{id}_{date}_{start_time}_{end_time}"
-
-        if reservation_key in self.reservations:
-            del self.reservations[reservation_key]
-            print(f"Cancelado: {id} para {date} de {start_time} a {end_time}")
+    source = InputSource(path)
+    try:
+        if args.stream:
+            stream_file(source, semantic_checker, profiler, fast)
+        elif args.incremental:
+            from incremental_check import check_incremental
+            check_incremental(statement_texts(source.lines()), args.incremental, semantic_checker,
+                              recognize_line if fast else None, statement_parser(profiler), profiler,
+                              args.checkpoint_every)
+        elif fast and not args.jobs and is_recognized(source, profiler):
+            # Scanned again chunk by chunk instead of keeping every record
+            check_statements(fast_statements(source), semantic_checker, profiler)
         else:
-            print(f"Error: No existe ninguna reserva para {id} el {date} de {start_time} a {end_time}")
-
-    def enterListStat(self, ctx):
-        if not self.reservations:
-            print("No hay reservas existentes")
-        else:
-            print("Reservas existentes:")
-            for key, (id, user, start, end) in self.reservations.items():
-                _, date, start_time, end_time = key.split('_')
-                print(f"{id} para {date} de {start_time} a {end_time} por {user}")
-
-    def enterReprogramStat(self, ctx):
-        try:
-            id = ctx.reprogram().ID().getText()
-            date = ctx.reprogram().DATE().getText()
-            old_start_time = ctx.reprogram().TIME(0).getText()
-            old_end_time = ctx.reprogram().TIME(1).getText()
-            new_start_time = ctx.reprogram().TIME(2).getText()
-            new_end_time = ctx.reprogram().TIME(3).getText()
-        except AttributeError as e:
-            print(f"Error: Faltan datos en la reprogramación ({e})")
-            return
-
-        old_reservation_key = f"{id}_{date}_{old_start_time}_{old_end_time}"
-        new_reservation_key = f"{id}_{date}_{new_start_time}_{new_end_time}"
-
-        if old_reservation_key not in self.reservations:
-            print(f"Error: No existe ninguna reserva para {id} el {date} de {old_start_time} a {old_end_time}")
-            return
-
-        try:
-            new_start = datetime.strptime(new_start_time, '%H:%M').time()
-            new_end = datetime.strptime(new_end_time, '%H:%M').time()
-            reservation_date = datetime.strptime(date, '%d/%m/%Y')
-            reservation_start = datetime.combine(reservation_date, new_start)
-            reservation_end = datetime.combine(reservation_date, new_end)
-        except ValueError:
-            print(f"Error: La nueva hora de inicio '{new_start_time}' o fin '{new_end_time}' no es válida.")
-            return
-
-        if self.is_conflicting_reservation(id, date, reservation_start, reservation_end):
-            print(f"Error: La nueva reserva se solapa con otra reserva existente.")
-            return
-
-        # Eliminar la reserva antigua y agregar la nueva
-        user = self.reservations[old_reservation_key][1]  # Obtener el usuario antes de eliminar
-        del self.reservations[old_reservation_key]
-        self.reservations[new_reservation_key] = (id, user, reservation_start, reservation_end)
-
-        print(f"Reprogramado: {id} de {old_start_time} a {old_end_time} para {new_start_time} a {new_end_time}")
-
-    def enterBlank(self, ctx):
-        # Ignorar líneas en blanco
-        pass
-
-    def check_for_notifications(self, reservation_start):
-        now = datetime.now()
-        if reservation_start <= now + self.NOTIFICATION_TIME:
-            print(f"Notificación: La reserva que empieza a las {reservation_start.strftime('%H:%M')} está próxima.")
-
-    def is_valid_time_range(self, start, end):
-        return start < end
-
-    def is_valid_time_format(self, time_str):
-        try:
-            datetime.strptime(time_str, '%H:%M')
-            return True
-        except ValueError:
-            return False
-
-    def is_exceeding_max_duration(self, start, end):
-        duration = datetime.combine(datetime.min, end) - datetime.combine(datetime.min, start)
-        duration_minutes = duration.total_seconds() / 60
-        return duration_minutes > self.MAX_DURATION
-
-    def is_conflicting_reservation(self, room_id, date, new_start, new_end):
-        for key, value in self.reservations.items():
-            res_id, _, res_start, res_end = value
-            res_date, res_start_time, res_end_time = key.split('_')[1:]
-            res_start = datetime.combine(datetime.strptime(res_date, '%d/%m/%Y'), datetime.strptime(res_start_time, '%H:%M').time())
-            res_end = datetime.combine(datetime.strptime(res_date, '%d/%m/%Y'), datetime.strptime(res_end_time, '%H:%M').time())
-
-            if res_id == room_id and date == res_date:
-                if (new_start < res_end and new_end > res_start):
-                    return True
-        return False
-
-def main():
-    input_stream = FileStream(sys.argv[1])
-    lexer = ConfRoomSchedulerLexer(input_stream)
-    stream = CommonTokenStream(lexer)
-    parser = ConfRoomSchedulerParser(stream)
-    tree = parser.prog()
-
-    semantic_checker = ConfRoomSchedulerSemanticChecker()
-    walker = ParseTreeWalker()
-    walker.walk(semantic_checker, tree)
+            # Some line is not valid; let ANTLR report it exactly as before
+            check_tree(args, source.read_text(), semantic_checker, profiler)
+    finally:
+        source.close()
+
+def is_recognized(source, profiler):
+    with profiler.phase('scan'):
+        return all(is_recognized_text(chunk) for chunk in block_aligned_chunks(source.chunks()))
+
+def check_tree(args, text, semantic_checker, profiler):
+    from parse_cache import open_parse_cache
+    parse_cache = open_parse_cache(args.parse_cache)
+    cached = None
+    if parse_cache is not None:
+        with profiler.phase('parse_cache'):
+            cached = parse_cache.get('records', text)
+    if cached is None:
+        cached = parse_records(text, profiler)
+        if parse_cache is not None:
+            with profiler.phase('parse_cache'):
+                parse_cache.put('records', text, cached)
+    statements, messages = cached
+    for message in messages:
+        print(message, file=sys.stderr)
+    check_statements(statements, semantic_checker, profiler)
+
+def parse_records(text, profiler):
+    # (statement records, syntax error messages) of a whole program
+    from antlr4.InputStream import InputStream
+    from statement_parser import CollectingErrorListener
+    errors = CollectingErrorListener()
+    program_parser = make_program_parser(profiler, errors)
+    with profiler.phase('parse'):
+        tree = program_parser.parse(InputStream(text))
+    with profiler.phase('walk'):
+        return tuple(statements_from_tree(tree)), tuple(errors.messages)
+
+def check_statements(statements, semantic_checker, profiler):
+    with profiler.phase('check'):
+        for statement in statements:
+            semantic_checker.execute(statement)
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
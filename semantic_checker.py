@@ -0,0 +1,428 @@
+import sys
+from itertools import islice
+from datetime import datetime, timedelta
+from notifications import NotificationQueue
+from output_sinks import TextOutput
+from reservation_store import MAX_ROOMS, Reservation, ReservationStore
+from statements import statement_from_context
+from token_decoding import decode_date, decode_time, encode_time
+
+# Implements the ConfRoomSchedulerListener interface that ParseTreeWalker
+# needs without deriving from it, so the checker can be used with the fast
+# front end without loading the ANTLR runtime
+class ConfRoomSchedulerSemanticChecker:
+    MAX_DURATION = 120
+    NOTIFICATION_TIME = timedelta(hours=1)  # Notificación 1 hora antes de la reserva
+    INCOMPLETE_LABELS = {
+        'reserve': 'la reserva',
+        'cancel': 'la cancelación',
+        'reprogram': 'la reprogramación',
+        'available': 'la consulta de disponibilidad',
+        'block': 'el bloque',
+    }
+
+    def __init__(self, output=None, clock=datetime.now):
+        self.output = output if output is not None else TextOutput(sys.stdout)
+        self.clock = clock
+        self.reset()
+
+    def reset(self):
+        self.reservations = ReservationStore()  # Active reservations, indexed by room and date
+        self.next_reservations = NotificationQueue(self.clock)  # Upcoming starts, announced when due
+
+    def load_reservations(self, reservations):
+        # Starts from reservations stored by an earlier run; only their
+        # starts still to come are queued for notification
+        self.reservations = reservations
+        now = self.clock()
+        for key, reservation in reservations.items():
+            upcoming = reservation.next_start(now)
+            if upcoming is not None:
+                self.next_reservations.push(key, upcoming)
+
+    def enterReserveStat(self, ctx):
+        self.execute(statement_from_context(ctx))
+
+    def enterCancelStat(self, ctx):
+        self.execute(statement_from_context(ctx))
+
+    def enterListStat(self, ctx):
+        self.execute(statement_from_context(ctx))
+
+    def enterReprogramStat(self, ctx):
+        self.execute(statement_from_context(ctx))
+
+    def enterAvailableStat(self, ctx):
+        self.execute(statement_from_context(ctx))
+
+    def enterBlockStat(self, ctx):
+        self.execute(statement_from_context(ctx))
+
+    def enterBlank(self, ctx):
+        # Ignorar líneas en blanco
+        pass
+
+    def visitTerminal(self, node):
+        pass
+
+    def visitErrorNode(self, node):
+        pass
+
+    def enterEveryRule(self, ctx):
+        pass
+
+    def exitEveryRule(self, ctx):
+        pass
+
+    def execute(self, statement):
+        getattr(self, statement.handler)(statement)
+
+    def incomplete(self, statement):
+        self.output.emit('incomplete', f"Error: Faltan datos en {self.INCOMPLETE_LABELS[statement.kind]} ({statement.error})",
+                         statement=statement.kind, error=statement.error)
+
+    def reserve(self, statement):
+        request = self.reservation_request(statement)
+        if request is None:
+            return
+        start, end, reservation_date = request
+        user, id, date, start_time, end_time, until = statement
+
+        if self.is_conflicting_reservation(id, date, start, end, until):
+            self.output.emit('overlap', f"Error: La reserva se solapa con una reserva existente para {id} el {date} de {start_time} a {end_time}",
+                             room=id, date=date, start=start_time, end=end_time)
+        else:
+            self.store_reservation(statement, start, end)
+
+    def reservation_request(self, statement):
+        # (start, end, date) for a reservation that passes every check but
+        # the overlap one; errors are reported
+        user, id, date, start_time, end_time, until = statement
+
+        if not self.is_valid_time_format(start_time) or not self.is_valid_time_format(end_time):
+            self.output.emit('invalid_time_format', "Error: La hora de inicio o fin no tiene un formato válido.",
+                             start=start_time, end=end_time)
+            return None
+
+        start = decode_time(start_time)
+        end = decode_time(end_time)
+        reservation_date = decode_date(date)
+        if reservation_date is None:
+            self.output.emit('invalid_date', f"Error: La hora de inicio '{start_time}' o fin '{end_time}' no es válida.",
+                             date=date, start=start_time, end=end_time)
+            return None
+
+        if not self.is_valid_time_range(start, end):
+            self.output.emit('invalid_range', f"Error: La hora de inicio {start_time} debe ser anterior a la hora de fin {end_time}",
+                             start=start_time, end=end_time)
+            return None
+
+        if self.is_exceeding_max_duration(start, end):
+            self.output.emit('exceeds_max', f"Error: La reserva excede el tiempo máximo permitido de {self.MAX_DURATION} minutos",
+                             room=id, date=date, start=start_time, end=end_time, max_minutes=self.MAX_DURATION)
+            return None
+
+        if until is not None:
+            if decode_date(until) is None:
+                self.output.emit('invalid_date', f"Error: La fecha '{until}' no es válida.", date=until)
+                return None
+            if decode_date(until) < reservation_date:
+                self.output.emit('invalid_recurrence', f"Error: La repetición semanal termina el {until}, antes del {date}",
+                                 date=date, until=until)
+                return None
+
+        if not self.has_room_for((id,)):
+            return None
+        return start, end, reservation_date
+
+    def store_reservation(self, statement, start, end):
+        user, id, date, start_time, end_time, until = statement
+        reservation_key = self.reservations.booking_key(id, date, start, end)
+        reservation = Reservation(id, user, date, start, end, until)
+        self.reservations.add(reservation_key, reservation)
+        if until is None:
+            self.output.emit('reserved', f"Reservado: {id} para {date} de {start_time} a {end_time} por {user}",
+                             room=id, date=date, start=start_time, end=end_time, user=user)
+        else:
+            self.output.emit('reserved', f"Reservado: {id} para {date} de {start_time} a {end_time} por {user} cada semana hasta {until}",
+                             room=id, date=date, start=start_time, end=end_time, user=user, until=until)
+        self.next_reservations.push(reservation_key, reservation.next_start())
+        self.check_for_notifications()
+
+    def reserve_block(self, statement):
+        # Every reservation of the block is checked first, and every problem
+        # is reported: the ones that pass their own checks are still checked
+        # for overlaps.  They are only stored if none of them fails.
+        requests = [self.reservation_request(reservation) for reservation in statement.reservations]
+        valid = [i for i, request in enumerate(requests) if request is not None]
+        reservations = [statement.reservations[i] for i in valid]
+        room_ok = self.has_room_for({reservation.room_id for reservation in reservations})
+        conflicts = self.has_block_conflicts(reservations, [requests[i] for i in valid])
+        if len(valid) < len(requests) or not room_ok or conflicts:
+            self.output.emit('block_rejected', f"Error: El bloque no se aplicó; no se guardó ninguna de sus {len(requests)} reservas",
+                             size=len(requests))
+            return
+
+        for reservation, (start, end, _) in zip(statement.reservations, requests):
+            self.store_reservation(reservation, start, end)
+        self.output.emit('block_committed', f"Bloque aplicado: {len(requests)} reservas", size=len(requests))
+
+    def has_block_conflicts(self, reservations, requests):
+        # One sweep over the block sorted by room, date and start time marks
+        # every reservation that overlaps another one of the block: inside a
+        # (room, date) group, a reservation overlaps an earlier-starting one
+        # exactly when it starts before the latest end seen so far.  Weekly
+        # reservations are compared with every other one arithmetically.
+        single = [i for i, reservation in enumerate(reservations) if reservation.until is None]
+        order = sorted(single, key=lambda i: (reservations[i].room_id, reservations[i].date) + requests[i][:2])
+        overlapping = set()
+        group = latest = None
+        for i in order:
+            start, end, _ = requests[i]
+            slot_key = (reservations[i].room_id, reservations[i].date)
+            if slot_key == group and start < requests[latest][1]:
+                overlapping.update((i, latest))
+            if slot_key != group or end > requests[latest][1]:
+                group, latest = slot_key, i
+
+        bookings = [Reservation(reservation.room_id, reservation.user, reservation.date, start, end, reservation.until)
+                    for reservation, (start, end, _) in zip(reservations, requests)]
+        for i, booking in enumerate(bookings):
+            if booking.until is not None:
+                for j, other in enumerate(bookings):
+                    if j != i and booking.overlaps(other):
+                        overlapping.update((i, j))
+
+        conflicts = False
+        for i, (user, id, date, start_time, end_time, until) in enumerate(reservations):
+            start, end, _ = requests[i]
+            if self.is_conflicting_reservation(id, date, start, end, until):
+                self.output.emit('overlap', f"Error: La reserva se solapa con una reserva existente para {id} el {date} de {start_time} a {end_time}",
+                                 room=id, date=date, start=start_time, end=end_time)
+                conflicts = True
+            elif i in overlapping:
+                self.output.emit('block_overlap', f"Error: La reserva de {id} el {date} de {start_time} a {end_time} se solapa con otra reserva del bloque",
+                                 room=id, date=date, start=start_time, end=end_time)
+                conflicts = True
+        return conflicts
+
+    def cancel(self, statement):
+        id, date, start_time, end_time = statement
+        reservation_key = self.reservations.key(id, date, decode_time(start_time), decode_time(end_time))
+
+        if reservation_key is not None and reservation_key in self.reservations:
+            self.reservations.remove(reservation_key)
+            self.next_reservations.discard(reservation_key)
+            self.output.emit('cancelled', f"Cancelado: {id} para {date} de {start_time} a {end_time}",
+                             room=id, date=date, start=start_time, end=end_time)
+        else:
+            self.output.emit('not_found', f"Error: No existe ninguna reserva para {id} el {date} de {start_time} a {end_time}",
+                             room=id, date=date, start=start_time, end=end_time)
+
+    def list_reservations(self, statement):
+        if not statement.is_filtered:
+            # Insertion order
+            self.report_listing(self.reservations.items())
+            return
+
+        query = self.listing_query(statement)
+        if query is not None:
+            room_id, user, since, until, offset, limit = query
+            self.report_listing(self.listing_page(self.reservations.chronological(room_id, user, since, until),
+                                                  offset, limit))
+
+    def listing_query(self, statement):
+        # (room, user, first day, last day, offset, limit) for a valid filtered
+        # listing; errors are reported
+        for date in (statement.date, statement.since, statement.until):
+            if date is not None and decode_date(date) is None:
+                self.output.emit('invalid_date', f"Error: La fecha '{date}' no es válida.", date=date)
+                return None
+
+        # A token conjured by error recovery reads '<missing ID>'
+        for number in (statement.limit, statement.offset):
+            if number is not None and not number.isdigit():
+                self.output.emit('invalid_page', f"Error: El número '{number}' de LIMITE o SALTAR no es válido.",
+                                 value=number)
+                return None
+
+        since = decode_date(statement.since) if statement.since is not None else None
+        until = decode_date(statement.until) if statement.until is not None else None
+        if statement.date is not None:
+            # FECHA and DESDE ... HASTA together keep the days both allow
+            day = decode_date(statement.date)
+            since = day if since is None else max(since, day)
+            until = day if until is None else min(until, day)
+        # No listing can reach sys.maxsize reservations, so bigger numbers
+        # mean the same
+        offset = min(int(statement.offset), sys.maxsize) if statement.offset is not None else 0
+        limit = min(int(statement.limit), sys.maxsize) if statement.limit is not None else None
+        return statement.room, statement.user, since, until, offset, limit
+
+    def listing_page(self, reservations, offset, limit):
+        return islice(reservations, offset, None if limit is None else min(offset + limit, sys.maxsize))
+
+    def report_listing(self, reservations, report_listed=None):
+        # `reservations` yields (key, Reservation) pairs in listing order, or
+        # pairs of whatever `report_listed` takes instead of a Reservation
+        report_listed = report_listed or self.report_listed
+        empty = True
+        for key, reservation in reservations:
+            if empty:
+                self.output.emit('listing', "Reservas existentes:")
+                empty = False
+            report_listed(reservation)
+        if empty:
+            self.output.emit('no_reservations', "No hay reservas existentes")
+
+    def report_listed(self, reservation):
+        date = reservation.date
+        start_time = encode_time(reservation.start)
+        end_time = encode_time(reservation.end)
+        if reservation.until is None:
+            self.output.emit('listed', f"{reservation.room_id} para {date} de {start_time} a {end_time} por {reservation.user}",
+                             room=reservation.room_id, date=date, start=start_time, end=end_time, user=reservation.user)
+        else:
+            self.output.emit('listed', f"{reservation.room_id} para {date} de {start_time} a {end_time} por {reservation.user} cada semana hasta {reservation.until}",
+                             room=reservation.room_id, date=date, start=start_time, end=end_time, user=reservation.user,
+                             until=reservation.until)
+
+    def reprogram(self, statement):
+        id, date, old_start_time, old_end_time, new_start_time, new_end_time = statement
+        old_reservation_key = self.reservations.key(id, date, decode_time(old_start_time), decode_time(old_end_time))
+
+        if old_reservation_key is None or old_reservation_key not in self.reservations:
+            self.output.emit('not_found', f"Error: No existe ninguna reserva para {id} el {date} de {old_start_time} a {old_end_time}",
+                             room=id, date=date, start=old_start_time, end=old_end_time)
+            return
+
+        new_start = decode_time(new_start_time)
+        new_end = decode_time(new_end_time)
+        if new_start is None or new_end is None or decode_date(date) is None:
+            self.output.emit('invalid_time', f"Error: La nueva hora de inicio '{new_start_time}' o fin '{new_end_time}' no es válida.",
+                             date=date, start=new_start_time, end=new_end_time)
+            return
+
+        if not self.is_valid_time_range(new_start, new_end):
+            self.output.emit('invalid_range', f"Error: La hora de inicio {new_start_time} debe ser anterior a la hora de fin {new_end_time}",
+                             start=new_start_time, end=new_end_time)
+            return
+
+        if self.is_exceeding_max_duration(new_start, new_end):
+            self.output.emit('exceeds_max', f"Error: La reserva excede el tiempo máximo permitido de {self.MAX_DURATION} minutos",
+                             room=id, date=date, start=new_start_time, end=new_end_time, max_minutes=self.MAX_DURATION)
+            return
+
+        # The reservation being moved does not count as a conflict; a weekly
+        # reservation is moved as a whole series
+        until = self.reservations[old_reservation_key].until
+        if self.is_conflicting_reservation(id, date, new_start, new_end, until, ignore=old_reservation_key):
+            self.output.emit('overlap', f"Error: La nueva reserva se solapa con otra reserva existente.",
+                             room=id, date=date, start=new_start_time, end=new_end_time)
+            return
+
+        new_reservation_key = self.reservations.key(id, date, new_start, new_end)
+        reservation = self.reservations.move(old_reservation_key, new_reservation_key, new_start, new_end)
+        self.next_reservations.discard(old_reservation_key)
+        self.next_reservations.push(new_reservation_key, reservation.next_start())
+
+        self.output.emit('reprogrammed', f"Reprogramado: {id} de {old_start_time} a {old_end_time} para {new_start_time} a {new_end_time}",
+                         room=id, date=date, old_start=old_start_time, old_end=old_end_time,
+                         start=new_start_time, end=new_end_time)
+        self.check_for_notifications()
+
+    def find_available(self, statement):
+        request = self.availability_request(statement)
+        if request is not None:
+            self.report_availability(statement, self.free_gaps(*request))
+
+    def availability_request(self, statement):
+        # (date, start, end, minutes) for a valid query; errors are reported
+        date, start_time, end_time, duration = statement
+
+        if not self.is_valid_time_format(start_time) or not self.is_valid_time_format(end_time):
+            self.output.emit('invalid_time_format', "Error: La hora de inicio o fin no tiene un formato válido.",
+                             start=start_time, end=end_time)
+            return None
+
+        start = decode_time(start_time)
+        end = decode_time(end_time)
+        if decode_date(date) is None:
+            self.output.emit('invalid_date', f"Error: La fecha '{date}' no es válida.", date=date)
+            return None
+
+        if not self.is_valid_time_range(start, end):
+            self.output.emit('invalid_range', f"Error: La hora de inicio {start_time} debe ser anterior a la hora de fin {end_time}",
+                             start=start_time, end=end_time)
+            return None
+
+        # A token conjured by error recovery reads '<missing ID>'
+        if not duration.isdigit() or int(duration) == 0:
+            self.output.emit('invalid_duration', f"Error: La duración '{duration}' debe ser un número de minutos mayor que cero.",
+                             duration=duration)
+            return None
+
+        minutes = int(duration)
+
+        if minutes > self.MAX_DURATION:
+            self.output.emit('exceeds_max', f"Error: La duración de {minutes} minutos excede el tiempo máximo permitido de {self.MAX_DURATION} minutos",
+                             duration=minutes, max_minutes=self.MAX_DURATION)
+            return None
+        return date, start, end, minutes
+
+    def free_gaps(self, date, start, end, minutes):
+        # (room, gap start, gap end) for every free interval of at least
+        # `minutes` inside the window, from the per-room sorted slot lists
+        return [(room_id, gap_start, gap_end)
+                for room_id in self.reservations.rooms()
+                for gap_start, gap_end in self.reservations.free_gaps(room_id, date, start, end)
+                if gap_end - gap_start >= minutes]
+
+    def report_availability(self, statement, gaps):
+        date, start_time, end_time, duration = statement
+        if not gaps:
+            self.output.emit('no_availability', f"No hay salas disponibles el {date} de {start_time} a {end_time} para {int(duration)} minutos",
+                             date=date, start=start_time, end=end_time, duration=int(duration))
+            return
+
+        self.output.emit('availability', f"Disponibilidad el {date} de {start_time} a {end_time} para {int(duration)} minutos:",
+                         date=date, start=start_time, end=end_time, duration=int(duration))
+        for room_id, gap_start, gap_end in gaps:
+            self.output.emit('available', f"{room_id} libre de {encode_time(gap_start)} a {encode_time(gap_end)}",
+                             room=room_id, date=date, start=encode_time(gap_start), end=encode_time(gap_end))
+
+    def check_for_notifications(self):
+        # Announces every queued start that is due within NOTIFICATION_TIME,
+        # once; a weekly reservation then queues its next start
+        if not self.next_reservations:
+            return
+        now = self.clock()
+        for reservation_start, key in self.next_reservations.pop_due(now + self.NOTIFICATION_TIME):
+            self.output.emit('notification', f"Notificación: La reserva que empieza a las {reservation_start.strftime('%H:%M')} está próxima.",
+                             start=reservation_start.isoformat(timespec='minutes'))
+            reservation = self.reservations[key]
+            if reservation.until is not None:
+                upcoming = reservation.next_start(max(reservation_start, now))
+                if upcoming is not None:
+                    self.next_reservations.push(key, upcoming)
+
+    def is_valid_time_range(self, start, end):
+        return start < end
+
+    def is_valid_time_format(self, time_str):
+        return decode_time(time_str) is not None
+
+    def is_exceeding_max_duration(self, start, end):
+        return end - start > self.MAX_DURATION
+
+    def has_room_for(self, room_ids):
+        # Room indexes are part of the reservation keys, so at most MAX_ROOMS
+        # different rooms can be booked
+        if self.reservations.has_room_for(room_ids):
+            return True
+        self.output.emit('room_limit', f"Error: No se pueden registrar más de {MAX_ROOMS} salas distintas",
+                         max_rooms=MAX_ROOMS)
+        return False
+
+    def is_conflicting_reservation(self, room_id, date, new_start, new_end, until=None, ignore=None):
+        return self.reservations.overlaps(room_id, date, new_start, new_end, until, ignore)
@@ -0,0 +1,224 @@
+import heapq
+import zlib
+from array import array
+from multiprocessing import Event, Pool
+from operator import itemgetter
+from fast_frontend import (ROUTE, UNRECOGNIZED, block_aligned_chunks, is_recognized_text, recognize_block,
+                           recognize_line, statement_spans, without_cr)
+from input_sources import InputSource
+from output_sinks import RenderingOutput
+from reservation_store import ReservationStore, chronological_key, room_order
+from semantic_checker import ConfRoomSchedulerSemanticChecker
+from statements import AvailableStatement, ListStatement
+
+# Every statement only depends on earlier statements for the same room, so the
+# script can be split by room ID and each shard checked in its own process.
+# Every worker reads the whole file, but only tells from the first words of
+# each line which room it is about; it recognizes and checks just the lines
+# of its own rooms, and sends their output back already rendered.  The parent
+# only writes those texts out in file order.
+#
+# LISTAR and DISPONIBLE are the exception: every shard checks them, answers
+# for its own rooms and the parent merges the answers (LISTAR back in
+# insertion order, or in chronological order when it has clauses, and
+# DISPONIBLE in room order).  LIMITE and SALTAR are applied after the merge,
+# so a shard only sends the first SALTAR + LIMITE reservations it would list.
+#
+# An INICIO ... FIN block succeeds or fails as a whole, so all the rooms it
+# books have to be checked together: rooms that share a block are merged into
+# one group (union-find) and the group's shard is picked from a hash of its
+# representative room, the same in every worker.
+#
+# Only programs the fast front end recognizes are checked this way: each
+# worker also scans every jobs-th chunk, and if any line needs ANTLR the
+# parent checks the whole program sequentially instead, so syntax errors are
+# reported exactly as without -j.
+
+BROADCAST = (ListStatement, AvailableStatement)
+
+unrecognized = None  # in the workers, set once a shard finds a line that needs ANTLR
+
+def start_worker(event):
+    global unrecognized
+    unrecognized = event
+
+class SequencedReservationStore(ReservationStore):
+    # Remembers which statement inserted each reservation
+    def __init__(self):
+        super().__init__()
+        self.statement_index = None
+        self.inserted_at = {}
+
+    def add(self, key, reservation):
+        super().add(key, reservation)
+        self.inserted_at.setdefault(key, self.statement_index)
+
+    def remove(self, key):
+        super().remove(key)
+        del self.inserted_at[key]
+
+    def move(self, key, new_key, start, end):
+        # A moved reservation is listed as if it had been inserted again
+        reservation = super().move(key, new_key, start, end)
+        del self.inserted_at[key]
+        self.inserted_at[new_key] = self.statement_index
+        return reservation
+
+def line_at(chunk, start):
+    # The line that begins at `start`, without its NEWLINE
+    end = chunk.find('\n', start)
+    if end < 0:
+        return chunk[start:]
+    return without_cr(chunk[start:end])
+
+def block_rooms(text):
+    return [match[1] for match in ROUTE.finditer(text) if match[1] is not None]
+
+def room_groups(source):
+    # Room ID -> representative room of its group
+    parent = {}
+
+    def find(room_id):
+        parent.setdefault(room_id, room_id)
+        while parent[room_id] != room_id:
+            parent[room_id] = parent[parent[room_id]]
+            room_id = parent[room_id]
+        return room_id
+
+    if not any('INICIO' in chunk for chunk in source.chunks()):
+        return find
+    for chunk in block_aligned_chunks(source.chunks()):
+        if 'INICIO' not in chunk:
+            continue
+        for _, text, is_block in statement_spans(chunk):
+            if is_block:
+                rooms = [find(room_id) for room_id in block_rooms(text)]
+                for room_id in rooms[1:]:
+                    parent[room_id] = rooms[0]
+    return find
+
+def check_shard(task):
+    # (whether this shard's chunks are all recognized, offsets in the file of
+    # the statements with output, their rendered output, partial answers to
+    # LISTAR and DISPONIBLE as (offset, statement, answer))
+    path, shard, jobs, output_class = task
+    output = RenderingOutput(output_class)
+    semantic_checker = ConfRoomSchedulerSemanticChecker(output)
+    store = semantic_checker.reservations = SequencedReservationStore()
+    indexes = array('q')
+    texts = []
+    broadcasts = []
+    owner = {}
+
+    def owns(room_id):
+        # A block without reservations belongs to the shard of group ''
+        if room_id not in owner:
+            group = group_of(room_id) if room_id is not None else ''
+            owner[room_id] = zlib.crc32(group.encode()) % jobs == shard
+        return owner[room_id]
+
+    def check(index, text, is_block=False):
+        store.statement_index = index
+        statement = recognize_block(text) if is_block else recognize_line(text)
+        if statement is UNRECOGNIZED or statement is None:
+            return  # the program is checked sequentially
+        if isinstance(statement, BROADCAST):
+            broadcasts.append((index, statement, partial_answer(semantic_checker, store, statement)))
+            output.take()
+            return
+        semantic_checker.execute(statement)
+        rendered = output.take()
+        if rendered:
+            indexes.append(index)
+            texts.append(rendered)
+
+    source = InputSource(path)
+    try:
+        group_of = room_groups(source)
+        position = 0
+        for chunk_number, chunk in enumerate(block_aligned_chunks(source.chunks())):
+            if chunk_number % jobs == shard and not is_recognized_text(chunk):
+                unrecognized.set()
+            if unrecognized.is_set():
+                return False, indexes, texts, broadcasts  # the parent checks sequentially anyway
+            if 'INICIO' in chunk:
+                for offset, text, is_block in statement_spans(chunk):
+                    if is_block:
+                        rooms = block_rooms(text)
+                        if owns(rooms[0] if rooms else None):
+                            check(position + offset, text, True)
+                    elif (match := ROUTE.match(text)) and (match[1] is None or owns(match[1])):
+                        check(position + offset, text)
+            else:
+                for match in ROUTE.finditer(chunk):
+                    if match[1] is None or owns(match[1]):
+                        check(position + match.start(), line_at(chunk, match.start()))
+            position += len(chunk)
+    finally:
+        source.close()
+    return True, indexes, texts, broadcasts
+
+def partial_answer(semantic_checker, store, statement):
+    # Errors in the query itself are reported once, by the parent.  Listed
+    # reservations are sent rendered, each with what the parent sorts it by.
+    if isinstance(statement, AvailableStatement):
+        request = semantic_checker.availability_request(statement)
+        return semantic_checker.free_gaps(*request) if request else []
+    if not statement.is_filtered:
+        entries = ((store.inserted_at[key], key, reservation) for key, reservation in store.items())
+    else:
+        query = semantic_checker.listing_query(statement)
+        if query is None:
+            return []
+        room_id, user, since, until, offset, limit = query
+        page = semantic_checker.listing_page(store.chronological(room_id, user, since, until), 0,
+                                             None if limit is None else offset + limit)
+        entries = ((chronological_key(key, reservation), key, reservation) for key, reservation in page)
+    return [(order, key, render_listed(semantic_checker, reservation)) for order, key, reservation in entries]
+
+def render_listed(semantic_checker, reservation):
+    semantic_checker.report_listed(reservation)
+    return semantic_checker.output.take()
+
+def check_sharded(path, jobs, semantic_checker, profiler):
+    # Results are reported through `semantic_checker`, as if it had run the
+    # whole script by itself.  Returns False, having reported nothing, if some
+    # line needs ANTLR.
+    output = semantic_checker.output
+    tasks = [(path, shard, jobs, type(output)) for shard in range(jobs)]
+    with profiler.phase('check'):
+        with Pool(processes=jobs, initializer=start_worker, initargs=(Event(),)) as pool:
+            shard_results = pool.map(check_shard, tasks)
+    if not all(recognized for recognized, *_ in shard_results):
+        return False
+
+    with profiler.phase('merge'):
+        answers = {}
+        for _, _, _, broadcasts in shard_results:
+            for index, statement, answer in broadcasts:
+                answers.setdefault(index, (statement, []))[1].extend(answer)
+        # Every statement with output was checked by a single shard
+        pieces = heapq.merge(*(zip(indexes, texts) for _, indexes, texts, _ in shard_results),
+                             ((index, None) for index in sorted(answers)), key=itemgetter(0))
+        for index, text in pieces:
+            if text is None:
+                report_merged(semantic_checker, *answers[index])
+            else:
+                output.write_rendered(text)
+    return True
+
+def report_merged(semantic_checker, statement, answers):
+    write_rendered = semantic_checker.output.write_rendered
+    if isinstance(statement, ListStatement) and not statement.is_filtered:
+        entries = sorted(answers, key=itemgetter(0))
+        semantic_checker.report_listing(((key, text) for _, key, text in entries), write_rendered)
+    elif isinstance(statement, ListStatement):
+        query = semantic_checker.listing_query(statement)
+        if query is not None:
+            entries = sorted(answers, key=itemgetter(0))
+            semantic_checker.report_listing(semantic_checker.listing_page(
+                ((key, text) for _, key, text in entries), *query[4:]), write_rendered)
+    elif isinstance(statement, AvailableStatement):
+        if semantic_checker.availability_request(statement) is not None:
+            gaps = sorted(answers, key=lambda gap: (room_order(gap[0]), gap[1]))
+            semantic_checker.report_availability(statement, gaps)
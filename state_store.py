@@ -0,0 +1,103 @@
+import sqlite3
+from reservation_store import Reservation, ReservationStore
+from token_decoding import encode_time
+
+# Keeps the checker's reservations between runs in a SQLite database (WAL
+# mode), so a run only has to apply the new statements instead of replaying the
+# whole history.  Only the reservations that changed are written back.
+# Rows are keyed by the reservation's text (room_date_start_end), which does
+# not depend on the interning done by the in-memory store.
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS reservations (
+    key TEXT PRIMARY KEY,
+    seq INTEGER NOT NULL,
+    room_id TEXT NOT NULL,
+    user TEXT NOT NULL,
+    date TEXT NOT NULL,
+    start_minute INTEGER NOT NULL,
+    end_minute INTEGER NOT NULL,
+    until_date TEXT
+);
+CREATE INDEX IF NOT EXISTS reservations_seq ON reservations (seq);
+"""
+
+class PersistentReservationStore(ReservationStore):
+    # Tracks insertion order (for LISTAR) and the keys changed since loading
+    def __init__(self):
+        super().__init__()
+        self.sequence = {}
+        self.next_sequence = 0
+        self.changed = set()
+        self.removed = set()
+
+    def restore(self, reservation, sequence):
+        key = self.booking_key(reservation.room_id, reservation.date, reservation.start, reservation.end)
+        super().add(key, reservation)
+        self.sequence[key] = sequence
+        self.next_sequence = max(self.next_sequence, sequence + 1)
+
+    def add(self, key, reservation):
+        if key not in self.sequence:
+            self.sequence[key] = self.next_sequence
+            self.next_sequence += 1
+        super().add(key, reservation)
+        self.changed.add(key)
+        self.removed.discard(text_key(reservation))
+
+    def remove(self, key):
+        self.removed.add(text_key(self[key]))
+        super().remove(key)
+        del self.sequence[key]
+        self.changed.discard(key)
+
+    def move(self, key, new_key, start, end):
+        # Moves to the end of the insertion order, as removing and adding did
+        self.removed.add(text_key(self[key]))
+        reservation = super().move(key, new_key, start, end)
+        del self.sequence[key]
+        self.changed.discard(key)
+        self.sequence[new_key] = self.next_sequence
+        self.next_sequence += 1
+        self.changed.add(new_key)
+        self.removed.discard(text_key(reservation))
+        return reservation
+
+def text_key(reservation):
+    return f"{reservation.room_id}_{reservation.date}_{encode_time(reservation.start)}_{encode_time(reservation.end)}"
+
+class SqliteStateStore:
+    def __init__(self, path):
+        self.connection = sqlite3.connect(path)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.executescript(SCHEMA)
+        # Databases written before weekly reservations existed
+        columns = {row[1] for row in self.connection.execute('PRAGMA table_info(reservations)')}
+        if 'until_date' not in columns:
+            self.connection.execute('ALTER TABLE reservations ADD COLUMN until_date TEXT')
+
+    def load(self):
+        store = PersistentReservationStore()
+        rows = self.connection.execute(
+            'SELECT key, seq, room_id, user, date, start_minute, end_minute, until_date FROM reservations ORDER BY seq')
+        for _, sequence, room_id, user, date, start, end, until in rows:
+            store.restore(Reservation(room_id, user, date, start, end, until), sequence)
+        return store
+
+    def save(self, store):
+        with self.connection:
+            self.connection.executemany('DELETE FROM reservations WHERE key = ?',
+                                        ((key,) for key in store.removed))
+            self.connection.executemany('INSERT OR REPLACE INTO reservations VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                                        self.changed_rows(store))
+        store.changed.clear()
+        store.removed.clear()
+
+    def changed_rows(self, store):
+        for key in store.changed:
+            reservation = store[key]
+            yield (text_key(reservation), store.sequence[key], reservation.room_id, reservation.user, reservation.date,
+                   reservation.start, reservation.end, reservation.until)
+
+    def close(self):
+        self.connection.close()
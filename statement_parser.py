@@ -0,0 +1,105 @@
+from antlr4.CommonTokenStream import CommonTokenStream
+from antlr4.InputStream import InputStream
+from antlr4.Token import Token
+from antlr4.atn.PredictionMode import PredictionMode
+from antlr4.error.ErrorListener import ConsoleErrorListener, ErrorListener
+from antlr4.error.ErrorStrategy import BailErrorStrategy, DefaultErrorStrategy
+from antlr4.error.Errors import ParseCancellationException
+from ConfRoomSchedulerLexer import ConfRoomSchedulerLexer
+from ConfRoomSchedulerParser import ConfRoomSchedulerParser
+
+class CollectingErrorListener(ErrorListener):
+    # Same message format as ConsoleErrorListener, kept in memory
+    def __init__(self):
+        self.messages = []
+
+    def syntaxError(self, recognizer, offendingSymbol, line, column, msg, e):
+        self.messages.append(f"line {line}:{column} {msg}")
+
+class CountingErrorListener(ConsoleErrorListener):
+    # Prints like ConsoleErrorListener, and counts the errors
+    def __init__(self):
+        self.count = 0
+
+    def syntaxError(self, recognizer, offendingSymbol, line, column, msg, e):
+        self.count += 1
+        super().syntaxError(recognizer, offendingSymbol, line, column, msg, e)
+
+class PositionErrorListener(ErrorListener):
+    # Keeps (line, column, message), to be printed later with other line numbers
+    def __init__(self):
+        self.errors = []
+
+    def syntaxError(self, recognizer, offendingSymbol, line, column, msg, e):
+        self.errors.append((line, column, msg))
+
+class BailErrorListener(ErrorListener):
+    # Gives up on the first lexer error
+    def syntaxError(self, recognizer, offendingSymbol, line, column, msg, e):
+        raise ParseCancellationException(msg)
+
+class TwoStageParser:
+    # Parses a whole program with SLL prediction and BailErrorStrategy first.
+    # Only input that makes it bail (a lexer or parser error, or tokens left
+    # after `prog`) is lexed and parsed again with full LL and the default
+    # error recovery, so diagnostics are the same as a plain parser.prog().
+    def __init__(self, error_listener=None):
+        self.listeners = [error_listener or ConsoleErrorListener.INSTANCE]
+        self.lexer = ConfRoomSchedulerLexer(None)
+        self.stream = CommonTokenStream(self.lexer)
+        self.parser = ConfRoomSchedulerParser(self.stream)
+        self.fallbacks = 0
+
+    def parse(self, input_stream):
+        self._configure([BailErrorListener()], [], BailErrorStrategy(), PredictionMode.SLL)
+        try:
+            tree = self._parse(input_stream)
+            if self.stream.LA(1) == Token.EOF:
+                return tree
+        except ParseCancellationException:
+            pass
+
+        self.fallbacks += 1
+        self._configure(self.listeners, self.listeners, DefaultErrorStrategy(), PredictionMode.LL)
+        input_stream.reset()
+        return self._parse(input_stream)
+
+    def _configure(self, lexer_listeners, parser_listeners, error_strategy, prediction_mode):
+        for recognizer, listeners in ((self.lexer, lexer_listeners), (self.parser, parser_listeners)):
+            recognizer.removeErrorListeners()
+            for listener in listeners:
+                recognizer.addErrorListener(listener)
+        self.parser._errHandler = error_strategy
+        self.parser._interp.predictionMode = prediction_mode
+
+    def _parse(self, input_stream):
+        self.lexer.inputStream = input_stream
+        self.stream.setTokenSource(self.lexer)
+        self.parser.setTokenStream(self.stream)
+        return self.parser.prog()
+
+class LineParser:
+    # Parses one `stat NEWLINE` at a time, reusing the same lexer and parser
+    def __init__(self, error_listener=None):
+        self.lexer = ConfRoomSchedulerLexer(None)
+        self.stream = CommonTokenStream(self.lexer)
+        self.parser = ConfRoomSchedulerParser(self.stream)
+        if error_listener is not None:
+            for recognizer in (self.lexer, self.parser):
+                recognizer.removeErrorListeners()
+                recognizer.addErrorListener(error_listener)
+
+    def parse(self, line, line_number=1):
+        self.lexer.inputStream = InputStream(line)
+        self.lexer.line = line_number
+        self.stream.setTokenSource(self.lexer)
+        self.parser.setTokenStream(self.stream)
+        tree = self.parser.stat()
+
+        # A statement must be followed by the end of its line
+        self.stream.fill()
+        token = self.stream.LT(1)
+        if token.type not in (ConfRoomSchedulerParser.NEWLINE, Token.EOF):
+            self.parser.notifyErrorListeners(
+                f"extraneous input {self.parser._errHandler.getTokenErrorDisplay(token)} expecting NEWLINE", token, None)
+        return tree
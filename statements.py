@@ -0,0 +1,137 @@
+from collections import namedtuple
+
+# Plain records for each statement of the DSL, detached from the parse tree so
+# they can be pickled, cached or produced by other front ends.  `handler` names
+# the ConfRoomSchedulerSemanticChecker method that executes the statement.
+
+class ReserveStatement(namedtuple('ReserveStatement', 'user room_id date start_time end_time until',
+                                  defaults=(None,))):
+    # `until` is the last date of a weekly reservation (CADA SEMANA HASTA)
+    __slots__ = ()
+    handler = 'reserve'
+
+class CancelStatement(namedtuple('CancelStatement', 'room_id date start_time end_time')):
+    __slots__ = ()
+    handler = 'cancel'
+
+class ListStatement(namedtuple('ListStatement', 'room user date since until limit offset',
+                               defaults=(None,) * 7)):
+    # Every field is the text of an optional clause; a bare LISTAR has none.
+    __slots__ = ()
+    handler = 'list_reservations'
+
+    @property
+    def is_filtered(self):
+        return any(field is not None for field in self)
+
+class ReprogramStatement(namedtuple('ReprogramStatement',
+                                    'room_id date old_start_time old_end_time new_start_time new_end_time')):
+    __slots__ = ()
+    handler = 'reprogram'
+
+class AvailableStatement(namedtuple('AvailableStatement', 'date start_time end_time duration')):
+    # Asks about every room, like LISTAR
+    __slots__ = ()
+    handler = 'find_available'
+
+class BlockStatement(namedtuple('BlockStatement', 'reservations')):
+    # The ReserveStatements of an INICIO ... FIN block, stored all or none
+    __slots__ = ()
+    handler = 'reserve_block'
+
+class IncompleteStatement(namedtuple('IncompleteStatement', 'kind error')):
+    # A statement whose tokens were lost during error recovery
+    __slots__ = ()
+    handler = 'incomplete'
+
+def reserve_record(reserve):
+    statement = ReserveStatement(
+        reserve.USER().getText(),
+        reserve.ID().getText(),
+        reserve.DATE().getText(),
+        reserve.TIME(0).getText(),
+        reserve.TIME(1).getText())
+    if reserve.recurrence() is not None:
+        statement = statement._replace(until=reserve.recurrence().DATE().getText())
+    return statement
+
+def reserve_statement(ctx):
+    try:
+        return reserve_record(ctx.reserve())
+    except AttributeError as e:
+        return IncompleteStatement('reserve', str(e))
+
+def cancel_statement(ctx):
+    try:
+        return CancelStatement(
+            ctx.cancel().ID().getText(),
+            ctx.cancel().DATE().getText(),
+            ctx.cancel().TIME(0).getText(),
+            ctx.cancel().TIME(1).getText())
+    except AttributeError as e:
+        return IncompleteStatement('cancel', str(e))
+
+LIST_FILTER_FIELDS = ('room', 'user', 'date', 'since', 'until')
+
+def list_statement(ctx):
+    # A clause given twice keeps its last value
+    clauses = {}
+    for list_filter in ctx.list_().listFilter():
+        for field in LIST_FILTER_FIELDS:
+            token = getattr(list_filter, field)
+            if token is not None:
+                clauses[field] = token.text
+    limit = ctx.list_().limit
+    offset = ctx.list_().offset
+    return ListStatement(limit=limit.text if limit is not None else None,
+                         offset=offset.text if offset is not None else None, **clauses)
+
+def reprogram_statement(ctx):
+    try:
+        return ReprogramStatement(
+            ctx.reprogram().ID().getText(),
+            ctx.reprogram().DATE().getText(),
+            ctx.reprogram().TIME(0).getText(),
+            ctx.reprogram().TIME(1).getText(),
+            ctx.reprogram().TIME(2).getText(),
+            ctx.reprogram().TIME(3).getText())
+    except AttributeError as e:
+        return IncompleteStatement('reprogram', str(e))
+
+def available_statement(ctx):
+    try:
+        return AvailableStatement(
+            ctx.available().DATE().getText(),
+            ctx.available().TIME(0).getText(),
+            ctx.available().TIME(1).getText(),
+            ctx.available().ID().getText())
+    except AttributeError as e:
+        return IncompleteStatement('available', str(e))
+
+def block_statement(ctx):
+    try:
+        return BlockStatement(tuple(reserve_record(reserve) for reserve in ctx.block().reserve()))
+    except AttributeError as e:
+        return IncompleteStatement('block', str(e))
+
+# Keyed by the name of the ConfRoomSchedulerParser context class, so the
+# records can be used without importing the generated parser
+STATEMENT_BUILDERS = {
+    'ReserveStatContext': reserve_statement,
+    'CancelStatContext': cancel_statement,
+    'ListStatContext': list_statement,
+    'ReprogramStatContext': reprogram_statement,
+    'AvailableStatContext': available_statement,
+    'BlockStatContext': block_statement,
+}
+
+def statement_from_context(ctx):
+    # None for blank lines and statements the parser could not recognize
+    builder = STATEMENT_BUILDERS.get(type(ctx).__name__)
+    return builder(ctx) if builder else None
+
+def statements_from_tree(tree):
+    for ctx in tree.stat():
+        statement = statement_from_context(ctx)
+        if statement is not None:
+            yield statement
@@ -0,0 +1,41 @@
+from datetime import date
+from functools import lru_cache
+
+# The DATE and TIME lexer rules only accept fixed-width DD/MM/YYYY and HH:MM
+# text, so both can be decoded straight from their digit characters.  Scripts
+# reuse the same few dates and time slots, hence the caches.
+CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def decode_time(text):
+    # Minutes since midnight, or None if the text is not a valid HH:MM time
+    if len(text) != 5 or text[2] != ':' or not text.isascii():
+        return None
+    if not (text[:2] + text[3:]).isdigit():
+        return None
+    hours = int(text[:2])
+    minutes = int(text[3:])
+    if hours > 23 or minutes > 59:
+        return None
+    return hours * 60 + minutes
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def decode_date(text):
+    # datetime.date for a valid DD/MM/YYYY date, or None
+    if len(text) != 10 or text[2] != '/' or text[5] != '/' or not text.isascii():
+        return None
+    digits = text[:2] + text[3:5] + text[6:]
+    if not digits.isdigit():
+        return None
+    try:
+        return date(int(text[6:]), int(text[3:5]), int(text[:2]))
+    except ValueError:
+        return None
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def encode_time(minutes):
+    # HH:MM text for minutes since midnight, the inverse of decode_time
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
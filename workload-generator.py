@@ -0,0 +1,51 @@
+import argparse
+import sys
+from datetime import datetime
+from workload import WorkloadSettings, write_workload
+
+def main():
+    defaults = WorkloadSettings()
+    arg_parser = argparse.ArgumentParser(description="Genera programas sintéticos de ConfRoomScheduler")
+    arg_parser.add_argument('-n', '--lines', type=int, default=defaults.lines, help="número de sentencias")
+    arg_parser.add_argument('--rooms', type=int, default=defaults.rooms, help="número de salas")
+    arg_parser.add_argument('--days', type=int, default=defaults.days, help="días distintos a reservar")
+    arg_parser.add_argument('--first-day', default=defaults.first_day.strftime('%d/%m/%Y'),
+                            help="primer día (DD/MM/AAAA)")
+    arg_parser.add_argument('--conflict-rate', type=float, default=defaults.conflict_rate,
+                            help="fracción de reservas que se solapan a propósito con otra")
+    arg_parser.add_argument('--cancel-rate', type=float, default=defaults.cancel_rate,
+                            help="fracción de sentencias CANCELAR")
+    arg_parser.add_argument('--reprogram-rate', type=float, default=defaults.reprogram_rate,
+                            help="fracción de sentencias REPROGRAMAR")
+    arg_parser.add_argument('--list-rate', type=float, default=defaults.list_rate,
+                            help="fracción de sentencias LISTAR")
+    arg_parser.add_argument('--available-rate', type=float, default=defaults.available_rate,
+                            help="fracción de consultas DISPONIBLE")
+    arg_parser.add_argument('--filtered-list-rate', type=float, default=defaults.filtered_list_rate,
+                            help="fracción de sentencias LISTAR con filtros, LIMITE o SALTAR")
+    arg_parser.add_argument('--block-rate', type=float, default=defaults.block_rate,
+                            help="fracción de bloques INICIO ... FIN")
+    arg_parser.add_argument('--block-size', type=int, default=defaults.block_size,
+                            help="número medio de reservas por bloque")
+    arg_parser.add_argument('--weekly-rate', type=float, default=defaults.weekly_rate,
+                            help="fracción de reservas semanales (CADA SEMANA HASTA)")
+    arg_parser.add_argument('--seed', type=int, default=defaults.seed, help="semilla del generador")
+    arg_parser.add_argument('-o', '--output', help="archivo de salida (por defecto, la salida estándar)")
+    args = arg_parser.parse_args()
+
+    settings = WorkloadSettings(
+        lines=args.lines, rooms=args.rooms, days=args.days,
+        first_day=datetime.strptime(args.first_day, '%d/%m/%Y').date(),
+        conflict_rate=args.conflict_rate, cancel_rate=args.cancel_rate,
+        reprogram_rate=args.reprogram_rate, list_rate=args.list_rate, available_rate=args.available_rate,
+        filtered_list_rate=args.filtered_list_rate, block_rate=args.block_rate, block_size=args.block_size,
+        weekly_rate=args.weekly_rate, seed=args.seed)
+
+    if args.output:
+        with open(args.output, 'w', encoding='ascii', newline='\n') as f:
+            write_workload(settings, f)
+    else:
+        write_workload(settings, sys.stdout)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+import random
+from datetime import date, timedelta
+
+# Reproducible synthetic scripts for benchmarking.  Only a bounded window of
+# recent bookings is remembered to pick CANCELAR/REPROGRAMAR targets and
+# deliberate overlaps from, so even 10M-line scripts are generated in constant
+# memory.
+
+RECENT_BOOKINGS = 10000
+
+class WorkloadSettings:
+    def __init__(self, lines=1000, rooms=20, days=30, first_day=date(2024, 7, 1), conflict_rate=0.05,
+                 cancel_rate=0.1, reprogram_rate=0.1, list_rate=0.0005, available_rate=0.0,
+                 filtered_list_rate=0.0, block_rate=0.0, block_size=5, weekly_rate=0.0, seed=0):
+        self.lines = lines
+        self.rooms = rooms
+        self.days = days
+        self.first_day = first_day
+        self.conflict_rate = conflict_rate
+        self.cancel_rate = cancel_rate
+        self.reprogram_rate = reprogram_rate
+        self.list_rate = list_rate
+        self.available_rate = available_rate
+        self.filtered_list_rate = filtered_list_rate
+        self.block_rate = block_rate
+        self.block_size = block_size
+        self.weekly_rate = weekly_rate
+        self.seed = seed
+
+def format_time(minutes):
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+def generate_statements(settings):
+    rng = random.Random(settings.seed)
+    dates = [(settings.first_day + timedelta(days=i)).strftime('%d/%m/%Y') for i in range(settings.days)]
+    users = [f"usuario{chr(ord('a') + i % 26)}{chr(ord('a') + i // 26 % 26)}" for i in range(200)]
+    recent = []
+
+    def random_slot():
+        start = rng.randrange(8 * 4, 18 * 4) * 15
+        return start, start + rng.choice((30, 45, 60, 90, 120))
+
+    for _ in range(settings.lines):
+        roll = rng.random()
+        if recent and roll < settings.cancel_rate:
+            room, day, start, end = recent.pop(rng.randrange(len(recent)))
+            yield f"CANCELAR {room} PARA {day} DE {format_time(start)} A {format_time(end)}"
+        elif recent and roll < settings.cancel_rate + settings.reprogram_rate:
+            i = rng.randrange(len(recent))
+            room, day, start, end = recent[i]
+            new_start, new_end = random_slot()
+            recent[i] = (room, day, new_start, new_end)
+            yield (f"REPROGRAMAR {room} PARA {day} DE {format_time(start)} A {format_time(end)} "
+                   f"PARA {format_time(new_start)} A {format_time(new_end)}")
+        elif roll < settings.cancel_rate + settings.reprogram_rate + settings.list_rate:
+            yield "LISTAR"
+        elif roll < settings.cancel_rate + settings.reprogram_rate + settings.list_rate + settings.available_rate:
+            start, end = random_slot()
+            yield (f"DISPONIBLE PARA {rng.choice(dates)} DE {format_time(start - 60)} A {format_time(end + 60)} "
+                   f"DURACION {rng.choice((30, 60, 90))}")
+        elif roll < (settings.cancel_rate + settings.reprogram_rate + settings.list_rate + settings.available_rate
+                     + settings.filtered_list_rate):
+            first, last = sorted((rng.randrange(len(dates)), rng.randrange(len(dates))))
+            clauses = rng.choice((
+                [f"SALA {rng.randrange(1, settings.rooms + 1)}"],
+                [f"USUARIO {rng.choice(users)}"],
+                [f"FECHA {rng.choice(dates)}"],
+                [f"DESDE {dates[first]} HASTA {dates[last]}"],
+                [f"SALA {rng.randrange(1, settings.rooms + 1)}", f"FECHA {rng.choice(dates)}"],
+            ))
+            if rng.random() < 0.5:
+                clauses.append(f"LIMITE {rng.choice((1, 10, 50))}")
+                if rng.random() < 0.5:
+                    clauses.append(f"SALTAR {rng.choice((1, 10))}")
+            yield " ".join(["LISTAR", *clauses])
+        elif roll < (settings.cancel_rate + settings.reprogram_rate + settings.list_rate + settings.available_rate
+                     + settings.filtered_list_rate + settings.block_rate):
+            # One multi-line INICIO ... FIN statement
+            lines = ["INICIO"]
+            for _ in range(rng.randint(1, 2 * settings.block_size - 1)):
+                room = rng.randrange(1, settings.rooms + 1)
+                day = rng.choice(dates)
+                start, end = random_slot()
+                if len(recent) < RECENT_BOOKINGS:
+                    recent.append((room, day, start, end))
+                lines.append(f"RESERVA {rng.choice(users)} SALA {room} PARA {day} DE {format_time(start)} A {format_time(end)}")
+            lines.append("FIN")
+            yield "\n".join(lines)
+        elif roll < (settings.cancel_rate + settings.reprogram_rate + settings.list_rate + settings.available_rate
+                     + settings.filtered_list_rate + settings.block_rate + settings.weekly_rate):
+            room = rng.randrange(1, settings.rooms + 1)
+            first = rng.randrange(len(dates))
+            until = settings.first_day + timedelta(days=first + 7 * rng.randint(1, 12))
+            start, end = random_slot()
+            yield (f"RESERVA {rng.choice(users)} SALA {room} PARA {dates[first]} DE {format_time(start)} "
+                   f"A {format_time(end)} CADA SEMANA HASTA {until.strftime('%d/%m/%Y')}")
+        else:
+            if recent and rng.random() < settings.conflict_rate:
+                # Overlap an existing booking on purpose
+                room, day, start, end = rng.choice(recent)
+                start = min(start + 15, end - 15)
+                end = start + 60
+            else:
+                room = rng.randrange(1, settings.rooms + 1)
+                day = rng.choice(dates)
+                start, end = random_slot()
+            if len(recent) >= RECENT_BOOKINGS:
+                recent[rng.randrange(len(recent))] = (room, day, start, end)
+            else:
+                recent.append((room, day, start, end))
+            yield f"RESERVA {rng.choice(users)} SALA {room} PARA {day} DE {format_time(start)} A {format_time(end)}"
+
+def write_workload(settings, f, chunk_lines=10000):
+    chunk = []
+    for statement in generate_statements(settings):
+        chunk.append(statement)
+        if len(chunk) >= chunk_lines:
+            f.write("\n".join(chunk) + "\n")
+            chunk.clear()
+    if chunk:
+        f.write("\n".join(chunk) + "\n")